@@ -1,17 +1,24 @@
-﻿from flask import Flask, render_template, jsonify
+﻿from flask import Flask, render_template, jsonify, request, flash, redirect, url_for
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
 import os
 from sqlalchemy.exc import OperationalError, TimeoutError, DBAPIError
+from app.replica import SesionConReplica
+from app.circuito import CircuitoAbierto
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': SesionConReplica})
 login_manager = LoginManager()
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # IP real del cliente detrás del proxy de Render (usada por el limitador de login)
+    if app.config['PROXIES_CONFIABLES']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXIES_CONFIABLES'])
+
     db.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
@@ -22,6 +29,19 @@ def create_app():
     app.register_blueprint(main)
     app.register_blueprint(auth)
 
+    from app import assets, circuito, compresion, imagenes, plantillas, replica, respaldos, salud
+    from app.cli import lab
+
+    circuito.init_app(app)
+    replica.init_app(app)
+    assets.init_app(app)
+    compresion.init_app(app)
+    imagenes.init_app(app)
+    plantillas.init_app(app)
+    salud.init_app(app)
+    respaldos.init_app(app)
+    app.cli.add_command(lab)
+
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
     # NOTA: db.create_all() comentado para evitar WORKER TIMEOUT en Render
@@ -35,24 +55,22 @@ def create_app():
     def handle_db_connection_error(e):
         """Maneja errores de conexión a la base de datos"""
         app.logger.error(f'Error de conexión a BD: {str(e)}')
-        return render_template_string('''
-            <!DOCTYPE html>
-            <html><head><title>Error de Conexión</title>
-            <style>
-                body { font-family: Arial; text-align: center; padding: 50px; background: #f5f5f5; }
-                .error-box { background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); max-width: 600px; margin: 0 auto; }
-                h1 { color: #e74c3c; }
-                p { color: #666; line-height: 1.6; }
-                .btn { background: #1ABC9C; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 20px; }
-            </style></head><body>
-                <div class="error-box">
-                    <h1>⚠️ Estamos Trabajando en Ello</h1>
-                    <p>Temporalmente no podemos conectarnos a la base de datos.</p>
-                    <p>Por favor, intenta nuevamente en unos segundos.</p>
-                    <a href="/" class="btn">← Volver al Inicio</a>
-                </div>
-            </body></html>
-        '''), 503
+        return pagina_sin_conexion()
+
+    @app.errorhandler(CircuitoAbierto)
+    def handle_circuito_abierto(e):
+        """Base de datos caída (circuito abierto): 503 inmediato, sin esperar timeouts"""
+        if request.endpoint == 'main.consultar_resultado':
+            # El paciente vuelve al portal con el aviso en vez de una página de error
+            flash('La consulta de resultados no está disponible en este momento. Intenta en unos minutos.', 'warning')
+            return redirect(url_for('main.portal_resultados'))
+        if request.path.startswith('/api/'):
+            respuesta = jsonify({'error': 'Base de datos no disponible, intenta en unos segundos'})
+            respuesta.status_code = 503
+        else:
+            respuesta = pagina_sin_conexion()
+        respuesta.headers['Retry-After'] = str(int(app.config['CIRCUITO_PAUSA_SEGUNDOS']))
+        return respuesta
 
     @app.errorhandler(500)
     def handle_internal_error(e):
@@ -103,3 +121,26 @@ def render_template_string(html_string):
     """Helper para renderizar HTML inline"""
     from flask import Response
     return Response(html_string, mimetype='text/html')
+
+def pagina_sin_conexion():
+    """Página 503 cuando no hay conexión con la base de datos"""
+    respuesta = render_template_string('''
+        <!DOCTYPE html>
+        <html><head><title>Error de Conexión</title>
+        <style>
+            body { font-family: Arial; text-align: center; padding: 50px; background: #f5f5f5; }
+            .error-box { background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); max-width: 600px; margin: 0 auto; }
+            h1 { color: #e74c3c; }
+            p { color: #666; line-height: 1.6; }
+            .btn { background: #1ABC9C; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; margin-top: 20px; }
+        </style></head><body>
+            <div class="error-box">
+                <h1>⚠️ Estamos Trabajando en Ello</h1>
+                <p>Temporalmente no podemos conectarnos a la base de datos.</p>
+                <p>Por favor, intenta nuevamente en unos segundos.</p>
+                <a href="/" class="btn">← Volver al Inicio</a>
+            </div>
+        </body></html>
+    ''')
+    respuesta.status_code = 503
+    return respuesta
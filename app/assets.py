@@ -0,0 +1,272 @@
+"""
+Pipeline de assets estáticos - Laboratorio Pérez
+- Une y minifica los CSS fuente de app/static/css/paginas
+- Nombres con hash de contenido (se pueden cachear para siempre)
+- Genera hermanos .gz y .br precomprimidos
+- Las librerías de app/static/vendor se publican tal cual, también con hash
+- Helper de Jinja asset_url() que resuelve el nombre con hash desde el manifiesto
+- CSS/JS servidos desde /static también tienen hermanos .gz/.br (se usan si están al día)
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from flask import Blueprint, current_app, request, send_from_directory, abort, url_for
+from werkzeug.security import safe_join
+from app.vendor import CDN
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se generan .gz
+    brotli = None
+
+assets = Blueprint('assets', __name__)
+
+# Paquete publicado -> archivos fuente (relativos a app/static) en el orden en que se concatenan
+PAQUETES = {
+    'admin_base.css': ['css/paginas/admin_base.css'],
+    'admin_gestion.css': ['css/paginas/admin_gestion.css'],
+    'dashboard.css': ['css/paginas/dashboard.css'],
+    'pacientes.css': ['css/paginas/pacientes.css'],
+    'pruebas.css': ['css/paginas/pruebas.css'],
+    'resultados.css': ['css/paginas/resultados.css'],
+    'catalogo.css': ['css/paginas/catalogo.css'],
+    'ver_resultado.css': ['css/paginas/ver_resultado.css'],
+}
+
+DIST = 'dist'                      # Carpeta de salida dentro de app/static
+VENDOR = 'vendor'                  # Librerías descargadas por `flask lab vendor` (ya minificadas)
+MANIFIESTO = 'manifest.json'
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+ESTATICOS = ('css', 'js')          # Carpetas de app/static servidas por /static que se precomprimen
+EXTENSIONES_ESTATICAS = ('.css', '.js', '.svg')
+
+_lock = threading.Lock()
+
+
+def minificar_css(css):
+    """Minificación conservadora: comentarios, espacios y punto y coma finales"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def _escribir(ruta, contenido):
+    """Escritura atómica para que un worker nunca sirva un archivo a medias"""
+    temporal = f'{ruta}.tmp{os.getpid()}'
+    with open(temporal, 'wb') as f:
+        f.write(contenido)
+    os.replace(temporal, ruta)
+
+
+def _archivos_vendor(static_folder):
+    vendor_dir = os.path.join(static_folder, VENDOR)
+    if not os.path.isdir(vendor_dir):
+        return []
+    return sorted(f'{VENDOR}/{archivo}' for archivo in os.listdir(vendor_dir) if archivo.endswith(('.css', '.js')))
+
+
+def _contenidos(static_folder):
+    """Genera (nombre publicado, tamaño fuente, bytes finales) de paquetes CSS y librerías vendor"""
+    for nombre, fuentes in PAQUETES.items():
+        texto = ''
+        for fuente in fuentes:
+            with open(os.path.join(static_folder, fuente), encoding='utf-8') as f:
+                texto += f.read() + '\n'
+        yield nombre, len(texto.encode('utf-8')), minificar_css(texto).encode('utf-8')
+
+    for nombre in _archivos_vendor(static_folder):
+        with open(os.path.join(static_folder, nombre), 'rb') as f:
+            contenido = f.read()
+        yield nombre, len(contenido), contenido
+
+
+def construir(static_folder):
+    """
+    Construye todos los paquetes en static/dist y escribe el manifiesto.
+
+    Returns:
+        list: un dict por paquete con tamaños fuente, minificado, gzip y brotli
+    """
+    dist_dir = os.path.join(static_folder, DIST)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifiesto = {}
+    reporte = []
+    for nombre, fuente, contenido in _contenidos(static_folder):
+        digest = hashlib.sha256(contenido).hexdigest()[:10]
+        base, ext = os.path.splitext(nombre)
+        publicado = f'{base}.{digest}{ext}'
+        ruta = os.path.join(dist_dir, publicado)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+
+        comprimido_gz = gzip.compress(contenido, compresslevel=9, mtime=0)
+        _escribir(ruta, contenido)
+        _escribir(ruta + '.gz', comprimido_gz)
+        tam_br = None
+        if brotli is not None:
+            comprimido_br = brotli.compress(contenido, quality=11)
+            _escribir(ruta + '.br', comprimido_br)
+            tam_br = len(comprimido_br)
+
+        manifiesto[nombre] = publicado
+        reporte.append({
+            'paquete': nombre,
+            'archivo': publicado,
+            'fuente': fuente,
+            'minificado': len(contenido),
+            'gzip': len(comprimido_gz),
+            'brotli': tam_br,
+        })
+
+    _escribir(os.path.join(dist_dir, MANIFIESTO), json.dumps(manifiesto, indent=2).encode('utf-8'))
+
+    # Eliminar versiones anteriores que ya no están en el manifiesto
+    vigentes = set(manifiesto.values())
+    for raiz, _, archivos in os.walk(dist_dir):
+        for archivo in archivos:
+            relativo = os.path.relpath(os.path.join(raiz, archivo), dist_dir).replace(os.sep, '/')
+            publicado = relativo[:-3] if relativo.endswith(('.gz', '.br')) else relativo
+            if relativo != MANIFIESTO and publicado not in vigentes:
+                os.remove(os.path.join(raiz, archivo))
+
+    return reporte
+
+
+def comprimir_estaticos(static_folder):
+    """
+    Genera los hermanos .gz/.br de los CSS/JS de /static que no los tienen o están desactualizados.
+    Los CSS fuente de los paquetes (css/paginas) no se sirven directamente y se omiten.
+
+    Returns:
+        list: un dict por archivo con tamaños fuente, gzip y brotli (mismo formato que construir)
+    """
+    variantes = [('gzip', '.gz', lambda c: gzip.compress(c, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variantes.append(('brotli', '.br', lambda c: brotli.compress(c, quality=11)))
+
+    reporte = []
+    for carpeta in ESTATICOS:
+        for raiz, _, archivos in os.walk(os.path.join(static_folder, carpeta)):
+            relativa = os.path.relpath(raiz, static_folder).replace(os.sep, '/')
+            if relativa == 'css/paginas' or relativa.startswith('css/paginas/'):
+                continue
+            for archivo in sorted(archivos):
+                if not archivo.endswith(EXTENSIONES_ESTATICAS):
+                    continue
+                ruta = os.path.join(raiz, archivo)
+                with open(ruta, 'rb') as f:
+                    contenido = f.read()
+                fila = {'paquete': archivo, 'archivo': f'{relativa}/{archivo}', 'fuente': len(contenido),
+                        'minificado': None, 'gzip': None, 'brotli': None}
+                for clave, extension, compresor in variantes:
+                    if _hermano_vigente(ruta, extension):
+                        fila[clave] = os.path.getsize(ruta + extension)
+                    else:
+                        comprimido = compresor(contenido)
+                        _escribir(ruta + extension, comprimido)
+                        fila[clave] = len(comprimido)
+                reporte.append(fila)
+    return reporte
+
+
+def _hermano_vigente(ruta, extension):
+    """El .gz/.br existe y no es más antiguo que el archivo original"""
+    try:
+        return os.path.getmtime(ruta + extension) >= os.path.getmtime(ruta)
+    except OSError:
+        return False
+
+
+def _fuentes_modificadas(static_folder, ruta_manifiesto):
+    limite = os.path.getmtime(ruta_manifiesto)
+    fuentes = [f for lista in PAQUETES.values() for f in lista] + _archivos_vendor(static_folder)
+    return any(os.path.getmtime(os.path.join(static_folder, fuente)) > limite for fuente in fuentes)
+
+
+def cargar_manifiesto(app):
+    """
+    Lee el manifiesto (una vez por proceso). Si no existe, construye los paquetes;
+    en modo debug reconstruye cuando cambia algún CSS fuente.
+    """
+    manifiesto = app.extensions.get('assets_manifiesto')
+    if manifiesto is not None and not app.debug:
+        return manifiesto
+
+    with _lock:
+        ruta = os.path.join(app.static_folder, DIST, MANIFIESTO)
+        if not os.path.exists(ruta) or (app.debug and _fuentes_modificadas(app.static_folder, ruta)):
+            construir(app.static_folder)
+            manifiesto = None
+        if manifiesto is None:
+            with open(ruta, encoding='utf-8') as f:
+                manifiesto = json.load(f)
+            app.extensions['assets_manifiesto'] = manifiesto
+    return manifiesto
+
+
+def asset_url(nombre):
+    """
+    Helper de Jinja: {{ asset_url('pruebas.css') }} -> /assets/pruebas.<hash>.css
+    Las librerías vendor que aún no se descargaron se resuelven a su CDN.
+    """
+    publicado = cargar_manifiesto(current_app).get(nombre)
+    if publicado is None and nombre in CDN:
+        return CDN[nombre]
+    if publicado is None:
+        raise KeyError(f'Asset desconocido: {nombre}')
+    return url_for('assets.servir', filename=publicado)
+
+
+def enviar_precomprimido(directorio, filename, max_age=None):
+    """
+    Envía `filename` usando su hermano .br o .gz si el cliente lo acepta y existe
+    (y no quedó desactualizado respecto al original). Returns None si el archivo no existe.
+    """
+    ruta = safe_join(directorio, filename)
+    if ruta is None or not os.path.isfile(ruta):
+        return None
+
+    aceptadas = request.accept_encodings
+    for encoding, extension in (('br', '.br'), ('gzip', '.gz')):
+        if aceptadas[encoding] and _hermano_vigente(ruta, extension):
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            respuesta = send_from_directory(directorio, filename + extension, mimetype=mimetype, max_age=max_age)
+            respuesta.headers['Content-Encoding'] = encoding
+            break
+    else:
+        respuesta = send_from_directory(directorio, filename, max_age=max_age)
+    respuesta.vary.add('Accept-Encoding')
+    return respuesta
+
+
+@assets.route('/assets/<path:filename>')
+def servir(filename):
+    """Sirve los paquetes con hash con cache inmutable de un año"""
+    respuesta = enviar_precomprimido(os.path.join(current_app.static_folder, DIST), filename)
+    if respuesta is None:
+        abort(404)
+    respuesta.headers['Cache-Control'] = CACHE_INMUTABLE
+    return respuesta
+
+
+def servir_estatico(filename):
+    """Reemplaza la vista /static de Flask para usar los hermanos precomprimidos"""
+    respuesta = enviar_precomprimido(current_app.static_folder, filename,
+                                     max_age=current_app.get_send_file_max_age(filename))
+    if respuesta is None:
+        abort(404)
+    return respuesta
+
+
+def init_app(app):
+    app.register_blueprint(assets)
+    app.jinja_env.globals['asset_url'] = asset_url
+    if app.has_static_folder:
+        app.view_functions['static'] = servir_estatico
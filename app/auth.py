@@ -1,19 +1,65 @@
-﻿from flask import Blueprint, render_template, request, redirect, url_for, flash
+﻿import threading
+import time
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_user, logout_user, login_required
 from app import db
 from app.models import Usuario
+from app.utils import LimitadorIntentos
 
 auth = Blueprint('auth', __name__, url_prefix='/auth')
 
+@auth.record_once
+def configurar_limites(state):
+    """Crea el limitador de intentos y el semáforo de verificaciones para esta app"""
+    config = state.app.config
+    state.app.extensions['limitador_login'] = LimitadorIntentos(
+        max_intentos=config['LOGIN_MAX_INTENTOS'],
+        ventana=config['LOGIN_VENTANA_SEGUNDOS']
+    )
+    # Máximo de hashes calculándose a la vez por proceso (cada uno ocupa un núcleo)
+    state.app.extensions['verificaciones_login'] = threading.BoundedSemaphore(
+        config['LOGIN_MAX_VERIFICACIONES']
+    )
+
 @auth.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
-        username = request.form.get('username')
-        password = request.form.get('password')
-        usuario = Usuario.query.filter_by(username=username).first()
-        if usuario and usuario.check_password(password):
+        username = request.form.get('username') or ''
+        password = request.form.get('password') or ''
+        limitador = current_app.extensions['limitador_login']
+        claves = (f'usuario:{username.lower()}', f'ip:{request.remote_addr}')
+
+        # Rechazar ANTES de calcular el hash. Solo se bloquea la IP: por usuario, los
+        # fallos ajenos demoran el login pero no impiden entrar al dueño de la cuenta
+        espera = limitador.bloqueado(claves[1])
+        if espera:
+            flash(f'Demasiados intentos fallidos. Intenta nuevamente en {espera} segundos.', 'danger')
+            return render_template('auth/login.html'), 429
+        time.sleep(limitador.retraso(claves[0], current_app.config['LOGIN_RETRASO_MAX_SEGUNDOS']))
+
+        verificaciones = current_app.extensions['verificaciones_login']
+        if not verificaciones.acquire(timeout=current_app.config['LOGIN_ESPERA_VERIFICACION']):
+            flash('El servidor está ocupado. Intenta nuevamente en unos segundos.', 'warning')
+            return render_template('auth/login.html'), 429
+        try:
+            usuario = Usuario.query.filter_by(username=username).first()
+            valido = usuario is not None and usuario.check_password(password)
+            if valido and usuario.necesita_rehash():
+                # Actualizar el hash al algoritmo/costo configurado de forma transparente
+                try:
+                    usuario.set_password(password)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    current_app.logger.warning(f'No se pudo actualizar el hash de {username}: {e}')
+        finally:
+            verificaciones.release()
+
+        if valido:
+            limitador.reiniciar(claves[0])
             login_user(usuario)
             return redirect(url_for('main.dashboard'))
+        limitador.registrar_fallo(*claves)
         flash('Usuario o contraseña incorrectos', 'danger')
     return render_template('auth/login.html')
 
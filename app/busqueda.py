@@ -0,0 +1,185 @@
+"""
+Búsqueda del catálogo - Laboratorio Pérez
+- PostgreSQL: columna generada 'busqueda' (tsvector español sin acentos, pesos
+  nombre > categoría > descripción) con índice GIN, ordenada con ts_rank_cd
+- Sinónimos y siglas ('hba1c' = 'hemoglobina glicosilada') se expanden en la consulta,
+  así funcionan también en Supabase, donde no se pueden instalar diccionarios propios
+- Sin la columna (SQLite en desarrollo o migración pendiente) se busca en el snapshot
+  del catálogo en memoria, con la misma normalización
+Migración: python migrar_busqueda_catalogo.py
+"""
+import re
+import threading
+from flask import current_app
+from sqlalchemy import text
+from app import circuito, db
+from app.clasificador import normalizar
+
+CONFIGURACION_TS = 'public.es_unaccent'
+MAX_VARIANTES = 8  # Consultas alternativas como máximo al expandir sinónimos
+
+# Cada grupo son formas equivalentes de pedir lo mismo (en minúsculas y sin acentos)
+SINONIMOS = [
+    ('hba1c', 'a1c', 'hemoglobina glicosilada', 'hemoglobina glicada'),
+    ('glucosa', 'glicemia', 'glucemia', 'azucar'),
+    ('tsh', 'tirotropina'),
+    ('transaminasas', 'got', 'gpt', 'tgo', 'tgp'),
+    ('velocidad de sedimentacion', 'ves', 'vsg', 'eritrosedimentacion'),
+    ('proteina c reactiva', 'pcr'),
+    ('vih', 'hiv', 'sida'),
+    ('examen general de orina', 'ego', 'uroanalisis', 'orina completa'),
+    ('hemograma', 'biometria hematica', 'cuadro hematico'),
+    ('hcg', 'embarazo', 'gonadotropina corionica'),
+    ('parasitologico', 'coproparasitologico', 'heces'),
+    ('widal', 'tifoidea'),
+    ('rpr', 'vdrl', 'sifilis'),
+    ('h pylori', 'helicobacter pylori'),
+    ('vph', 'hpv', 'papiloma'),
+    ('nus', 'bun', 'urea'),
+    ('colesterol', 'lipidos', 'perfil lipidico'),
+    ('grupo sanguineo', 'tipo de sangre'),
+    ('ets', 'transmision sexual'),
+    ('chagas', 'trypanosoma cruzi'),
+]
+
+# No aportan a la búsqueda (PostgreSQL también las descarta); 'a' y 'o' sí: 'hepatitis a', 'estreptolisina o'
+PALABRAS_VACIAS = {'de', 'del', 'el', 'la', 'los', 'las', 'en', 'y', 'con', 'por', 'para', 'al'}
+
+_PALABRA = re.compile(r'[a-z0-9]+')
+_fts = None
+_fts_lock = threading.Lock()
+
+
+def palabras(texto):
+    """'Ácido Úrico (AU)' -> ['acido', 'urico', 'au']"""
+    return _PALABRA.findall(normalizar(texto).lower())
+
+
+def _indice_sinonimos():
+    indice = {}
+    for grupo in SINONIMOS:
+        formas = [tuple(p for p in palabras(forma) if p not in PALABRAS_VACIAS) for forma in grupo]
+        for forma in formas:
+            indice[forma] = [otra for otra in formas if otra != forma]
+    return indice
+
+
+_SINONIMOS = _indice_sinonimos()
+
+
+def variantes(consulta):
+    """
+    La consulta como lista de palabras más sus reescrituras con sinónimos
+    ('azucar en ayunas' -> [azucar en ayunas], [glucosa en ayunas], [glicemia en ayunas]...).
+    La primera es siempre la original.
+    """
+    original = [p for p in palabras(consulta) if p not in PALABRAS_VACIAS]
+    resultado = [original] if original else []
+    for inicio in range(len(original)):
+        for fin in range(len(original), inicio, -1):
+            for otra in _SINONIMOS.get(tuple(original[inicio:fin]), []):
+                variante = original[:inicio] + list(otra) + original[fin:]
+                if variante not in resultado:
+                    resultado.append(variante)
+    return resultado[:MAX_VARIANTES]
+
+
+def tsquery(lista_variantes):
+    """
+    Texto para to_tsquery: variantes unidas con |, palabras con &.
+    La última palabra de la consulta original busca por prefijo (mientras se escribe).
+    Solo contiene [a-z0-9], & | ( ) : *  (se envía como parámetro, nunca interpolado).
+    """
+    partes = []
+    for i, variante in enumerate(lista_variantes):
+        terminos = list(variante)
+        if i == 0:
+            terminos[-1] += ':*'
+        partes.append('(' + ' & '.join(terminos) + ')')
+    return ' | '.join(partes)
+
+
+def fts_disponible():
+    """True si la base es PostgreSQL y ya tiene la columna 'busqueda' (se consulta una vez por proceso)"""
+    global _fts
+    if _fts is None:
+        with _fts_lock:
+            if _fts is None:
+                _fts = db.session.get_bind().dialect.name == 'postgresql' and db.session.execute(text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'pruebas' AND column_name = 'busqueda'"
+                )).first() is not None
+    return _fts
+
+
+def _buscar_fts(lista_variantes, limite):
+    return db.session.execute(text(f"""
+        SELECT id
+        FROM pruebas, to_tsquery('{CONFIGURACION_TS}', :consulta) AS consulta
+        WHERE busqueda @@ consulta
+        ORDER BY ts_rank_cd(busqueda, consulta) DESC, nombre
+        LIMIT :limite
+    """), {'consulta': tsquery(lista_variantes), 'limite': limite}).scalars().all()
+
+
+def _indice_memoria(snapshot):
+    """(prueba, categoría, [(peso, palabras)]) por prueba; se arma una vez por snapshot"""
+    indice = snapshot.get('indice_busqueda')
+    if indice is None:
+        indice = [
+            (prueba, categoria, [(3, palabras(prueba['nombre'])), (2, palabras(categoria['nombre'])),
+                                 (1, palabras(prueba['descripcion']))])
+            for categoria in snapshot['categorias'] for prueba in categoria['pruebas']
+        ]
+        snapshot['indice_busqueda'] = indice
+    return indice
+
+
+def _puntaje(campos, variante, prefijo):
+    """Suma del peso del mejor campo de cada palabra; 0 si alguna palabra no aparece"""
+    total = 0
+    for i, termino in enumerate(variante):
+        por_prefijo = prefijo and i == len(variante) - 1
+        peso = max((peso for peso, lista in campos
+                    if any(p.startswith(termino) if por_prefijo else p == termino for p in lista)), default=0)
+        if not peso:
+            return 0
+        total += peso
+    return total
+
+
+def _buscar_memoria(snapshot, lista_variantes, limite):
+    encontrados = []
+    for prueba, categoria, campos in _indice_memoria(snapshot):
+        puntaje = max(_puntaje(campos, variante, i == 0) for i, variante in enumerate(lista_variantes))
+        if puntaje:
+            encontrados.append((-puntaje, prueba['nombre'], prueba['id']))
+    return [prueba_id for _, _, prueba_id in sorted(encontrados)[:limite]]
+
+
+def buscar(snapshot, consulta, limite=30):
+    """
+    Pruebas del snapshot que coinciden con la consulta, de la más a la menos relevante.
+
+    Returns:
+        list: dicts de prueba pública con 'categoria' y 'slug' agregados
+    """
+    lista_variantes = variantes(consulta)
+    if not lista_variantes:
+        return []
+
+    ids = None
+    if not circuito.abierto():  # Base caída: directo a la búsqueda en memoria
+        try:
+            # fts_disponible() también consulta la base (la primera vez): dentro del try
+            if fts_disponible():
+                ids = _buscar_fts(lista_variantes, limite)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning(f'Búsqueda FTS no disponible, se usa la búsqueda en memoria: {e}')
+    if ids is None:
+        ids = _buscar_memoria(snapshot, lista_variantes, limite)
+
+    por_id = snapshot['por_id']
+    return [{**por_id[i][0], 'categoria': por_id[i][1]['nombre'], 'slug': por_id[i][1]['slug']}
+            for i in ids if i in por_id]
@@ -0,0 +1,109 @@
+"""
+Carrito de cotización - Laboratorio Pérez
+- En la sesión solo se guarda {id de prueba: cantidad}
+- Nombres y precios salen del índice del snapshot del catálogo (sin consultar la base)
+- Un solo mensaje de WhatsApp con todas las pruebas y el total
+"""
+from datetime import datetime
+from urllib.parse import quote
+from flask import session
+
+WHATSAPP_LABORATORIO = '59167619188'
+MAX_PRUEBAS = 50     # Pruebas distintas por carrito (la cookie de sesión tiene ~4 KB)
+MAX_CANTIDAD = 10    # Por prueba (p. ej. varios pacientes de una familia)
+
+
+def codigo_prueba(prueba_id):
+    return f'LP-{prueba_id:04d}'
+
+
+def _contenido():
+    """{id: cantidad} de la sesión (las claves se guardan como texto en la cookie)"""
+    return {int(i): c for i, c in session.get('carrito', {}).items()}
+
+
+def _guardar(contenido):
+    session['carrito'] = {str(i): c for i, c in contenido.items()}
+
+
+def agregar(snapshot, prueba_id, cantidad=1):
+    """
+    Suma `cantidad` de la prueba al carrito. Una cantidad negativa resta (botón "−" del
+    carrito) solo si la prueba ya está, sin bajar de 1: para quitarla se usa quitar().
+
+    Returns:
+        bool: False si la prueba no está en el catálogo, el carrito está lleno, la
+        cantidad es 0 o es negativa para una prueba que no está en el carrito
+    """
+    if prueba_id not in snapshot['por_id'] or not cantidad:
+        return False
+    contenido = _contenido()
+    if prueba_id not in contenido and (cantidad < 0 or len(contenido) >= MAX_PRUEBAS):
+        return False
+    contenido[prueba_id] = max(1, min(contenido.get(prueba_id, 0) + cantidad, MAX_CANTIDAD))
+    _guardar(contenido)
+    return True
+
+
+def quitar(prueba_id):
+    contenido = _contenido()
+    if contenido.pop(prueba_id, None) is not None:
+        _guardar(contenido)
+
+
+def vaciar():
+    session.pop('carrito', None)
+
+
+def resumen(snapshot):
+    """
+    Items y totales del carrito. Las pruebas que ya no están en el catálogo se descartan.
+
+    Returns:
+        dict: 'items', 'total' (solo pruebas con precio), 'cantidad' y 'sin_precio'
+    """
+    items = []
+    for prueba_id, cantidad in _contenido().items():
+        encontrada = snapshot['por_id'].get(prueba_id)
+        if encontrada is None:
+            continue
+        prueba, categoria = encontrada
+        items.append({
+            'id': prueba_id,
+            'codigo': codigo_prueba(prueba_id),
+            'nombre': prueba['nombre'],
+            'categoria': categoria['nombre'],
+            'precio': prueba['precio'],
+            'cantidad': cantidad,
+            'subtotal': round(prueba['precio'] * cantidad, 2),
+        })
+    return {
+        'items': items,
+        'total': round(sum(item['subtotal'] for item in items), 2),
+        'cantidad': sum(item['cantidad'] for item in items),
+        'sin_precio': sum(1 for item in items if not item['precio']),
+    }
+
+
+def mensaje_whatsapp(datos, nombre=None):
+    """Texto de la cotización para enviar en un solo mensaje"""
+    lineas = ['Hola, quisiera cotizar las siguientes pruebas 🔬', '']
+    if nombre:
+        lineas[0] = f'Hola, soy {nombre}. Quisiera cotizar las siguientes pruebas 🔬'
+    for item in datos['items']:
+        precio = f"Bs. {item['subtotal']:.2f}" if item['precio'] else 'precio a consultar'
+        cantidad = f"{item['cantidad']} x " if item['cantidad'] > 1 else ''
+        lineas.append(f"• {cantidad}*{item['nombre']}* ({item['codigo']}) - {precio}")
+    lineas += ['', f"*Total estimado: Bs. {datos['total']:.2f}*"]
+    if datos['sin_precio']:
+        lineas.append(f"({datos['sin_precio']} prueba(s) con precio a consultar)")
+    lineas += ['', '¿Podrían confirmarme la cotización?']
+    return '\n'.join(lineas)
+
+
+def url_whatsapp(datos, nombre=None):
+    return f'https://wa.me/{WHATSAPP_LABORATORIO}?text={quote(mensaje_whatsapp(datos, nombre))}'
+
+
+def fecha_cotizacion():
+    return datetime.now().strftime('%d/%m/%Y %H:%M')
@@ -0,0 +1,437 @@
+"""
+Catálogo de pruebas - Laboratorio Pérez
+- app/data/catalogo.json es la única definición del catálogo (categorías, pruebas y precio inicial)
+- Las categorías viven en la tabla 'categorias' (orden del archivo y total de pruebas);
+  cada prueba guarda categoria_id y una copia del nombre. recontar_categorias() mantiene
+  los totales con un solo UPDATE después de cada cambio
+- La diferencia con la tabla 'pruebas' se calcula en memoria con una sola consulta
+- Se aplica con un solo INSERT ... ON CONFLICT DO UPDATE y un solo DELETE, en una transacción
+- Ejecutarlo dos veces seguidas no hace nada la segunda vez
+- Mantenimiento (renumerar, limpiar, vaciar, precios a cero): una sentencia SQL por paso, en una transacción
+- Snapshot del catálogo público: una consulta cada CATALOGO_CACHE_SEGUNDOS por proceso,
+  con el JSON de cada categoría serializado y comprimido una sola vez; si la base cae,
+  se sigue sirviendo el último
+Uso: flask --app run lab catalogo sync [--dry-run]
+"""
+import json
+import os
+import re
+import threading
+import time
+from flask import current_app, url_for
+from sqlalchemy import delete, func, or_, select, text, true, update
+from sqlalchemy.exc import DBAPIError
+from app import db
+from app.circuito import CircuitoAbierto
+from app.clasificador import normalizar
+from app.compresion import comprimir, etag_de
+from app.models import Categoria, Prueba
+
+ARCHIVO_CATALOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'catalogo.json')
+LARGO_DESCRIPCION = 100  # Caracteres de la descripción que muestra la tarjeta pública
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def descripcion_por_defecto(nombre, categoria):
+    return f"Prueba de {categoria.lower()}: {nombre}"
+
+
+def cargar_catalogo(ruta=ARCHIVO_CATALOGO):
+    """
+    Lee el archivo del catálogo. Cada prueba puede ser solo el nombre o un objeto
+    con 'nombre' y opcionalmente 'descripcion' y 'precio'.
+
+    Returns:
+        dict: (categoria, nombre) -> {'descripcion', 'precio'} en el orden del archivo
+    """
+    with open(ruta, encoding='utf-8') as f:
+        datos = json.load(f)
+
+    catalogo = {}
+    for categoria in datos['categorias']:
+        for prueba in categoria['pruebas']:
+            if isinstance(prueba, str):
+                prueba = {'nombre': prueba}
+            clave = (categoria['nombre'], prueba['nombre'])
+            if clave in catalogo:
+                raise ValueError(f"Prueba repetida en {os.path.basename(ruta)}: {clave[1]} ({clave[0]})")
+            catalogo[clave] = {
+                'descripcion': prueba.get('descripcion') or descripcion_por_defecto(clave[1], clave[0]),
+                'precio': float(prueba.get('precio', categoria.get('precio', 0.0))),
+            }
+    return catalogo
+
+
+def orden_categorias(catalogo):
+    """{categoria: posición} en el orden del archivo"""
+    return {categoria: i for i, categoria in enumerate(dict.fromkeys(c for c, _ in catalogo))}
+
+
+def calcular_diferencias(catalogo):
+    """
+    Compara el catálogo con las tablas 'categorias' y 'pruebas' (una consulta cada una,
+    sin cargar objetos ORM). El precio del archivo solo se usa al crear: los precios
+    editados desde el admin se respetan.
+
+    Returns:
+        dict: listas 'categorias' (nombre, orden) a crear o reordenar, 'nuevas', 'modificadas'
+        (claves), 'sobrantes', 'duplicadas' (filas) y 'sin_cambios'
+    """
+    actuales = {fila.nombre: fila for fila in db.session.execute(
+        select(Categoria.nombre, Categoria.id, Categoria.orden)
+    )}
+    categorias = [(nombre, orden) for nombre, orden in orden_categorias(catalogo).items()
+                  if nombre not in actuales or actuales[nombre].orden != orden]
+
+    filas = db.session.execute(
+        select(Prueba.id, Prueba.categoria, Prueba.categoria_id, Prueba.nombre, Prueba.descripcion,
+               Prueba.imagen).order_by(Prueba.id)
+    ).all()
+
+    existentes, duplicadas = {}, []
+    for fila in filas:
+        clave = (fila.categoria, fila.nombre)
+        if clave in existentes:
+            duplicadas.append(fila)
+        else:
+            existentes[clave] = fila
+
+    nuevas = [clave for clave in catalogo if clave not in existentes]
+    modificadas = [
+        clave for clave, datos in catalogo.items() if clave in existentes and (
+            existentes[clave].descripcion != datos['descripcion']
+            or existentes[clave].categoria_id is None
+            or existentes[clave].categoria_id != getattr(actuales.get(clave[0]), 'id', None)
+        )
+    ]
+    sobrantes = [fila for clave, fila in existentes.items() if clave not in catalogo]
+    return {
+        'categorias': categorias,
+        'nuevas': nuevas,
+        'modificadas': modificadas,
+        'sobrantes': sobrantes,
+        'duplicadas': duplicadas,
+        'sin_cambios': len(catalogo) - len(nuevas) - len(modificadas),
+    }
+
+
+def _insert_del_dialecto():
+    dialecto = db.session.get_bind().dialect.name
+    if dialecto == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialecto == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f'INSERT ... ON CONFLICT no disponible para {dialecto}')
+    return insert
+
+
+def aplicar_diferencias(catalogo, diferencias, eliminar=True):
+    """
+    Aplica las diferencias en una sola transacción: upsert de categorías, upsert de
+    pruebas, DELETE de las sobrantes y recuento de pruebas por categoría.
+    Requiere los índices únicos de categorias.nombre y (categoria, nombre):
+    ver migrar_catalogo_unico.py y migrar_categorias.py
+
+    Returns:
+        dict: filas insertadas/actualizadas y eliminadas
+    """
+    from app.imagenes import eliminar_imagenes_huerfanas
+
+    eliminadas = diferencias['sobrantes'] if eliminar else []
+
+    try:
+        if diferencias['categorias']:
+            insert = _insert_del_dialecto()
+            sentencia = insert(Categoria.__table__).values(
+                [{'nombre': nombre, 'orden': orden} for nombre, orden in diferencias['categorias']]
+            )
+            sentencia = sentencia.on_conflict_do_update(
+                index_elements=['nombre'],
+                set_={'orden': sentencia.excluded.orden},
+            )
+            db.session.execute(sentencia)
+
+        claves = diferencias['nuevas'] + diferencias['modificadas']
+        if claves:
+            ids = dict(db.session.execute(select(Categoria.nombre, Categoria.id)).all())
+            filas = [{'categoria': categoria, 'categoria_id': ids[categoria], 'nombre': nombre,
+                      **catalogo[(categoria, nombre)]} for categoria, nombre in claves]
+            insert = _insert_del_dialecto()
+            sentencia = insert(Prueba.__table__).values(filas)
+            sentencia = sentencia.on_conflict_do_update(
+                index_elements=['categoria', 'nombre'],
+                set_={'descripcion': sentencia.excluded.descripcion,
+                      'categoria_id': sentencia.excluded.categoria_id},
+            )
+            db.session.execute(sentencia)
+        if eliminadas:
+            db.session.execute(delete(Prueba).where(Prueba.id.in_([fila.id for fila in eliminadas])))
+        recontar_categorias()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidar_snapshot()
+
+    # Las imágenes se borran después del commit y solo si ninguna otra prueba las usa
+    eliminar_imagenes_huerfanas(fila.imagen for fila in eliminadas)
+    return {'upsert': len(claves), 'eliminadas': len(eliminadas)}
+
+
+# ============ CATEGORÍAS ============
+
+def recontar_categorias():
+    """
+    Recalcula total_pruebas de todas las categorías con un solo UPDATE (solo escribe
+    las que cambiaron). No hace commit: va en la misma transacción que el cambio.
+    """
+    db.session.flush()
+    total = (select(func.count()).select_from(Prueba)
+             .where(Prueba.categoria_id == Categoria.id).correlate(Categoria).scalar_subquery())
+    db.session.execute(
+        update(Categoria).where(Categoria.total_pruebas != total).values(total_pruebas=total),
+        execution_options={'synchronize_session': False},
+    )
+
+
+def asignar_categoria(prueba, nombre):
+    """
+    Asigna la categoría por nombre (formularios del admin). Si no existe se crea al
+    final del orden. Un nombre vacío deja la prueba sin categoría. No hace commit.
+    """
+    nombre = (nombre or '').strip()
+    if not nombre:
+        prueba.categoria_id, prueba.categoria = None, None
+        return
+    categoria = Categoria.query.filter_by(nombre=nombre).first()
+    if categoria is None:
+        ultimo = db.session.execute(select(func.max(Categoria.orden))).scalar()
+        categoria = Categoria(nombre=nombre, orden=(ultimo if ultimo is not None else -1) + 1, total_pruebas=0)
+        db.session.add(categoria)
+        db.session.flush()
+    prueba.categoria_id, prueba.categoria = categoria.id, categoria.nombre
+
+
+def categorias_ordenadas():
+    """Todas las categorías en el orden del catálogo (una sola lectura de 'categorias')"""
+    return Categoria.query.order_by(Categoria.orden, Categoria.nombre).all()
+
+
+# ============ MANTENIMIENTO ============
+
+def resumen_categorias():
+    """[(categoria, cantidad)] desde los totales de 'categorias', sin contar pruebas"""
+    return [(c.nombre, c.total_pruebas) for c in categorias_ordenadas()]
+
+
+def _ejecutar(*sentencias):
+    """Ejecuta las sentencias en una sola transacción. Devuelve los resultados."""
+    try:
+        resultados = [db.session.execute(s, execution_options={'synchronize_session': False})
+                      for s in sentencias]
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidar_snapshot()
+    return resultados
+
+
+def _eliminar(condicion, *despues):
+    """
+    Un solo DELETE ... RETURNING (más las sentencias `despues` y el recuento de
+    categorías, en la misma transacción). Devuelve (pruebas eliminadas, imágenes borradas)
+    """
+    from app.imagenes import eliminar_imagenes_huerfanas
+
+    try:
+        imagenes = db.session.execute(delete(Prueba).where(condicion).returning(Prueba.imagen)).scalars().all()
+        for sentencia in despues:
+            db.session.execute(sentencia, execution_options={'synchronize_session': False})
+        recontar_categorias()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    invalidar_snapshot()
+    return len(imagenes), eliminar_imagenes_huerfanas(imagenes)
+
+
+def categorias_del_catalogo(catalogo=None):
+    catalogo = catalogo if catalogo is not None else cargar_catalogo()
+    return sorted({categoria for categoria, _ in catalogo})
+
+
+def condicion_fuera_de_catalogo(categorias):
+    return or_(Prueba.categoria.is_(None), Prueba.categoria.not_in(categorias))
+
+
+def limpiar_categorias(categorias):
+    """Elimina las pruebas sin categoría o con una categoría que no está en `categorias`, y esas categorías"""
+    return _eliminar(condicion_fuera_de_catalogo(categorias), delete(Categoria).where(Categoria.nombre.not_in(categorias)))
+
+
+def vaciar():
+    """Elimina todas las pruebas"""
+    return _eliminar(true())
+
+
+def precios_a_cero():
+    """Deja en 0 los precios mayores a 0. Devuelve las filas actualizadas"""
+    resultado, = _ejecutar(update(Prueba).where(Prueba.precio > 0).values(precio=0.0))
+    return resultado.rowcount
+
+
+def renumerar_ids():
+    """
+    IDs consecutivos 1..N en el orden actual, en el lugar (UPDATE con un CTE de mapeo,
+    sin borrar ni recrear filas). Dos pasadas para no chocar con la clave primaria:
+    primero al valor final en negativo y luego al positivo. La secuencia queda en N + 1.
+
+    Returns:
+        int: pruebas cuyo ID cambió
+    """
+    mapa = select(
+        Prueba.id.label('viejo'),
+        func.row_number().over(order_by=Prueba.id).label('nuevo'),
+    ).cte('mapa')
+
+    sentencias = [
+        update(Prueba)
+        .where(Prueba.id == mapa.c.viejo, Prueba.id != mapa.c.nuevo)
+        .values(id=-mapa.c.nuevo),
+        update(Prueba).where(Prueba.id < 0).values(id=-Prueba.id),
+    ]
+    if db.session.get_bind().dialect.name == 'postgresql':
+        sentencias.append(text(
+            "SELECT setval(pg_get_serial_sequence('pruebas', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM pruebas"
+        ))
+    # rowcount de la segunda pasada: algunos drivers no lo informan para UPDATE con WITH
+    movidas = _ejecutar(*sentencias)[1].rowcount
+    db.session.expire_all()
+    return movidas
+
+
+# ============ SNAPSHOT DEL CATÁLOGO PÚBLICO ============
+
+def slug_categoria(categoria):
+    """'PERFIL OBSTÉTRICO' -> 'perfil-obstetrico'"""
+    return re.sub(r'[^a-z0-9]+', '-', normalizar(categoria).lower()).strip('-')
+
+
+def _prueba_publica(fila):
+    """Solo lo que muestra la tarjeta pública; se omiten los campos vacíos"""
+    from app.imagenes import imagen_srcset
+
+    prueba = {
+        'id': fila.id,
+        'nombre': fila.nombre,
+        'descripcion': (fila.descripcion or '')[:LARGO_DESCRIPCION],
+        'precio': round(float(fila.precio or 0), 2),
+    }
+    if fila.imagen:
+        prueba['imagen'] = url_for('static', filename='uploads/pruebas/' + fila.imagen)
+        for formato in ('avif', 'webp'):
+            srcset = imagen_srcset(fila.imagen, formato)
+            if srcset:
+                prueba[formato] = srcset
+        if fila.imagen_lqip:
+            prueba['lqip'] = fila.imagen_lqip
+    return prueba
+
+
+def _construir_snapshot():
+    # Categorías en el orden del catálogo; las pruebas sin categoría ('General') al final
+    filas = db.session.execute(
+        select(Prueba.id, Prueba.nombre, Prueba.categoria, Prueba.descripcion, Prueba.precio,
+               Prueba.imagen, Prueba.imagen_lqip)
+        .outerjoin(Categoria, Prueba.categoria_id == Categoria.id)
+        .order_by(Categoria.orden.is_(None), Categoria.orden, Prueba.categoria, Prueba.nombre)
+    ).all()
+
+    agrupadas = {}
+    for fila in filas:
+        agrupadas.setdefault(fila.categoria or 'General', []).append(_prueba_publica(fila))
+
+    categorias, slugs = [], set()
+    for nombre, pruebas in agrupadas.items():
+        slug = base = slug_categoria(nombre) or 'general'
+        n = 2
+        while slug in slugs:
+            slug, n = f'{base}-{n}', n + 1
+        slugs.add(slug)
+        categorias.append({'nombre': nombre, 'slug': slug, 'total': len(pruebas), 'pruebas': pruebas})
+
+    return {
+        'creado': time.monotonic(),
+        'total': len(filas),
+        'categorias': categorias,
+        'por_slug': {c['slug']: c for c in categorias},
+        # Índice de precios/tarjetas por id (carrito y búsqueda, sin consultar la base)
+        'por_id': {p['id']: (p, c) for c in categorias for p in c['pruebas']},
+        'json': {},
+    }
+
+
+def snapshot_catalogo():
+    """
+    Catálogo público agrupado por categoría. Se reconstruye cuando vence
+    CATALOGO_CACHE_SEGUNDOS o cuando este proceso modifica pruebas (invalidar_snapshot).
+    Los demás workers lo ven a más tardar al vencer el plazo.
+
+    Si la base no responde se sigue sirviendo el snapshot anterior (modo degradado),
+    y mientras un hilo lo reconstruye los demás no esperan: usan el anterior.
+    """
+    global _snapshot
+    ttl = current_app.config['CATALOGO_CACHE_SEGUNDOS']
+    actual = _snapshot
+    if actual is not None and time.monotonic() - actual['creado'] < ttl:
+        return actual
+    if not _snapshot_lock.acquire(blocking=actual is None):
+        return actual
+    try:
+        if _snapshot is None or time.monotonic() - _snapshot['creado'] >= ttl:
+            try:
+                _snapshot = _construir_snapshot()
+            except (CircuitoAbierto, DBAPIError) as e:
+                db.session.rollback()
+                if _snapshot is None:
+                    raise
+                current_app.logger.warning(f'Catálogo: base no disponible, se sirve el snapshot anterior ({e.__class__.__name__})')
+        return _snapshot
+    finally:
+        _snapshot_lock.release()
+
+
+def invalidar_snapshot():
+    """Fuerza la reconstrucción; el snapshot anterior queda de respaldo si la base falla"""
+    global _snapshot
+    if _snapshot is not None:
+        _snapshot = {**_snapshot, 'creado': float('-inf')}
+
+
+def documento_json(snapshot, slug=None):
+    """
+    JSON compacto del catálogo completo (slug=None) o de una categoría, serializado,
+    comprimido y con ETag una sola vez por snapshot.
+
+    Returns:
+        tuple: (bytes, {encoding: bytes}, etag) o None si la categoría no existe
+    """
+    documento = snapshot['json'].get(slug)
+    if documento is not None:
+        return documento
+
+    if slug is None:
+        datos = {'total': snapshot['total'], 'categorias': snapshot['categorias']}
+    elif slug in snapshot['por_slug']:
+        datos = snapshot['por_slug'][slug]
+    else:
+        return None
+    contenido = json.dumps(datos, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    documento = (contenido, comprimir(contenido), etag_de(contenido))
+    snapshot['json'][slug] = documento
+    return documento
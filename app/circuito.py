@@ -0,0 +1,107 @@
+"""
+Circuit breaker de la base de datos - Laboratorio Pérez
+- Cuenta los fallos de conexión seguidos al motor principal; con CIRCUITO_FALLOS
+  el circuito se abre y las consultas fallan al instante (CircuitoAbierto) en vez de
+  esperar connect_timeout + pool_timeout ocupando un hilo del worker
+- Abierto: un hilo en segundo plano prueba la base cada CIRCUITO_PAUSA_SEGUNDOS
+  (semiabierto mientras prueba); la primera consulta exitosa lo cierra
+- Mientras tanto se sirve en modo degradado: el catálogo desde el último snapshot,
+  la portada y el portal son estáticos, las lecturas con réplica siguen en la réplica
+- Es por proceso: cada worker abre y cierra su propio circuito
+"""
+import threading
+import time
+from sqlalchemy import event, text
+
+CERRADO, ABIERTO, SEMIABIERTO = 'cerrado', 'abierto', 'semiabierto'
+
+_estado = {
+    'estado': CERRADO,
+    'fallos': 0,              # Fallos de conexión seguidos
+    'abierto_desde': None,    # time.time() de la apertura
+    'ultimo_error': None,
+}
+_lock = threading.Lock()
+
+
+class CircuitoAbierto(Exception):
+    """La base de datos principal no está disponible; no se intentó conectar"""
+
+
+def abierto():
+    return _estado['estado'] != CERRADO
+
+
+def verificar():
+    """Lanza CircuitoAbierto si el circuito no deja pasar consultas a la primaria"""
+    if _estado['estado'] != CERRADO:
+        raise CircuitoAbierto(_estado['ultimo_error'] or 'Base de datos no disponible')
+
+
+def registrar_fallo(app, error):
+    with _lock:
+        _estado['fallos'] += 1
+        _estado['ultimo_error'] = error
+        if _estado['estado'] != CERRADO or _estado['fallos'] < app.config['CIRCUITO_FALLOS']:
+            return
+        _estado['estado'] = ABIERTO
+        _estado['abierto_desde'] = time.time()
+    app.logger.error(f"Circuito de base de datos ABIERTO tras {_estado['fallos']} fallos: {error}")
+    threading.Thread(target=_probar, args=(app,), name='circuito', daemon=True).start()
+
+
+def registrar_exito(app):
+    with _lock:
+        anterior = _estado['estado']
+        _estado.update(estado=CERRADO, fallos=0, abierto_desde=None, ultimo_error=None)
+    if anterior != CERRADO:
+        app.logger.warning('Circuito de base de datos cerrado: la base responde de nuevo')
+
+
+def _probar(app):
+    """Hilo de prueba mientras el circuito está abierto (uno por apertura)"""
+    from app import db
+
+    with app.app_context():
+        motor = db.engine
+    pausa = app.config['CIRCUITO_PAUSA_SEGUNDOS']
+    while _estado['estado'] != CERRADO:
+        time.sleep(pausa)
+        with _lock:
+            if _estado['estado'] == CERRADO:
+                return
+            _estado['estado'] = SEMIABIERTO
+        try:
+            with motor.connect() as conexion:
+                conexion.execute(text('SELECT 1'))  # after_cursor_execute cierra el circuito
+        except Exception:
+            with _lock:
+                if _estado['estado'] == SEMIABIERTO:
+                    _estado['estado'] = ABIERTO
+
+
+def estado():
+    """Estado para /health"""
+    desde = _estado['abierto_desde']
+    return {
+        'estado': _estado['estado'],
+        'fallos_seguidos': _estado['fallos'],
+        'abierto_segundos': round(time.time() - desde, 1) if desde else None,
+    }
+
+
+def init_app(app):
+    with app.app_context():
+        motor = app.extensions['sqlalchemy'].engines[None]
+
+    @event.listens_for(motor, 'handle_error')
+    def _error_principal(contexto):
+        # Solo fallos de conexión: conectando (sin conexión aún) o conexión caída
+        if contexto.is_disconnect or contexto.connection is None:
+            registrar_fallo(app, f'{contexto.original_exception.__class__.__name__}: {contexto.original_exception}')
+
+    @event.listens_for(motor, 'after_cursor_execute')
+    def _consulta_exitosa(*args):
+        if _estado['fallos'] or _estado['estado'] != CERRADO:
+            registrar_exito(app)
+
@@ -0,0 +1,320 @@
+"""
+Clasificador de pruebas por palabras clave - Laboratorio Pérez
+- Tabla única término -> consulta en inglés para buscar imágenes técnicas (NO personas)
+- Compilada una sola vez en una expresión regular con todas las alternativas
+- Sin distinguir acentos ni mayúsculas ('Proteinas' == 'PROTEÍNAS')
+- Gana el término más largo presente en el nombre (a igual largo, el que aparece primero);
+  los términos solo coinciden con palabras completas ('UREA' no coincide en 'UREAPLASMA')
+"""
+import bisect
+import re
+import unicodedata
+
+TERMINOS = {
+    # HEMATOLOGÍA - Imágenes de sangre y células
+    "HEMOGRAMA": "blood cells microscope laboratory slide",
+    "VELOCIDAD DE SEDIMENTACIÓN": "laboratory test tube blood sedimentation",
+    "HEMOGLOBINA": "red blood cells microscope hemoglobin",
+    "HEMATOCRITO": "blood sample centrifuge hematocrit tube",
+    "PLAQUETAS": "platelets microscope blood cells",
+    "RETICULOCITOS": "reticulocytes blood cells stain microscope",
+    "GRUPO SANGUÍNEO": "blood type test laboratory tubes",
+    "COOMBS": "laboratory blood test tubes reagent",
+    "HIERRO": "iron supplement laboratory test",
+    "FERRITINA": "laboratory test tube chemistry analysis",
+    "TRANSFERRINA": "laboratory test sample analysis",
+
+    # COAGULACIÓN - Equipos y procesos
+    "PROTROMBINA": "blood clotting test laboratory equipment",
+    "TROMBOPLASTINA": "coagulation test laboratory tubes",
+    "TROMBINA": "laboratory test coagulation analysis",
+    "COAGULACIÓN": "blood clotting laboratory process",
+    "DÍMERO": "laboratory test equipment analysis",
+
+    # GLUCOSA Y DIABETES
+    "GLUCOSA": "glucose meter test laboratory blood sugar",
+    "TOLERANCIA GLUCOSA": "glucose test laboratory equipment meter",
+    "HEMOGLOBINA GLICOSILADA": "diabetes test laboratory analysis HbA1c",
+
+    # BIOQUÍMICA
+    "UREA": "laboratory chemistry test tubes analysis",
+    "CREATININA": "kidney function test laboratory chemistry",
+    "ÁCIDO ÚRICO": "uric acid crystals microscope laboratory",
+    "COLESTEROL": "cholesterol test laboratory tubes lipids",
+    "TRIGLICÉRIDOS": "lipid test laboratory chemistry analysis",
+    "AMILASA": "enzyme test laboratory pancreas analysis",
+    "LIPASA": "lipase test laboratory tubes chemistry",
+    "TRANSAMINASAS": "liver function test laboratory tubes",
+    "BILIRRUBINAS": "bilirubin test laboratory yellow sample",
+    "FOSFATASA": "alkaline phosphatase test laboratory chemistry",
+    "GGT": "liver enzyme test laboratory tubes",
+    "LDH": "lactate dehydrogenase laboratory test",
+    "CPK": "creatine kinase test laboratory muscle enzyme",
+    "TROPONINA": "troponin test laboratory cardiac marker",
+    "PROTEÍNAS": "protein test laboratory chemistry analysis",
+
+    # ELECTROLITOS
+    "CALCIO": "calcium test laboratory chemistry minerals",
+    "MAGNESIO": "magnesium test laboratory analysis minerals",
+    "FÓSFORO": "phosphorus test laboratory chemistry",
+    "ELECTROLITOS": "electrolytes test laboratory chemistry ions",
+
+    # ALERGIAS
+    "ALÉRGENOS": "allergy test laboratory skin prick panel",
+    "ALERGIAS": "allergy testing laboratory panel analysis",
+
+    # HORMONAS
+    "TSH": "thyroid test laboratory hormone analysis",
+    "T3": "thyroid hormone test laboratory tubes",
+    "T4": "thyroid test laboratory hormone chemistry",
+    "TIROPEROXIDASA": "thyroid antibody test laboratory",
+    "LUTEINIZANTE": "hormone test laboratory reproductive",
+    "FOLÍCULO ESTIMULANTE": "FSH hormone test laboratory tubes",
+    "ESTRADIOL": "estrogen hormone test laboratory analysis",
+    "PROGESTERONA": "progesterone hormone test laboratory",
+    "TESTOSTERONA": "testosterone hormone test laboratory vial",
+    "PROLACTINA": "prolactin hormone test laboratory analysis",
+    "HCG": "pregnancy test laboratory hormone",
+    "CORTISOL": "cortisol stress hormone test laboratory",
+    "ACTH": "ACTH hormone test laboratory tubes",
+    "INSULINA": "insulin hormone test laboratory diabetes",
+    "PARATOHORMONA": "PTH parathyroid hormone test laboratory",
+    "HORMONA CRECIMIENTO": "growth hormone test laboratory vial",
+
+    # MARCADORES ONCOLÓGICOS
+    "ALFA FETO PROTEÍNA": "AFP tumor marker test laboratory",
+    "CARCINOEMBRIONARIO": "CEA tumor marker laboratory test",
+    "CA 125": "ovarian tumor marker test laboratory",
+    "CA 19-9": "pancreatic tumor marker laboratory test",
+    "CA 15-3": "breast tumor marker laboratory test",
+    "PSA": "prostate test laboratory PSA marker",
+    "TUMORAL": "tumor marker test laboratory analysis",
+
+    # BACTERIOLOGÍA
+    "CULTIVO": "bacterial culture petri dish laboratory",
+    "ANTIBIOGRAMA": "antibiotic sensitivity test petri dish",
+    "MYCOPLASMA": "bacterial culture laboratory microscope",
+    "EXAMEN FRESCO": "microscope slide laboratory sample",
+    "TINCIÓN GRAM": "gram stain microscope bacteria slide",
+    "MICOLÓGICO": "fungal culture laboratory petri dish",
+    "BACILOSCOPIA": "tuberculosis microscope slide stain",
+
+    # ORINA
+    "ORINA": "urine test laboratory sample container",
+    "MORFOLOGÍA ERITROCITARIA": "urine microscope red cells analysis",
+    "CÁLCULO RENAL": "kidney stone laboratory analysis crystals",
+    "DEPURACIÓN CREATININA": "kidney function test laboratory",
+    "COCAÍNA": "drug test laboratory urine screening",
+    "MARIHUANA": "drug screening test laboratory urine",
+
+    # VITAMINAS
+    "VITAMINA B12": "vitamin B12 supplement laboratory test",
+    "VITAMINA D": "vitamin D test laboratory analysis",
+
+    # MATERIA FECAL
+    "PARASITOLÓGICO": "parasite microscope laboratory stool sample",
+    "MOCO FECAL": "stool sample laboratory test container",
+    "SANGRE OCULTA": "occult blood test laboratory stool",
+    "GRAHAM": "pinworm test laboratory tape slide",
+    "AZÚCARES REDUCTORES": "sugar test laboratory chemistry stool",
+    "GIARDIA": "giardia parasite microscope laboratory",
+    "AMEBA": "amoeba parasite microscope laboratory",
+    "PYLORI HECES": "H pylori test laboratory stool",
+    "ROTAVIRUS": "virus test laboratory sample",
+    "ADENOVIRUS": "virus laboratory test sample",
+
+    # HEPATITIS
+    "HEPATITIS": "hepatitis test laboratory tubes virus",
+
+    # INMUNOLOGÍA
+    "PROTEÍNA C REACTIVA": "CRP test laboratory inflammation marker",
+    "FACTOR REUMATOIDE": "rheumatoid factor test laboratory tubes",
+    "ESTREPTOLISINA": "ASTO test laboratory strep antibody",
+    "WIDAL": "typhoid test laboratory tubes serology",
+    "RPR": "syphilis test laboratory RPR",
+    "BRUCELOSIS": "brucellosis test laboratory serology",
+    "TOXOPLASMA": "toxoplasma antibody test laboratory",
+    "CITOMEGALOVIRUS": "CMV antibody test laboratory tubes",
+    "EPSTEIN BARR": "EBV antibody test laboratory",
+    "HERPES": "herpes virus test laboratory antibody",
+    "VIH": "HIV test laboratory virus screening",
+    "RUBEOLA": "rubella antibody test laboratory",
+    "SARAMPIÓN": "measles antibody test laboratory",
+    "CHLAMYDIA": "chlamydia test laboratory screening",
+    "SÍFILIS": "syphilis test laboratory serology tubes",
+    "CHAGAS": "chagas disease test laboratory serology",
+    "CITRULINADO": "rheumatoid arthritis test laboratory CCP",
+    "ANTINUCLEARES": "ANA test laboratory autoimmune",
+    "DNA": "DNA test laboratory genetic helix",
+    "SMITH": "anti-Smith antibody test laboratory",
+    "ENA": "ENA antibody test laboratory panel",
+    "COMPLEMENTOS": "complement test laboratory immunology",
+    "INMUNOGLOBULINAS": "immunoglobulin test laboratory tubes",
+    "PYLORI SUERO": "H pylori blood test laboratory",
+    "ENDOMISIO": "celiac antibody test laboratory",
+    "GLIADINA": "gluten antibody test laboratory",
+
+    # BIOLOGÍA MOLECULAR
+    "PATÓGENOS": "pathogen detection laboratory PCR",
+    "FIEBRES HEMORRÁGICAS": "viral hemorrhagic fever test laboratory",
+    "VPH": "HPV DNA test laboratory genotyping",
+    "MICROORGANISMOS RESPIRATORIOS": "respiratory pathogen test laboratory PCR"
+}
+
+# Si ningún término aparece en el nombre, keywords generales por categoría
+KEYWORDS_CATEGORIA = {
+    "HEMATOLOGÍA": "blood test laboratory microscope cells",
+    "COAGULACIÓN": "blood clotting laboratory test tubes",
+    "BIOQUÍMICA CLÍNICA": "laboratory chemistry test tubes analysis",
+    "ELECTROLITOS": "laboratory chemistry minerals test",
+    "ALERGIAS": "allergy laboratory test panel",
+    "ENDOCRINOLOGÍA": "hormone laboratory test tubes",
+    "MARCADORES ONCOLÓGICOS": "tumor marker laboratory test",
+    "BACTERIOLOGÍA": "bacteria culture petri dish laboratory",
+    "ORINA": "urine laboratory test sample",
+    "VITAMINAS": "vitamin laboratory test supplement",
+    "MATERIA FECAL": "laboratory stool sample test",
+    "PERFIL PRE-OPERATORIO": "laboratory blood test tubes",
+    "PERFIL REUMATOIDEO": "laboratory test tubes rheumatoid",
+    "PERFIL HEPÁTICO": "liver function laboratory test",
+    "PERFIL OBSTÉTRICO CONTROL": "laboratory pregnancy test tubes",
+    "PERFIL OBSTÉTRICO": "pregnancy laboratory test blood",
+    "MARCADORES DE HEPATITIS": "hepatitis laboratory test tubes",
+    "INMUNOLOGÍA": "antibody laboratory test immunology",
+    "BIOLOGÍA MOLECULAR": "DNA laboratory test PCR"
+}
+
+# Consulta si no coincide ni el nombre ni la categoría
+KEYWORDS_GENERICAS = "medical laboratory test equipment"
+
+# Nombre -> término esperado (None = se usa la categoría). Ver verificar()
+CASOS_VERIFICACION = [
+    ("HEMOGRAMA", "HEMOGRAMA"),
+    ("HEMOGLOBINA GLICOSILADA (HbA1c)", "HEMOGLOBINA GLICOSILADA"),
+    ("Hemoglobina glicosilada", "HEMOGLOBINA GLICOSILADA"),
+    ("HEMOGLOBINA-HEMATOCRITO", "HEMOGLOBINA"),        # Igual largo: gana el primero
+    ("TIEMPO DE PROTROMBINA (INR)", "PROTROMBINA"),
+    ("TIEMPO DE TROMBINA", "TROMBINA"),
+    ("CULTIVO Y ANTIBIOGRAMA PARA MYCOPLASMA Y UREAPLASMA", "ANTIBIOGRAMA"),
+    ("PROTEINAS TOTALES Y FRACCIONES", "PROTEÍNAS"),
+    ("PROTEÍNA C REACTIVA (PCR)", "PROTEÍNA C REACTIVA"),
+    ("FACTOR REUMATOIDE (FR NEFELOMETRÍA)", "FACTOR REUMATOIDE"),
+    ("T4 LIBRE", "T4"),
+    ("B-HCG CUANTITATIVA", "HCG"),
+    ("H. PYLORI HECES", "PYLORI HECES"),
+    ("ANTI ENA (Ro,La,Sm,RNP,Scl-70,Jo1)", "ENA"),
+    ("VITAMINA D (25 HIDROXIVITAMINA D)", "VITAMINA D"),
+    ("sangre oculta seriado x3", "SANGRE OCULTA"),
+    ("ÁCIDO ÚRICO", "ÁCIDO ÚRICO"),
+    ("acido urico", "ÁCIDO ÚRICO"),
+    ("HELICOBACTER PYLORI (IgG) (ELISA)", None),
+    ("TOLERANCIA A LA GLUCOSA", "GLUCOSA"),
+    ("", None),
+]
+
+
+_DIACRITICOS = re.compile('[\u0300-\u036f]')
+
+
+def normalizar(texto):
+    """Mayúsculas sin acentos: 'Proteína' -> 'PROTEINA'"""
+    return _DIACRITICOS.sub('', unicodedata.normalize('NFKD', texto or '')).upper()
+
+
+def _regex_trie(terminos):
+    """
+    Alternación factorizada por prefijos comunes ('CA 1(?:25|9-9|5-3)'): en cada posición el motor
+    recorre un árbol en lugar de probar ~150 alternativas. Los '?' codiciosos prueban primero
+    el término más largo y retroceden al más corto si no cierra en fin de palabra.
+    """
+    trie = {}
+    for termino in terminos:
+        nodo = trie
+        for caracter in termino:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = True
+
+    def patron(nodo):
+        fin = nodo.pop('', False)
+        ramas = [re.escape(c) + patron(hijo) for c, hijo in sorted(nodo.items())]
+        if not ramas:
+            return ''
+        if len(ramas) == 1 and not fin:
+            return ramas[0]
+        return f"(?:{'|'.join(ramas)})" + ('?' if fin else '')
+
+    return patron(trie)
+
+
+def _compilar():
+    terminos = {}
+    for termino in TERMINOS:
+        clave = normalizar(termino)
+        if clave in terminos:
+            raise ValueError(f'Términos duplicados sin acentos: {terminos[clave]!r} y {termino!r}')
+        terminos[clave] = termino
+    # El lookahead no consume texto: así también se ven coincidencias que se solapan
+    return terminos, re.compile(rf'(?<!\w)(?=({_regex_trie(terminos)})(?!\w))')
+
+
+_TERMINOS_NORMALIZADOS, _PATRON = _compilar()
+_CATEGORIAS = {normalizar(c): kw for c, kw in KEYWORDS_CATEGORIA.items()}
+
+
+def terminos_catalogo(nombres):
+    """
+    Término (tal como está en TERMINOS) que gana para cada nombre, en una sola pasada
+    de la expresión regular sobre todos los nombres unidos.
+
+    Returns:
+        list: un término o None por nombre
+    """
+    nombres = list(nombres)
+    if not nombres:
+        return []
+    # Normalizar todo junto (una llamada) y recuperar dónde empieza cada nombre
+    texto = normalizar('\n'.join((n or '').replace('\n', ' ') for n in nombres))
+    inicios, posicion = [], 0
+    for parte in texto.split('\n'):
+        inicios.append(posicion)
+        posicion += len(parte) + 1
+
+    mejores = [None] * len(inicios)         # (largo, -posición, término)
+    for coincidencia in _PATRON.finditer(texto):
+        termino = coincidencia.group(1)
+        i = bisect.bisect_right(inicios, coincidencia.start()) - 1
+        candidato = (len(termino), -coincidencia.start(), termino)
+        if mejores[i] is None or candidato > mejores[i]:
+            mejores[i] = candidato
+    return [_TERMINOS_NORMALIZADOS[m[2]] if m else None for m in mejores]
+
+
+def clasificar_catalogo(pruebas):
+    """
+    Consulta de imagen para cada (nombre, categoría) del catálogo.
+
+    Returns:
+        list: keywords en el mismo orden que `pruebas`
+    """
+    pruebas = list(pruebas)
+    terminos = terminos_catalogo([nombre for nombre, _ in pruebas])
+    return [TERMINOS[t] if t else _CATEGORIAS.get(normalizar(categoria), KEYWORDS_GENERICAS)
+            for t, (_, categoria) in zip(terminos, pruebas)]
+
+
+def palabras_clave(nombre_prueba, categoria):
+    """Consulta de imagen para una sola prueba"""
+    return clasificar_catalogo([(nombre_prueba, categoria)])[0]
+
+
+def verificar():
+    """
+    Compara CASOS_VERIFICACION con el clasificador.
+
+    Returns:
+        list: (nombre, esperado, obtenido) de los casos que fallan
+    """
+    obtenidos = terminos_catalogo([nombre for nombre, _ in CASOS_VERIFICACION])
+    return [(nombre, esperado, obtenido)
+            for (nombre, esperado), obtenido in zip(CASOS_VERIFICACION, obtenidos)
+            if esperado != obtenido]
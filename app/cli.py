@@ -0,0 +1,527 @@
+"""
+Comandos de mantenimiento - Laboratorio Pérez
+Uso: flask --app run lab <comando>
+"""
+import os
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+lab = AppGroup('lab', help='Comandos de mantenimiento del Laboratorio Pérez.')
+
+
+def _kb(n):
+    return f'{n / 1024:7.1f} KB' if n is not None else '      - '
+
+
+@lab.command('assets')
+def construir_assets():
+    """Construye los CSS con hash, minificados y precomprimidos (.gz/.br)."""
+    from app.assets import comprimir_estaticos, construir
+
+    reporte = construir(current_app.static_folder) + comprimir_estaticos(current_app.static_folder)
+    current_app.extensions.pop('assets_manifiesto', None)
+
+    click.echo('=' * 80)
+    click.echo('📦 ASSETS CONSTRUIDOS EN app/static/dist (y .gz/.br de /static)')
+    click.echo('=' * 80)
+    click.echo(f"{'Paquete':<36}{'Fuente':>11}{'Minif.':>11}{'Gzip':>11}{'Brotli':>11}")
+    for fila in reporte:
+        click.echo(f"{fila['archivo']:<36}{_kb(fila['fuente'])}{_kb(fila['minificado'])}"
+                   f"{_kb(fila['gzip'])}{_kb(fila['brotli'])}")
+    click.echo('=' * 80)
+    click.echo('Tamaños por página (HTML antes/después y CSS enlazado): python benchmark_assets.py')
+
+
+@lab.command('vendor')
+def vendorizar_librerias():
+    """Descarga Bootstrap/librerías y genera iconos.css solo con los iconos usados."""
+    from app.assets import comprimir_estaticos, construir
+    from app.vendor import vendorizar
+
+    click.echo('⬇️  Descargando librerías y escaneando iconos usados en templates/JS...')
+    template_folder = os.path.join(current_app.root_path, current_app.template_folder)
+    escritos, faltantes = vendorizar(current_app.static_folder, template_folder)
+    for nombre, tam in escritos.items():
+        click.echo(f'   ✓ {nombre:<34}{_kb(tam)}')
+    for icono in faltantes:
+        click.echo(f'   ⚠ Icono no encontrado: {icono}')
+
+    construir(current_app.static_folder)
+    comprimir_estaticos(current_app.static_folder)
+    current_app.extensions.pop('assets_manifiesto', None)
+    click.echo('✅ Librerías publicadas con hash en app/static/dist (flask lab assets para ver tamaños)')
+
+
+@lab.command('imagenes-dedup')
+@click.option('--similares', default=0, show_default=True,
+              help='Fusionar también imágenes casi iguales hasta esta distancia Hamming (0-64).')
+@click.option('--dry-run', is_flag=True, help='Solo mostrar lo que se haría.')
+def deduplicar_imagenes(similares, dry_run):
+    """Fusiona imágenes de pruebas repetidas y actualiza las referencias en la BD."""
+    from app.imagenes import deduplicar
+
+    click.echo('🔎 Calculando SHA-256 y hash perceptual de uploads/pruebas...')
+    reporte = deduplicar(umbral_similares=similares, aplicar=not dry_run)
+
+    click.echo('=' * 80)
+    click.echo(f"Archivos analizados: {reporte['archivos']} ({_kb(reporte['bytes']).strip()}), "
+               f"contenidos distintos: {reporte['unicos']}")
+    for viejo, nuevo in sorted(reporte['reemplazos'].items()):
+        click.echo(f'   {viejo} -> {nuevo}')
+    for a, b, distancia in reporte['similares']:
+        click.echo(f'   ≈ {a} / {b} (distancia {distancia}, no fusionadas)')
+    for nombre in reporte['sin_referencia']:
+        click.echo(f'   ⚠ Sin pruebas que la usen: {nombre}')
+    click.echo('=' * 80)
+    if dry_run:
+        click.echo(f"ℹ Dry run: se liberarían {_kb(reporte['bytes_liberados']).strip()}")
+    else:
+        click.echo(f"✅ {len(reporte['reemplazos'])} archivos renombrados o fusionados, {reporte['filas_actualizadas']} pruebas "
+                   f"actualizadas, {_kb(reporte['bytes_liberados']).strip()} liberados")
+
+
+@lab.command('imagenes-pexels')
+@click.option('--todas', is_flag=True, help='Reemplazar también las imágenes que ya tienen las pruebas (ignora el progreso guardado).')
+@click.option('--concurrencia', default=6, show_default=True, help='Búsquedas/descargas simultáneas.')
+@click.option('--reiniciar', is_flag=True, help='Olvidar el progreso guardado (la cache de búsquedas se mantiene).')
+def imagenes_pexels(todas, concurrencia, reiniciar):
+    """Descarga de Pexels una imagen única por prueba (concurrente, con cache y reanudable)."""
+    from app.models import Prueba
+    from app.pexels import DATOS_DIR, asignar_imagenes
+
+    api_key = current_app.config['PEXELS_API_KEY']
+    if not api_key:
+        raise click.UsageError('Falta PEXELS_API_KEY en el entorno (.env)')
+    if reiniciar and os.path.exists(os.path.join(DATOS_DIR, 'estado.json')):
+        os.remove(os.path.join(DATOS_DIR, 'estado.json'))
+
+    pruebas = Prueba.query.order_by(Prueba.categoria, Prueba.nombre).all()
+    click.echo(f'🔍 Buscando imágenes para {sum(1 for p in pruebas if todas or not p.imagen)} pruebas '
+               f'({concurrencia} en paralelo)...')
+    e = asignar_imagenes(pruebas, api_key, reemplazar=todas, concurrencia=concurrencia)
+
+    click.echo('=' * 80)
+    click.echo(f"Pedidos: {e['pedidos']} (ya resueltos antes: {e['ya_resueltos']})")
+    click.echo(f"Consultas a la API: {e['consultas_api']} | desde cache: {e['consultas_cache']} | "
+               f"descargas: {e['descargas']} | {e['segundos']:.1f}s")
+    for clave, error in e['errores']:
+        click.echo(f'   ⚠ {clave}: {error}')
+    click.echo('=' * 80)
+    click.echo(f"✅ {e['actualizadas']} pruebas actualizadas")
+    if e['cuota_agotada'] or e['errores']:
+        click.echo('ℹ Quedaron pedidos pendientes: vuelve a ejecutar el comando para continuar donde quedó.')
+
+
+@lab.command('palabras-clave')
+@click.option('--verificar', is_flag=True, help='Solo comprobar la tabla de casos del clasificador.')
+def palabras_clave(verificar):
+    """Muestra la consulta de imagen que el clasificador asigna a cada prueba."""
+    from app.clasificador import CASOS_VERIFICACION, clasificar_catalogo, terminos_catalogo, verificar as verificar_casos
+
+    fallos = verificar_casos()
+    for nombre, esperado, obtenido in fallos:
+        click.echo(f'   ❌ {nombre!r}: se esperaba {esperado!r}, se obtuvo {obtenido!r}')
+    click.echo(f'{"⚠" if fallos else "✅"} Casos de verificación: {len(CASOS_VERIFICACION) - len(fallos)}'
+               f'/{len(CASOS_VERIFICACION)} correctos')
+    if verificar:
+        if fallos:
+            raise SystemExit(1)
+        return
+
+    from app.models import Prueba
+
+    pruebas = Prueba.query.order_by(Prueba.categoria, Prueba.nombre).all()
+    filas = [(p.nombre, p.categoria) for p in pruebas]
+    terminos = terminos_catalogo([nombre for nombre, _ in filas])
+    click.echo('=' * 80)
+    for (nombre, categoria), termino, consulta in zip(filas, terminos, clasificar_catalogo(filas)):
+        click.echo(f'{nombre[:38]:<40}{(termino or f"[{categoria}]")[:24]:<26}{consulta}')
+    click.echo('=' * 80)
+    click.echo(f'{sum(1 for t in terminos if t)}/{len(filas)} pruebas con término específico')
+
+
+@lab.command('plantillas')
+@click.option('--limpiar', is_flag=True, help='Borrar la cache de bytecode y compilar todo desde cero.')
+def precompilar_plantillas(limpiar):
+    """Compila todas las plantillas y llena la cache de bytecode compartida."""
+    from app.plantillas import directorio_cache, precompilar
+
+    entorno = current_app.jinja_env
+    entorno.cache.clear()  # create_app ya pudo precompilarlas en memoria
+    if limpiar and entorno.bytecode_cache is not None:
+        entorno.bytecode_cache.clear()
+    tiempos, errores = precompilar(current_app)
+    click.echo('=' * 80)
+    click.echo(f'🧩 PLANTILLAS COMPILADAS (cache en {directorio_cache(current_app)})')
+    click.echo('=' * 80)
+    for nombre, ms in sorted(tiempos, key=lambda t: -t[1]):
+        click.echo(f'{nombre:<60}{ms:9.1f} ms')
+    for nombre, error in errores:
+        click.echo(f'   ❌ {nombre}: {error}')
+    click.echo('=' * 80)
+    click.echo(f'{len(tiempos)} plantillas en {sum(ms for _, ms in tiempos):.0f} ms')
+    if errores:
+        raise SystemExit(1)
+
+
+@lab.command('scrub')
+@click.option('--hilos', default=4, show_default=True, help='Archivos revisados en paralelo.')
+@click.option('--mb-por-segundo', default=20.0, show_default=True,
+              help='Lectura máxima total del disco (0 = sin límite).')
+@click.option('--lote', default=500, show_default=True, help='Resultados por lote del cursor.')
+@click.option('--completo', is_flag=True, help='Leer también los archivos sin cambios desde el último scrub.')
+@click.option('--sin-reparar', is_flag=True, help='Solo reportar: no copiar archivos ni guardar hashes.')
+def scrub_pdfs(hilos, mb_por_segundo, lote, completo, sin_reparar):
+    """Verifica los PDFs de resultados (principal y backup) contra su SHA-256 y repara."""
+    from app.integridad import DANADO, FALTANTE, REPARABLE, scrub
+
+    click.echo(f"🔎 Revisando PDFs de resultados ({hilos} hilos, "
+               f"{f'{mb_por_segundo:g} MB/s' if mb_por_segundo else 'sin límite de lectura'}"
+               f"{', completo' if completo else ''}{', sin reparar' if sin_reparar else ''})...")
+    r, reporte = scrub(hilos, mb_por_segundo, lote, reparar=not sin_reparar, completo=completo,
+                       progreso=lambda n: click.echo(f'   {n} revisados...'))
+
+    click.echo('=' * 80)
+    click.echo(f"Revisados: {r['revisados']} | leídos: {r['bytes_leidos'] / 1024 / 1024:.1f} MB | {r['segundos']}s")
+    click.echo(f"✅ Correctos: {r['ok']} | sin cambios desde el último scrub: {r['sin_cambios']}")
+    click.echo(f"🔧 Reparados: {r['reparado']} | hashes guardados: {r['hashes_guardados']}")
+    if r[REPARABLE]:
+        click.echo(f"⚠ Reparables (--sin-reparar): {r[REPARABLE]}")
+    if r[DANADO] or r[FALTANTE]:
+        click.echo(f"❌ Sin copia sana: {r[DANADO]} dañados, {r[FALTANTE]} faltantes")
+    click.echo(f'📄 Reporte: {reporte}')
+    click.echo('=' * 80)
+    if r[DANADO] or r[FALTANTE] or r[REPARABLE]:
+        raise SystemExit(1)  # Para el cron: quedaron problemas sin resolver
+
+
+@lab.command('reconciliar')
+@click.option('--cuarentena', is_flag=True, help='Mover los huérfanos a instance/cuarentena/<fecha>/ (no se borran).')
+@click.option('--min-edad-horas', default=24.0, show_default=True,
+              help='Ignorar archivos más nuevos (subidas en curso).')
+@click.option('--tanda', default=100_000, show_default=True, help='Nombres ordenados en memoria por tanda.')
+@click.option('--mostrar', default=20, show_default=True, help='Ejemplos a mostrar por tipo.')
+def reconciliar_archivos(cuarentena, min_edad_horas, tanda, mostrar):
+    """Archivos huérfanos y resultados sin archivo en uploads/ y uploads/backups/."""
+    import json
+    from app.reconciliacion import COLGANTE, HUERFANO, reconciliar
+
+    resumen, reporte = reconciliar(cuarentena, min_edad_horas, tanda)
+
+    click.echo('=' * 80)
+    click.echo('🧮 CONCILIACIÓN DE ARCHIVOS DE RESULTADOS')
+    click.echo('=' * 80)
+    ejemplos = {}
+    with open(reporte, encoding='utf-8') as f:
+        for linea in f:
+            fila = json.loads(linea)
+            lista = ejemplos.setdefault((fila['directorio'], fila['tipo']), [])
+            if len(lista) < mostrar:
+                lista.append(fila)
+    for directorio, c in resumen.items():
+        click.echo(f"{directorio}: {c[HUERFANO]} huérfanos ({c['bytes_huerfanos'] / 1024 / 1024:.1f} MB), "
+                   f"{c[COLGANTE]} resultados sin archivo, {c['recientes']} recientes ignorados")
+        for fila in ejemplos.get((directorio, HUERFANO), []):
+            destino = f"  → {fila['cuarentena']}" if 'cuarentena' in fila else ''
+            click.echo(f"   🗂 {fila['archivo']}{destino}")
+        for fila in ejemplos.get((directorio, COLGANTE), []):
+            click.echo(f"   ❌ {fila['archivo']} (referenciado, no existe)")
+    click.echo(f'📄 Reporte: {reporte}')
+    click.echo('=' * 80)
+    total = sum(c[HUERFANO] for c in resumen.values())
+    if cuarentena:
+        click.echo(f"✅ {sum(c['en_cuarentena'] for c in resumen.values())} archivos movidos a cuarentena")
+    elif total:
+        click.echo('💡 Para apartarlos: flask --app run lab reconciliar --cuarentena')
+
+
+@lab.command('optimizar-pdfs')
+@click.option('--cada', default=200, show_default=True, help='Mostrar el avance cada N resultados.')
+def optimizar_pdfs(cada):
+    """Linealiza y recomprime los PDFs de resultados subidos antes de app/pdfs.py."""
+    from sqlalchemy import select
+    from app import db
+    from app.models import Resultado
+    from app.pdfs import optimizar_resultado, pikepdf
+
+    if pikepdf is None:
+        click.echo('❌ Falta pikepdf: pip install pikepdf')
+        raise SystemExit(1)
+    archivos = db.session.execute(
+        select(Resultado.archivo_pdf)
+        .where(Resultado.archivo_pdf.isnot(None), Resultado.archivo_pdf != '')
+        .order_by(Resultado.id)).scalars().all()
+    click.echo(f'📄 Optimizando {len(archivos)} PDFs de resultados...')
+
+    cuenta, antes, despues, errores = {}, 0, 0, []
+    for i, archivo in enumerate(archivos, 1):
+        try:
+            r = optimizar_resultado(archivo, current_app.config)
+        except Exception as e:
+            errores.append(f'{archivo}: {e}')
+            continue
+        cuenta[r['estado']] = cuenta.get(r['estado'], 0) + 1
+        if r['estado'] == 'optimizado':
+            antes += r['bytes_antes']
+            despues += r['bytes_despues']
+        if i % cada == 0:
+            click.echo(f'   {i} revisados...')
+
+    click.echo('=' * 80)
+    click.echo(' | '.join(f'{estado}: {n}' for estado, n in sorted(cuenta.items())) or 'Nada que optimizar')
+    if antes:
+        click.echo(f'✅ {antes / 1024 / 1024:.1f} MB → {despues / 1024 / 1024:.1f} MB '
+                   '(originales en instance/pdf_originales/)')
+    for error in errores:
+        click.echo(f'   ❌ {error}')
+    click.echo('=' * 80)
+    if errores:
+        raise SystemExit(1)
+
+
+@lab.group('respaldo')
+def respaldo():
+    """Respaldo incremental de los PDFs de resultados (RESPALDO_DESTINO)."""
+
+
+def _destino(destino):
+    destino = destino or current_app.config.get('RESPALDO_DESTINO')
+    if not destino:
+        click.echo('❌ Falta el destino: --destino o RESPALDO_DESTINO en .env')
+        raise SystemExit(1)
+    return destino
+
+
+@respaldo.command('crear')
+@click.option('--destino', help='Directorio del respaldo (por defecto RESPALDO_DESTINO).')
+@click.option('--lote', default=500, show_default=True, help='Resultados por lote del cursor.')
+def crear_respaldo(destino, lote):
+    """Agrega al respaldo los PDFs nuevos o modificados desde la última corrida."""
+    from app.respaldos import RespaldoOcupado, crear_respaldo, zstandard
+
+    destino = _destino(destino)
+    click.echo(f"💾 Respaldando PDFs en {destino} ({'zstd' if zstandard else 'gzip: instala zstandard'})...")
+    try:
+        r = crear_respaldo(destino, current_app.config['RESPALDO_SEGMENTO_MB'],
+                           current_app.config['RESPALDO_NIVEL_ZSTD'], lote)
+    except RespaldoOcupado as e:
+        click.echo(f'⏳ {e}')
+        raise SystemExit(1)
+
+    click.echo('=' * 80)
+    click.echo(f"Revisados: {r['revisados']} | sin cambios: {r['sin_cambios']} | {r['segundos']}s")
+    click.echo(f"✅ Versiones nuevas: {r['versiones']} | archivos guardados: {r['blobs_nuevos']} "
+               f"| deduplicados: {r['deduplicados']} | eliminados: {r['eliminados']}")
+    if r['blobs_nuevos']:
+        click.echo(f"📦 {r['bytes_originales'] / 1024 / 1024:.1f} MB → {r['bytes_comprimidos'] / 1024 / 1024:.1f} MB "
+                   f"en {', '.join(r['segmentos'])}")
+    if r['no_coinciden']:
+        click.echo(f"⚠ {r['no_coinciden']} PDFs no coinciden con su SHA-256 guardado: revisa con flask lab scrub")
+    for archivo in r['faltantes']:
+        click.echo(f'   ❌ No encontrado: {archivo}')
+    click.echo('=' * 80)
+    if r['faltantes']:
+        raise SystemExit(1)
+
+
+@respaldo.command('restaurar')
+@click.option('--destino', help='Directorio del respaldo (por defecto RESPALDO_DESTINO).')
+@click.option('--resultado', 'resultado_id', type=int, help='Id del resultado a restaurar.')
+@click.option('--desde', help='Resultados creados desde esta fecha (AAAA-MM-DD).')
+@click.option('--hasta', help='Resultados creados hasta esta fecha (AAAA-MM-DD, inclusive).')
+@click.option('--momento', help='Estado del respaldo en este momento (AAAA-MM-DDTHH:MM); por defecto el último.')
+@click.option('--salida', help='Carpeta donde escribir los PDFs (por defecto instance/restaurados/<fecha>).')
+@click.option('--en-uploads', is_flag=True, help='Escribir directamente en app/static/uploads.')
+def restaurar_respaldo(destino, resultado_id, desde, hasta, momento, salida, en_uploads):
+    """Restaura los PDFs de un resultado o de un rango de fechas, tal como estaban en --momento."""
+    from datetime import datetime
+    from app.respaldos import BASE_DIR, UPLOAD_DIR, parsear_fecha, restaurar, seleccionar
+
+    destino = _destino(destino)
+    if resultado_id is None and not (desde or hasta):
+        click.echo('❌ Indica --resultado o un rango con --desde/--hasta')
+        raise SystemExit(1)
+    if momento:
+        momento = datetime.fromisoformat(momento).isoformat(timespec='seconds')
+    registros = seleccionar(destino, momento, resultado_id, parsear_fecha(desde), parsear_fecha(hasta))
+    if not registros:
+        click.echo(f"⚠ Nada que restaurar{f' al {momento}' if momento else ''}")
+        raise SystemExit(1)
+
+    if en_uploads:
+        salida = UPLOAD_DIR
+    salida = salida or os.path.join(BASE_DIR, 'instance', 'restaurados', datetime.now().strftime('%Y%m%d_%H%M%S'))
+    click.echo(f"♻ Restaurando {len(registros)} PDFs{f' al {momento}' if momento else ''} en {salida}...")
+    r = restaurar(destino, registros, salida)
+
+    click.echo('=' * 80)
+    for registro in sorted(registros, key=lambda x: x['resultado_id'])[:20]:
+        click.echo(f"   {registro['resultado_id']}: {registro['numero_orden']} → {registro['archivo']} "
+                   f"(respaldado {registro['t']})")
+    click.echo(f"✅ Restaurados: {r['restaurados']} | ya estaban iguales: {r['iguales']}")
+    for error in r['errores']:
+        click.echo(f'   ❌ {error}')
+    click.echo('=' * 80)
+    if r['errores']:
+        raise SystemExit(1)
+
+
+@lab.group('catalogo')
+def catalogo():
+    """Catálogo de pruebas definido en app/data/catalogo.json."""
+
+
+@catalogo.command('sync')
+@click.option('--dry-run', is_flag=True, help='Solo mostrar las diferencias, sin tocar la base de datos.')
+@click.option('--conservar', is_flag=True, help='No eliminar las pruebas que no están en el archivo.')
+@click.option('--yes', '-y', is_flag=True, help='No pedir confirmación antes de eliminar.')
+def sincronizar_catalogo(dry_run, conservar, yes):
+    """Sincroniza la tabla de pruebas con el archivo del catálogo (idempotente)."""
+    from app.catalogo import ARCHIVO_CATALOGO, aplicar_diferencias, calcular_diferencias, cargar_catalogo
+
+    catalogo = cargar_catalogo()
+    d = calcular_diferencias(catalogo)
+
+    click.echo(f'📋 {os.path.relpath(ARCHIVO_CATALOGO)}: {len(catalogo)} pruebas')
+    click.echo('=' * 80)
+    for categoria, orden in d['categorias']:
+        click.echo(f'   # {categoria} (categoría, posición {orden + 1})')
+    for categoria, nombre in d['nuevas']:
+        click.echo(f'   + {nombre} ({categoria})')
+    for categoria, nombre in d['modificadas']:
+        click.echo(f'   ~ {nombre} ({categoria})')
+    for fila in d['sobrantes']:
+        click.echo(f'   {"=" if conservar else "-"} {fila.nombre} ({fila.categoria}) [id {fila.id}]')
+    click.echo('=' * 80)
+    click.echo(f"Nuevas: {len(d['nuevas'])} | Modificadas: {len(d['modificadas'])} | "
+               f"Sin cambios: {d['sin_cambios']} | Fuera del archivo: {len(d['sobrantes'])}"
+               f"{' (se conservan)' if conservar else ''}")
+
+    if d['duplicadas']:
+        click.echo(f"❌ {len(d['duplicadas'])} pruebas repetidas (misma categoría y nombre): "
+                   'ejecuta primero migrar_catalogo_unico.py')
+        raise SystemExit(1)
+    if dry_run:
+        click.echo('ℹ Dry run: no se modificó la base de datos.')
+        return
+    if not (d['categorias'] or d['nuevas'] or d['modificadas'] or (d['sobrantes'] and not conservar)):
+        click.echo('✅ El catálogo ya está sincronizado')
+        return
+    if d['sobrantes'] and not conservar and not yes:
+        click.confirm(f"¿Eliminar {len(d['sobrantes'])} pruebas que no están en el archivo?", abort=True)
+
+    r = aplicar_diferencias(catalogo, d, eliminar=not conservar)
+    click.echo(f"✅ {r['upsert']} pruebas creadas/actualizadas, {r['eliminadas']} eliminadas")
+
+
+def _mostrar_categorias(titulo):
+    from app.catalogo import resumen_categorias
+
+    filas = resumen_categorias()
+    click.echo(f'📂 {titulo}: {sum(n for _, n in filas)} pruebas')
+    for categoria, n in filas:
+        click.echo(f'   • {categoria or "Sin categoría"}: {n}')
+
+
+def _paso(descripcion, funcion, *args):
+    """Ejecuta un paso mostrando su duración"""
+    import time
+
+    click.echo(f'⚡ {descripcion}...')
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    click.echo(f'   ✓ {(time.perf_counter() - inicio) * 1000:.0f} ms')
+    return resultado
+
+
+@catalogo.command('resumen')
+def resumen_catalogo():
+    """Cantidad de pruebas por categoría."""
+    _mostrar_categorias('Catálogo actual')
+
+
+@catalogo.command('renumerar')
+@click.option('--yes', '-y', is_flag=True, help='No pedir confirmación.')
+def renumerar_catalogo(yes):
+    """Renumera los IDs de las pruebas de 1 a N, en el lugar."""
+    from app import db
+    from app.catalogo import renumerar_ids
+    from app.models import Prueba
+
+    total, primero, ultimo = db.session.execute(
+        db.select(db.func.count(), db.func.min(Prueba.id), db.func.max(Prueba.id))
+    ).one()
+    if not total:
+        click.echo('❌ No hay pruebas en la base de datos')
+        return
+    click.echo(f'📍 IDs actuales: {primero} → {ultimo} | nuevos: 1 → {total}')
+    if ultimo == total:
+        click.echo('✅ Los IDs ya son consecutivos')
+        return
+    if not yes:
+        click.confirm('¿Renumerar los IDs? (los enlaces guardados a /pruebas/<id> cambiarán)', abort=True)
+
+    movidas = _paso('Renumerando en una transacción', renumerar_ids)
+    click.echo(f'✅ {movidas} pruebas con ID nuevo (1 → {total})')
+
+
+@catalogo.command('limpiar')
+@click.option('--yes', '-y', is_flag=True, help='No pedir confirmación.')
+def limpiar_catalogo(yes):
+    """Elimina las pruebas y categorías que no están en app/data/catalogo.json."""
+    from app import db
+    from app.catalogo import categorias_del_catalogo, condicion_fuera_de_catalogo, limpiar_categorias
+    from app.models import Prueba
+
+    categorias = categorias_del_catalogo()
+    viejas = db.session.execute(
+        db.select(Prueba.nombre, Prueba.categoria).where(condicion_fuera_de_catalogo(categorias))
+        .order_by(Prueba.categoria, Prueba.nombre)
+    ).all()
+    if not viejas:
+        click.echo('✅ No hay pruebas viejas para eliminar. Todo está limpio.')
+        return
+    click.echo(f'🗑  Pruebas a eliminar ({len(viejas)}):')
+    for nombre, categoria in viejas:
+        click.echo(f'   • {nombre} (Categoría: {categoria or "Sin categoría"})')
+    if not yes:
+        click.confirm('¿Eliminar estas pruebas?', abort=True)
+
+    eliminadas, imagenes = _paso('Eliminando en una sola sentencia', limpiar_categorias, categorias)
+    click.echo(f'✅ {eliminadas} pruebas eliminadas, {imagenes} imágenes sin uso borradas')
+    _mostrar_categorias('Quedan')
+
+
+@catalogo.command('vaciar')
+@click.option('--yes', '-y', is_flag=True, help='No pedir confirmación.')
+def vaciar_catalogo(yes):
+    """Elimina TODAS las pruebas (irreversible)."""
+    from app.catalogo import vaciar
+
+    _mostrar_categorias('Se eliminarán')
+    if not yes:
+        click.confirm('⚠ ¿Eliminar TODAS las pruebas? No se puede deshacer', abort=True)
+
+    eliminadas, imagenes = _paso('Eliminando', vaciar)
+    click.echo(f'✅ {eliminadas} pruebas eliminadas, {imagenes} imágenes borradas')
+    click.echo("💡 Para volver a cargar el catálogo oficial: flask --app run lab catalogo sync")
+
+
+@catalogo.command('precios-cero')
+@click.option('--yes', '-y', is_flag=True, help='No pedir confirmación.')
+def precios_cero(yes):
+    """Deja en 0.00 el precio de todas las pruebas."""
+    from app import db
+    from app.catalogo import precios_a_cero
+    from app.models import Prueba
+
+    con_precio = db.session.scalar(db.select(db.func.count()).where(Prueba.precio > 0))
+    if not con_precio:
+        click.echo('✅ Todos los precios ya están en 0.00')
+        return
+    if not yes:
+        click.confirm(f'¿Poner en 0.00 el precio de {con_precio} pruebas?', abort=True)
+
+    actualizadas = _paso('Actualizando en una sola sentencia', precios_a_cero)
+    click.echo(f'✅ {actualizadas} precios en 0.00')
@@ -0,0 +1,143 @@
+"""
+Compresión de respuestas - Laboratorio Pérez
+- comprimir(): variantes gzip/brotli de un contenido, calculadas una sola vez
+- respuesta_precomprimida(): elige la variante según Accept-Encoding, con ETag
+  fuerte por representación y 304 si el cliente ya la tiene
+- init_app(): comprime al vuelo HTML, JSON, CSS y JS generados por las vistas
+  (brotli rápido o gzip). Las respuestas en streaming se comprimen por partes sin
+  acumularlas. Nunca toca archivos enviados con send_file (PDF, Word, estáticos:
+  esos usan sus hermanos .br/.gz precomprimidos) ni respuestas ya comprimidas.
+"""
+import gzip
+import hashlib
+import zlib
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+MINIMO_COMPRIMIR = 512  # Bytes: por debajo de esto la compresión no compensa
+
+# Niveles para comprimir en cada request (los precomprimidos usan el máximo)
+CALIDAD_BROTLI = 5
+NIVEL_GZIP = 6
+
+TIPOS_COMPRIMIBLES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/xml', 'application/xml',
+    'application/json', 'application/javascript', 'text/javascript', 'image/svg+xml',
+}
+
+
+def comprimir(contenido):
+    """
+    Returns:
+        dict: encoding -> bytes, en orden de preferencia ('br' primero)
+    """
+    if len(contenido) < MINIMO_COMPRIMIR:
+        return {}
+    variantes = {}
+    if brotli is not None:
+        variantes['br'] = brotli.compress(contenido, quality=11)
+    variantes['gzip'] = gzip.compress(contenido, compresslevel=9, mtime=0)
+    return variantes
+
+
+def etag_de(contenido):
+    return hashlib.sha256(contenido).hexdigest()[:20]
+
+
+def respuesta_precomprimida(contenido, variantes, etag, mimetype, cache_control):
+    """
+    Arma la respuesta con la mejor variante que acepte el cliente.
+    Cada encoding tiene su propio ETag fuerte (los bytes enviados son distintos).
+    """
+    aceptadas = request.accept_encodings
+    encoding = next((e for e in variantes if aceptadas[e]), None)
+    cuerpo = variantes[encoding] if encoding else contenido
+    etag_representacion = f'{etag}-{encoding}' if encoding else etag
+
+    if request.if_none_match.contains(etag_representacion):
+        respuesta = Response(status=304)
+    else:
+        respuesta = Response(cuerpo, mimetype=mimetype)
+        if encoding:
+            respuesta.headers['Content-Encoding'] = encoding
+    respuesta.set_etag(etag_representacion)
+    respuesta.headers['Cache-Control'] = cache_control
+    respuesta.vary.add('Accept-Encoding')
+    return respuesta
+
+
+def _encoding_aceptado():
+    aceptadas = request.accept_encodings
+    if brotli is not None and aceptadas['br']:
+        return 'br'
+    if aceptadas['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compresor(encoding):
+    """(comprimir parte, vaciar, terminar) para comprimir un flujo por partes"""
+    if encoding == 'br':
+        c = brotli.Compressor(quality=CALIDAD_BROTLI)
+        return c.process, c.flush, c.finish
+    c = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # 16+: formato gzip
+    return c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+
+
+def _comprimir_flujo(partes, encoding):
+    """Cada parte sale comprimida en cuanto llega (flush), sin esperar al final"""
+    comprimir_parte, vaciar, terminar = _compresor(encoding)
+    for parte in partes:
+        if isinstance(parte, str):
+            parte = parte.encode('utf-8')
+        if parte:
+            yield comprimir_parte(parte) + vaciar()
+    yield terminar()
+
+
+def _comprimible(respuesta):
+    return (
+        respuesta.mimetype in TIPOS_COMPRIMIBLES
+        and not respuesta.direct_passthrough            # send_file / send_from_directory
+        and 'Content-Encoding' not in respuesta.headers
+        and respuesta.status_code not in (204, 206, 304)
+        and respuesta.status_code >= 200
+        and 'no-transform' not in respuesta.headers.get('Cache-Control', '')
+    )
+
+
+def comprimir_respuesta(respuesta):
+    """after_request: comprime la respuesta si el tipo, el tamaño y el cliente lo permiten"""
+    if not _comprimible(respuesta):
+        return respuesta
+    respuesta.vary.add('Accept-Encoding')
+    encoding = _encoding_aceptado()
+    if encoding is None:
+        return respuesta
+
+    if respuesta.is_streamed:
+        original = respuesta.response
+        respuesta.response = _comprimir_flujo(original, encoding)
+        if hasattr(original, 'close'):
+            respuesta.call_on_close(original.close)
+        respuesta.headers.pop('Content-Length', None)
+    else:
+        cuerpo = respuesta.get_data()
+        if len(cuerpo) < MINIMO_COMPRIMIR:
+            return respuesta
+        comprimir_parte, _, terminar = _compresor(encoding)
+        respuesta.set_data(comprimir_parte(cuerpo) + terminar())
+
+    respuesta.headers['Content-Encoding'] = encoding
+    etag, debil = respuesta.get_etag()
+    if etag:
+        respuesta.set_etag(f'{etag}-{encoding}', weak=debil)
+    return respuesta
+
+
+def init_app(app):
+    app.after_request(comprimir_respuesta)
@@ -0,0 +1,70 @@
+"""
+Enlaces de descarga firmados - Laboratorio Pérez
+- Después de verificar CI + código, la página del resultado lleva un token firmado
+  (HMAC con SECRET_KEY) con el id del resultado, el nombre del PDF guardado, su SHA-256
+  y el número de orden; vence a los DESCARGA_TOKEN_SEGUNDOS
+- La descarga solo verifica la firma y envía el archivo: no consulta la base ni
+  acepta ids secuenciales que se puedan adivinar
+- Cada subida, reemplazo u optimización (app/pdfs.py) guarda el PDF con un nombre nuevo:
+  un archivo nunca cambia de contenido, así que el SHA-256 del token sirve de ETag
+"""
+import hashlib
+import os
+from flask import current_app
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+SALT = 'descarga-resultado'
+
+
+class EnlaceInvalido(Exception):
+    """Token alterado, de otra SECRET_KEY o vencido (vencido=True)"""
+
+    def __init__(self, mensaje, vencido=False):
+        super().__init__(mensaje)
+        self.vencido = vencido
+
+
+def sha256_archivo(ruta):
+    with open(ruta, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _serializador():
+    return URLSafeTimedSerializer(current_app.secret_key, salt=SALT)
+
+
+def firmar(resultado, ruta=None):
+    """
+    Token de descarga para un resultado con PDF. Si el resultado todavía no tiene
+    archivo_sha256 (anterior a migrar_archivo_sha256.py), se calcula desde `ruta`.
+    """
+    sha256 = resultado.archivo_sha256
+    if not sha256 and ruta and os.path.exists(ruta):
+        sha256 = sha256_archivo(ruta)
+    return _serializador().dumps({
+        'r': resultado.id,
+        'a': resultado.archivo_pdf,
+        'h': sha256,
+        'o': resultado.numero_orden,
+    })
+
+
+def verificar(token):
+    """
+    Datos del token si la firma es válida y no venció.
+
+    Returns:
+        dict: {'resultado_id', 'archivo', 'sha256', 'numero_orden'}
+    """
+    try:
+        datos = _serializador().loads(token, max_age=current_app.config['DESCARGA_TOKEN_SEGUNDOS'])
+    except SignatureExpired:
+        raise EnlaceInvalido('Enlace vencido', vencido=True)
+    except BadSignature:
+        raise EnlaceInvalido('Firma inválida')
+
+    archivo = datos.get('a') or ''
+    if os.path.basename(archivo) != archivo or not archivo.lower().endswith('.pdf'):
+        raise EnlaceInvalido('Archivo inválido')
+    return {'resultado_id': datos['r'], 'archivo': archivo, 'sha256': datos.get('h'),
+            'numero_orden': datos.get('o') or datos['r']}
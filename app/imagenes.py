@@ -0,0 +1,430 @@
+"""
+Imágenes del catálogo de pruebas - Laboratorio Pérez
+- Guarda el original que sube el admin en uploads/pruebas con el SHA-256 de su contenido
+  como nombre: subir dos veces la misma imagen reutiliza el mismo archivo
+- Genera derivados redimensionados (WebP, y AVIF si Pillow lo soporta) en segundo plano
+- Calcula un placeholder borroso diminuto (LQIP) que se guarda en Prueba.imagen_lqip
+- Helpers de Jinja para emitir srcset en el catálogo
+- deduplicar(): fusiona archivos repetidos (SHA-256 y hash perceptual) y corrige la BD
+"""
+import base64
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from flask import url_for
+from werkzeug.utils import secure_filename
+
+try:
+    from PIL import Image, ImageFilter, ImageOps, features
+except ImportError:  # Sin Pillow se guarda solo el original
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PRUEBAS_UPLOAD_DIR = os.path.join(BASE_DIR, 'app', 'static', 'uploads', 'pruebas')
+DERIVADOS_DIR = os.path.join(PRUEBAS_UPLOAD_DIR, 'derivados')
+
+ANCHOS = (320, 640, 960)           # Tarjetas de 1/4 de pantalla hasta móviles con pantalla retina
+CALIDAD = {'webp': 78, 'avif': 55}
+LQIP_ANCHO = 16
+REPORTE_SIMILARES = 6              # Distancia Hamming (de 64 bits) para listar posibles duplicados
+SIZES_CATALOGO = '(max-width: 767px) 100vw, (max-width: 991px) 50vw, 25vw'
+
+_executor = None
+_executor_lock = threading.Lock()
+_derivados_cache = {}
+
+
+def _pool():
+    """Pool creado bajo demanda (después del fork de gunicorn, no antes)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='imagenes')
+        return _executor
+
+
+def formatos_disponibles():
+    """Formatos modernos que este Pillow puede codificar, del más liviano al más compatible"""
+    if Image is None:
+        return []
+    return [f for f in ('avif', 'webp') if features.check(f)]
+
+
+def nombre_derivado(imagen, ancho, formato):
+    return f'{os.path.splitext(imagen)[0]}_{ancho}.{formato}'
+
+
+def _abrir(ruta):
+    imagen = ImageOps.exif_transpose(Image.open(ruta))
+    return imagen.convert('RGBA' if imagen.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+
+def generar_derivados(imagen):
+    """
+    Genera las versiones redimensionadas de `imagen` (nombre dentro de uploads/pruebas).
+    Nunca amplía: los anchos mayores al original se omiten salvo el más chico.
+
+    Returns:
+        int: cantidad de archivos generados
+    """
+    if Image is None:
+        return 0
+    os.makedirs(DERIVADOS_DIR, exist_ok=True)
+    original = _abrir(os.path.join(PRUEBAS_UPLOAD_DIR, imagen))
+    temporales = []
+    for ancho in anchos_esperados(original.width):
+        alto = round(original.height * min(ancho, original.width) / original.width)
+        redimensionada = original.resize((min(ancho, original.width), alto), Image.LANCZOS)
+        for formato in formatos_disponibles():
+            destino = os.path.join(DERIVADOS_DIR, nombre_derivado(imagen, ancho, formato))
+            temporal = f'{destino}.tmp{os.getpid()}_{threading.get_ident()}'
+            redimensionada.save(temporal, format=formato.upper(), quality=CALIDAD[formato])
+            temporales.append((temporal, destino))
+
+    # Publicar todos juntos al final para que ningún worker vea un conjunto a medias
+    for temporal, destino in temporales:
+        os.replace(temporal, destino)
+    _derivados_cache.pop(imagen, None)
+    return len(temporales)
+
+
+def _generar_en_segundo_plano(imagen):
+    from app.catalogo import invalidar_snapshot
+
+    try:
+        inicio = time.perf_counter()
+        generados = generar_derivados(imagen)
+        # El snapshot armado al guardar la prueba todavía no tenía el srcset de esta imagen
+        invalidar_snapshot()
+        print(f"🖼 Derivados de {imagen}: {generados} archivos en {time.perf_counter() - inicio:.2f}s")
+    except Exception as e:
+        print(f"⚠ Error generando derivados de {imagen}: {e}")
+
+
+def generar_lqip(imagen):
+    """Placeholder de ~16px, borroso, como data URI (unos cientos de bytes)"""
+    if Image is None:
+        return None
+    original = _abrir(os.path.join(PRUEBAS_UPLOAD_DIR, imagen))
+    alto = max(1, round(original.height * LQIP_ANCHO / original.width))
+    miniatura = original.resize((LQIP_ANCHO, alto), Image.BILINEAR).filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    if 'webp' in formatos_disponibles():
+        miniatura.save(buffer, format='WEBP', quality=30)
+        mimetype = 'image/webp'
+    else:
+        miniatura.convert('RGB').save(buffer, format='JPEG', quality=40)
+        mimetype = 'image/jpeg'
+    return f'data:{mimetype};base64,{base64.b64encode(buffer.getvalue()).decode("ascii")}'
+
+
+def nombre_por_contenido(contenido, nombre_original):
+    """'<sha256>.<ext>' con la extensión del archivo subido en minúsculas"""
+    extension = os.path.splitext(secure_filename(nombre_original))[1].lower()
+    return hashlib.sha256(contenido).hexdigest() + extension
+
+
+def guardar_imagen_prueba(archivo):
+    """
+    Guarda la imagen subida, calcula su LQIP y encola los derivados.
+    Si ya existe un archivo con el mismo contenido se reutiliza sin volver a escribirlo.
+
+    Returns:
+        tuple: (nombre del archivo guardado, lqip o None)
+    """
+    os.makedirs(PRUEBAS_UPLOAD_DIR, exist_ok=True)
+    contenido = archivo.read()
+    imagen_filename = nombre_por_contenido(contenido, archivo.filename)
+    ruta = os.path.join(PRUEBAS_UPLOAD_DIR, imagen_filename)
+    existia = os.path.exists(ruta)
+    if not existia:
+        temporal = f'{ruta}.tmp{os.getpid()}_{threading.get_ident()}'
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+
+    lqip = None
+    try:
+        lqip = generar_lqip(imagen_filename)
+        if not (existia and _derivados_existentes(imagen_filename)):
+            _pool().submit(_generar_en_segundo_plano, imagen_filename)
+    except Exception as e:
+        # Formato que Pillow no entiende: se sirve el original como antes
+        print(f"⚠ No se pudo procesar la imagen {imagen_filename}: {e}")
+    return imagen_filename, lqip
+
+
+def _borrar_archivos(imagen):
+    rutas = [os.path.join(PRUEBAS_UPLOAD_DIR, imagen)]
+    rutas += [os.path.join(DERIVADOS_DIR, nombre_derivado(imagen, ancho, formato))
+              for ancho in ANCHOS for formato in ('avif', 'webp')]
+    for ruta in rutas:
+        if os.path.exists(ruta):
+            os.remove(ruta)
+    _derivados_cache.pop(imagen, None)
+
+
+def eliminar_imagen_prueba(imagen, prueba_id=None):
+    """
+    Elimina el original y todos sus derivados, salvo que otra prueba
+    (distinta de `prueba_id`) siga usando el mismo archivo.
+
+    Returns:
+        bool: True si se borraron los archivos
+    """
+    from app.models import Prueba
+
+    otras = Prueba.query.filter(Prueba.imagen == imagen)
+    if prueba_id is not None:
+        otras = otras.filter(Prueba.id != prueba_id)
+    if otras.first() is not None:
+        return False
+    _borrar_archivos(imagen)
+    return True
+
+
+def eliminar_imagenes_huerfanas(imagenes):
+    """
+    Borra los archivos (y derivados) de las imágenes que ya no usa ninguna prueba,
+    con una sola consulta. Se llama después de un DELETE masivo.
+
+    Returns:
+        int: imágenes borradas
+    """
+    from sqlalchemy import select
+    from app import db
+    from app.models import Prueba
+
+    imagenes = {imagen for imagen in imagenes if imagen}
+    if not imagenes:
+        return 0
+    en_uso = set(db.session.execute(
+        select(Prueba.imagen).where(Prueba.imagen.in_(imagenes)).distinct()
+    ).scalars())
+    for imagen in imagenes - en_uso:
+        _borrar_archivos(imagen)
+    return len(imagenes - en_uso)
+
+
+def anchos_esperados(ancho_original):
+    """Los mismos anchos que genera generar_derivados(): nunca amplía, salvo el más chico"""
+    return [ANCHOS[0]] + [a for a in ANCHOS[1:] if a <= ancho_original]
+
+
+def _derivados_existentes(imagen):
+    """
+    {formato: [anchos]} de los derivados en disco. Solo se cachean conjuntos completos
+    (todos los anchos esperados en todos los formatos disponibles), así una imagen cuyos
+    derivados aún se están generando, en este worker o en otro, se vuelve a revisar.
+    Sin Pillow (o sin WebP/AVIF) este proceso no genera derivados: lo que haya se cachea.
+    """
+    existentes = _derivados_cache.get(imagen)
+    if existentes is not None:
+        return existentes
+    existentes = {}
+    for formato in ('avif', 'webp'):
+        anchos = [a for a in ANCHOS if os.path.exists(os.path.join(DERIVADOS_DIR, nombre_derivado(imagen, a, formato)))]
+        if anchos:
+            existentes[formato] = anchos
+    if not formatos_disponibles():
+        _derivados_cache[imagen] = existentes
+    elif existentes:
+        try:
+            with Image.open(os.path.join(PRUEBAS_UPLOAD_DIR, imagen)) as original:  # Solo lee el encabezado
+                # Orientación EXIF 5-8: _abrir() la gira 90°, el ancho real es el alto
+                girada = original.getexif().get(0x0112) in (5, 6, 7, 8)
+                esperados = anchos_esperados(original.height if girada else original.width)
+        except OSError:
+            return existentes
+        if all(existentes.get(formato) == esperados for formato in formatos_disponibles()):
+            _derivados_cache[imagen] = existentes
+    return existentes
+
+
+def imagen_srcset(imagen, formato):
+    """Helper de Jinja: '/static/.../x_320.webp 320w, ...' o '' si no hay derivados"""
+    if not imagen:
+        return ''
+    anchos = _derivados_existentes(imagen).get(formato, [])
+    return ', '.join(
+        f"{url_for('static', filename='uploads/pruebas/derivados/' + nombre_derivado(imagen, a, formato))} {a}w"
+        for a in anchos
+    )
+
+
+def imagen_miniatura(imagen):
+    """Helper de Jinja: URL del derivado más chico (tablas del admin), o del original"""
+    existentes = _derivados_existentes(imagen) if imagen else {}
+    for formato in ('webp', 'avif'):
+        if formato in existentes:
+            return url_for('static', filename='uploads/pruebas/derivados/' + nombre_derivado(imagen, existentes[formato][0], formato))
+    return url_for('static', filename='uploads/pruebas/' + imagen)
+
+
+def dhash(imagen):
+    """Hash perceptual de 64 bits: compara el brillo de cada píxel con su vecino derecho en 9x8"""
+    gris = _abrir(os.path.join(PRUEBAS_UPLOAD_DIR, imagen)).convert('L').resize((9, 8), Image.LANCZOS)
+    pixeles = gris.tobytes()
+    bits = 0
+    for fila in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixeles[fila * 9 + col] > pixeles[fila * 9 + col + 1])
+    return bits
+
+
+def _huella(imagen):
+    """(nombre, sha256, dhash o None, área en píxeles, bytes) de un original"""
+    ruta = os.path.join(PRUEBAS_UPLOAD_DIR, imagen)
+    with open(ruta, 'rb') as f:
+        digest = hashlib.file_digest(f, 'sha256').hexdigest()
+    perceptual, area = None, 0
+    if Image is not None:
+        try:
+            with Image.open(ruta) as img:
+                area = img.width * img.height
+            perceptual = dhash(imagen)
+        except Exception:
+            pass  # No es una imagen que Pillow entienda: solo cuenta el SHA-256
+    return imagen, digest, perceptual, area, os.path.getsize(ruta)
+
+
+def _originales():
+    if not os.path.isdir(PRUEBAS_UPLOAD_DIR):
+        return []
+    return sorted(a for a in os.listdir(PRUEBAS_UPLOAD_DIR)
+                  if os.path.isfile(os.path.join(PRUEBAS_UPLOAD_DIR, a)) and '.tmp' not in a)
+
+
+def _agrupar_similares(huellas, umbral):
+    """Union-find sobre los pares con distancia Hamming <= umbral (0 = no fusionar similares)"""
+    padre = {h[0]: h[0] for h in huellas}
+
+    def raiz(x):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    pares = []
+    con_hash = [h for h in huellas if h[2] is not None]
+    for i, a in enumerate(con_hash):
+        for b in con_hash[i + 1:]:
+            distancia = (a[2] ^ b[2]).bit_count()
+            if distancia <= max(umbral, REPORTE_SIMILARES):
+                pares.append((a[0], b[0], distancia))
+            if umbral and distancia <= umbral:
+                padre[raiz(a[0])] = raiz(b[0])
+
+    grupos = {}
+    for h in huellas:
+        grupos.setdefault(raiz(h[0]), []).append(h)
+    return list(grupos.values()), pares
+
+
+def _sin_errores(funcion):
+    """Para pool.map: un archivo que Pillow no entiende no debe frenar al resto"""
+    def envuelta(imagen):
+        try:
+            return funcion(imagen)
+        except Exception as e:
+            print(f"⚠ {imagen}: {e}")
+            return None
+    return envuelta
+
+
+def deduplicar(umbral_similares=0, aplicar=True):
+    """
+    Fusiona los originales repetidos de uploads/pruebas.
+
+    - Idénticos (mismo SHA-256): se dejan en un solo archivo '<sha256>.<ext>'.
+    - Con umbral_similares > 0 también se fusionan imágenes casi iguales (misma foto
+      recomprimida o redimensionada) quedándose con la de mayor resolución.
+    Primero se escriben los archivos nuevos y sus derivados, después se actualizan las
+    referencias en la BD con un solo UPDATE y recién al final se borran los archivos viejos.
+
+    Returns:
+        dict: reporte con los archivos analizados, fusiones, bytes liberados y pares similares
+    """
+    from sqlalchemy import case, update
+    from app import db
+    from app.models import Prueba
+
+    archivos = _originales()
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+        huellas = list(pool.map(_huella, archivos))
+
+    # Primero colapsar idénticos: un representante por SHA-256
+    por_digest = {}
+    for h in huellas:
+        por_digest.setdefault(h[1], []).append(h)
+    unicos = [grupo[0] for grupo in por_digest.values()]
+
+    grupos, pares = _agrupar_similares(unicos, umbral_similares)
+    destino_de = {}
+    for grupo in grupos:
+        elegido = max(grupo, key=lambda h: (h[3], h[4], h[0]))
+        canonico = elegido[1] + os.path.splitext(elegido[0])[1].lower()
+        for representante in grupo:
+            for h in por_digest[representante[1]]:
+                destino_de[h[0]] = (canonico, elegido[0])
+
+    reemplazos = {viejo: nuevo for viejo, (nuevo, _) in destino_de.items() if viejo != nuevo}
+    tamanos = {h[0]: h[4] for h in huellas}
+    nuevos = {nuevo: fuente for nuevo, fuente in destino_de.values() if nuevo not in tamanos}
+    reporte = {
+        'archivos': len(huellas),
+        'bytes': sum(tamanos.values()),
+        'unicos': len(por_digest),
+        'reemplazos': reemplazos,
+        'bytes_liberados': sum(tamanos[v] for v in reemplazos) - sum(tamanos[f] for f in nuevos.values()),
+        'similares': [p for p in pares if destino_de[p[0]][0] != destino_de[p[1]][0]],
+        'filas_actualizadas': 0,
+        'sin_referencia': [],
+    }
+    referenciadas = {fila[0] for fila in db.session.query(Prueba.imagen).filter(Prueba.imagen.isnot(None)).distinct()}
+    # Archivos que quedarían sin ninguna prueba que los use (solo se informan)
+    reporte['sin_referencia'] = sorted({n for n, _ in destino_de.values()}
+                                       - {reemplazos.get(r, r) for r in referenciadas})
+    if not aplicar or not reemplazos:
+        return reporte
+
+    # 1. Archivos canónicos y sus derivados (los viejos siguen en su lugar)
+    for nuevo, fuente in nuevos.items():
+        ruta = os.path.join(PRUEBAS_UPLOAD_DIR, nuevo)
+        temporal = f'{ruta}.tmp{os.getpid()}_{threading.get_ident()}'
+        with open(os.path.join(PRUEBAS_UPLOAD_DIR, fuente), 'rb') as origen, open(temporal, 'wb') as copia:
+            copia.write(origen.read())
+        os.replace(temporal, ruta)
+    destinos = sorted(set(reemplazos.values()))
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+        pendientes = [d for d in destinos if not _derivados_existentes(d)]
+        list(pool.map(_sin_errores(generar_derivados), pendientes))
+        lqips = dict(zip(destinos, pool.map(_sin_errores(generar_lqip), destinos)))
+
+    # 2. Todas las referencias en un solo UPDATE ... CASE
+    viejos = list(reemplazos)
+    valores = {'imagen': case(reemplazos, value=Prueba.imagen)}
+    if any(lqips.values()):
+        valores['imagen_lqip'] = case({v: lqips[n] for v, n in reemplazos.items()}, value=Prueba.imagen)
+    resultado = db.session.execute(
+        update(Prueba).where(Prueba.imagen.in_(viejos)).values(**valores),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    reporte['filas_actualizadas'] = resultado.rowcount
+
+    # 3. Recién ahora borrar los originales y derivados que ya nadie referencia
+    for viejo in viejos:
+        _borrar_archivos(viejo)
+    return reporte
+
+
+def init_app(app):
+    app.jinja_env.globals.update(
+        imagen_srcset=imagen_srcset,
+        imagen_miniatura=imagen_miniatura,
+        imagen_sizes_catalogo=SIZES_CATALOGO,
+    )
@@ -0,0 +1,242 @@
+"""
+Integridad de los PDFs de resultados (scrub) - Laboratorio Pérez
+- Recorre Resultado.archivo_pdf por lotes con un cursor del lado del servidor
+  (yield_per): la memoria no crece con la cantidad de resultados
+- Calcula el SHA-256 de la copia principal (uploads/) y del backup (uploads/backups/)
+  en un pool de hilos, con la lectura total limitada a N MB/s para no competir con
+  las descargas de los pacientes
+- Compara con resultados.archivo_sha256 y repara la copia dañada o faltante desde la
+  sana. Sin hash guardado, la copia sana es la que coincide con la otra o la única
+  que parece un PDF completo (%PDF-...%%EOF); ese hash queda guardado
+- Corridas incrementales: los archivos con el mismo tamaño y mtime que en el último
+  scrub (instance/integridad/estado.json) no se vuelven a leer
+- Reporte JSON por corrida en instance/integridad/
+Uso: flask --app run lab scrub [--completo] [--sin-reparar]
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import select, update
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, 'app', 'static', 'uploads')
+BACKUP_DIR = os.path.join(UPLOAD_DIR, 'backups')
+DATOS_DIR = os.path.join(BASE_DIR, 'instance', 'integridad')   # estado.json + reportes
+
+BLOQUE = 1024 * 1024   # Bytes por lectura (y por consumo del límite de tasa)
+
+# Estados de un archivo en el reporte
+OK, SIN_CAMBIOS, REPARADO, REPARABLE, DANADO, FALTANTE = (
+    'ok', 'sin_cambios', 'reparado', 'reparable', 'dañado', 'faltante')
+
+
+class LimiteLectura:
+    """Cubeta de tokens compartida por los hilos: como mucho `bytes_por_segundo` leídos"""
+
+    def __init__(self, bytes_por_segundo):
+        self.tasa = bytes_por_segundo
+        self.disponible = float(bytes_por_segundo)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consumir(self, n):
+        if not self.tasa:
+            return
+        with self.lock:
+            ahora = time.monotonic()
+            self.disponible = min(self.tasa, self.disponible + (ahora - self.ultimo) * self.tasa) - n
+            self.ultimo = ahora
+            espera = -self.disponible / self.tasa if self.disponible < 0 else 0
+        if espera:
+            time.sleep(espera)
+
+
+def _escribir_json(ruta, datos):
+    temporal = f'{ruta}.tmp{os.getpid()}'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def _firma_stat(ruta):
+    """(tamaño, mtime_ns) o None si no existe"""
+    try:
+        st = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def sha256_limitado(ruta, limite):
+    digest = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        while bloque := f.read(BLOQUE):
+            limite.consumir(len(bloque))
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def parece_pdf(ruta):
+    """Encabezado %PDF- y marca %%EOF al final: el archivo no quedó truncado"""
+    try:
+        with open(ruta, 'rb') as f:
+            if f.read(5) != b'%PDF-':
+                return False
+            f.seek(max(0, os.path.getsize(ruta) - 1024))
+            return b'%%EOF' in f.read()
+    except OSError:
+        return False
+
+
+def _copiar_sobre(origen, destino):
+    """Reemplaza `destino` por una copia de `origen` sin dejar nunca un archivo a medias"""
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = f'{destino}.scrub{os.getpid()}'
+    shutil.copy2(origen, temporal)
+    os.replace(temporal, destino)
+
+
+def revisar_archivo(fila, previo, limite, reparar=True, completo=False):
+    """
+    Revisa (y si hace falta repara) las dos copias de un PDF.
+
+    Args:
+        fila: (resultado_id, archivo_pdf, archivo_sha256 guardado o None)
+        previo: entrada de estado.json de la corrida anterior o None
+
+    Returns:
+        dict: resultado_id, archivo, estado, detalle, sha256, nuevo_sha256 (para guardar
+        en la base), bytes leídos y 'estado_archivo' para la próxima corrida incremental
+    """
+    resultado_id, archivo, guardado = fila
+    rutas = {'principal': os.path.join(UPLOAD_DIR, archivo), 'backup': os.path.join(BACKUP_DIR, archivo)}
+    stats = {copia: _firma_stat(ruta) for copia, ruta in rutas.items()}
+    informe = {'resultado_id': resultado_id, 'archivo': archivo, 'detalle': [], 'sha256': guardado,
+               'nuevo_sha256': None, 'leidos': 0, 'estado_archivo': None}
+
+    if (not completo and previo and guardado and previo.get('sha256') == guardado
+            and previo.get('principal') == stats['principal'] and previo.get('backup') == stats['backup']):
+        informe['estado'] = SIN_CAMBIOS
+        informe['estado_archivo'] = previo
+        return informe
+
+    hashes = {}
+    for copia, ruta in rutas.items():
+        if stats[copia] is not None:
+            try:
+                hashes[copia] = sha256_limitado(ruta, limite)
+                informe['leidos'] += stats[copia][0]
+            except OSError as e:
+                informe['detalle'].append(f'{copia} ilegible: {e}')
+
+    esperado = guardado
+    if esperado is None:
+        if hashes.get('principal') and hashes.get('principal') == hashes.get('backup'):
+            esperado = hashes['principal']
+        else:
+            # Sin hash guardado y sin acuerdo entre copias: la única que parece un PDF completo
+            sanas = [c for c in hashes if parece_pdf(rutas[c])]
+            if len(sanas) == 1:
+                esperado = hashes[sanas[0]]
+                informe['detalle'].append(f'sin hash guardado: se toma {sanas[0]} (PDF completo)')
+        informe['nuevo_sha256'] = esperado
+        informe['sha256'] = esperado
+
+    if esperado is None:
+        informe['estado'] = FALTANTE if not hashes else DANADO
+        informe['detalle'].append('ninguna copia verificable' if hashes else 'no existe ninguna copia')
+        return informe
+
+    sana = next((c for c in ('principal', 'backup') if hashes.get(c) == esperado), None)
+    malas = [c for c in ('principal', 'backup') if hashes.get(c) != esperado]
+    for copia in malas:
+        informe['detalle'].append(f'{copia} {"faltante" if stats[copia] is None else "no coincide con el hash"}')
+
+    if sana is None:
+        informe['estado'] = FALTANTE if not hashes else DANADO
+        return informe
+    if malas and not reparar:
+        informe['estado'] = REPARABLE
+        return informe
+    for copia in malas:
+        _copiar_sobre(rutas[sana], rutas[copia])
+        informe['detalle'].append(f'{copia} restaurado desde {sana}')
+
+    informe['estado'] = REPARADO if malas else OK
+    informe['estado_archivo'] = {'sha256': esperado, **{c: _firma_stat(r) for c, r in rutas.items()}}
+    return informe
+
+
+def scrub(hilos=4, mb_por_segundo=20, lote=500, reparar=True, completo=False, progreso=None):
+    """
+    Recorre todos los resultados con PDF. Devuelve (resumen, ruta del reporte).
+    `progreso(revisados)` se llama después de cada lote.
+    """
+    from app import db
+    from app.models import Resultado
+
+    os.makedirs(DATOS_DIR, exist_ok=True)
+    ruta_estado = os.path.join(DATOS_DIR, 'estado.json')
+    try:
+        with open(ruta_estado, encoding='utf-8') as f:
+            estado_previo = json.load(f)
+    except (OSError, ValueError):
+        estado_previo = {}
+
+    limite = LimiteLectura(int(mb_por_segundo * 1024 * 1024))
+    estado_nuevo, problemas = {}, []
+    resumen = {estado: 0 for estado in (OK, SIN_CAMBIOS, REPARADO, REPARABLE, DANADO, FALTANTE)}
+    resumen.update(revisados=0, bytes_leidos=0, hashes_guardados=0)
+    inicio = time.perf_counter()
+
+    consulta = (select(Resultado.id, Resultado.archivo_pdf, Resultado.archivo_sha256)
+                .where(Resultado.archivo_pdf.isnot(None), Resultado.archivo_pdf != '')
+                .order_by(Resultado.id)
+                .execution_options(yield_per=lote))   # Cursor del lado del servidor en PostgreSQL
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        for filas in db.session.execute(consulta).partitions():
+            informes = list(pool.map(
+                lambda fila: revisar_archivo(tuple(fila), estado_previo.get(fila[1]), limite, reparar, completo),
+                filas))
+            nuevos = [i for i in informes if i['nuevo_sha256']]
+            if nuevos and reparar:
+                # Misma conexión que el cursor abierto: se confirma todo al final. Solo si el
+                # resultado sigue con el archivo revisado y sin hash: si mientras tanto se
+                # reemplazó u optimizó el PDF, el hash calculado ya no le corresponde
+                for informe in nuevos:
+                    guardado = db.session.execute(
+                        update(Resultado)
+                        .where(Resultado.id == informe['resultado_id'],
+                               Resultado.archivo_pdf == informe['archivo'],
+                               Resultado.archivo_sha256.is_(None))
+                        .values(archivo_sha256=informe['nuevo_sha256'])
+                        .execution_options(synchronize_session=False))
+                    resumen['hashes_guardados'] += guardado.rowcount
+            for informe in informes:
+                resumen[informe['estado']] += 1
+                resumen['bytes_leidos'] += informe['leidos']
+                if informe['estado_archivo']:
+                    estado_nuevo[informe['archivo']] = informe['estado_archivo']
+                if informe['estado'] not in (OK, SIN_CAMBIOS):
+                    problemas.append({k: informe[k] for k in ('resultado_id', 'archivo', 'estado', 'detalle')})
+            resumen['revisados'] += len(informes)
+            if progreso:
+                progreso(resumen['revisados'])
+    db.session.commit()
+
+    _escribir_json(ruta_estado, estado_nuevo)
+    resumen['segundos'] = round(time.perf_counter() - inicio, 1)
+    ruta_reporte = os.path.join(DATOS_DIR, f"reporte_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    _escribir_json(ruta_reporte, {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'opciones': {'hilos': hilos, 'mb_por_segundo': mb_por_segundo, 'lote': lote,
+                     'reparar': reparar, 'completo': completo},
+        'resumen': resumen,
+        'problemas': problemas,
+    })
+    return resumen, ruta_reporte
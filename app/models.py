@@ -1,6 +1,6 @@
 ﻿from app import db, login_manager
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils import hashear_password, verificar_password, necesita_rehash
 from datetime import datetime
 
 @login_manager.user_loader
@@ -11,15 +11,18 @@ class Usuario(UserMixin, db.Model):
     __tablename__ = 'usuarios'
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)  # scrypt/argon2 superan los 128 caracteres
     is_admin = db.Column(db.Boolean, default=False)
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hashear_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verificar_password(self.password_hash, password)
+
+    def necesita_rehash(self):
+        return necesita_rehash(self.password_hash)
 
 class Paciente(db.Model):
     __tablename__ = 'pacientes'
@@ -40,15 +43,33 @@ class Resultado(db.Model):
     paciente_ci = db.Column(db.String(20), nullable=False)
     fecha_muestra = db.Column(db.Date)
     archivo_pdf = db.Column(db.String(200))
+    archivo_sha256 = db.Column(db.String(64))  # Hash del PDF: va firmado en el enlace de descarga y es su ETag
     codigo_acceso = db.Column(db.String(20), unique=True)  # Código de acceso debe ser único
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
 
+class Categoria(db.Model):
+    __tablename__ = 'categorias'
+    id = db.Column(db.Integer, primary_key=True)
+    nombre = db.Column(db.String(100), unique=True, nullable=False)
+    orden = db.Column(db.Integer, nullable=False, default=0, index=True)  # Orden de app/data/catalogo.json
+    total_pruebas = db.Column(db.Integer, nullable=False, default=0)  # Lo mantiene app.catalogo.recontar_categorias()
+
 class Prueba(db.Model):
     __tablename__ = 'pruebas'
+    __table_args__ = (
+        # Clave natural del catálogo: 'flask lab catalogo sync' hace upsert sobre ella
+        db.Index('uq_pruebas_categoria_nombre', 'categoria', 'nombre', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(200), nullable=False)
+    categoria_id = db.Column(db.Integer, db.ForeignKey('categorias.id'), index=True)
+    # Copia del nombre de la categoría (como paciente_nombre en Resultado): clave natural
+    # del catálogo y parte de la columna de búsqueda; siempre se asigna junto con categoria_id
     categoria = db.Column(db.String(100))
     descripcion = db.Column(db.Text)
     precio = db.Column(db.Float, default=0.0)
     imagen = db.Column(db.String(200))
+    imagen_lqip = db.Column(db.Text)  # Placeholder borroso (data URI) mientras carga la imagen
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    # En PostgreSQL existe además la columna generada 'busqueda' (tsvector), que no se mapea:
+    # la mantiene la base y solo la usa app/busqueda.py
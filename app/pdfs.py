@@ -0,0 +1,268 @@
+"""
+Optimización de los PDFs de resultados - Laboratorio Pérez
+- Después de subir o reemplazar un resultado, un hilo en segundo plano linealiza el PDF
+  ("fast web view"): el visor del celular pide por Range solo lo que necesita y
+  muestra la primera página sin esperar el archivo completo
+- Las imágenes grandes (escaneos) se reducen a PDF_IMAGEN_MAX_PX y se recomprimen en JPEG
+  si así pesan menos; las que tienen transparencia, /Decode propio o son de 1 bit no se tocan
+- El optimizado se publica con un nombre nuevo y único por corrida
+  (<nombre>_<12 hex>_web.pdf), como cualquier subida: un archivo nunca cambia de contenido,
+  así que su SHA-256 sigue sirviendo de ETag (app/descargas.py). El original se conserva
+  en instance/pdf_originales/
+- resultados.archivo_pdf y archivo_sha256 cambian juntos, solo si el resultado sigue
+  apuntando al mismo archivo con el hash original: si se reemplazó mientras tanto, se descarta.
+  Dos corridas sobre el mismo PDF (CLI y el hilo de la subida) escriben nombres distintos
+  y solo borran lo que crearon y ningún resultado referencia
+- pikepdf es opcional: sin él los PDFs se guardan tal como se suben
+Uso: automático al subir; para los ya subidos: flask --app run lab optimizar-pdfs
+"""
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from flask import current_app
+
+try:
+    import pikepdf
+except ImportError:  # pikepdf es opcional: sin él no se optimiza nada
+    pikepdf = None
+
+try:
+    from PIL import Image
+except ImportError:  # Sin Pillow solo se linealiza
+    Image = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, 'app', 'static', 'uploads')
+BACKUP_DIR = os.path.join(UPLOAD_DIR, 'backups')
+ORIGINALES_DIR = os.path.join(BASE_DIR, 'instance', 'pdf_originales')   # Fuera de /static
+
+# Filtros que Pillow puede decodificar; JBIG2, CCITT (escaneos de 1 bit) y JPX se dejan como están
+FILTROS_RECOMPRIMIBLES = {'/FlateDecode', '/DCTDecode', '/LZWDecode', '/RunLengthDecode',
+                          '/ASCII85Decode', '/ASCIIHexDecode'}
+SUFIJO = '_web.pdf'   # Nombre de la versión optimizada: <nombre original sin .pdf>_<12 hex>_web.pdf
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    """Un solo hilo por worker, creado bajo demanda (después del fork de gunicorn)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdfs')
+        return _executor
+
+
+def _sha256(ruta):
+    with open(ruta, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _filtros(imagen):
+    filtro = imagen.get('/Filter')
+    if filtro is None:
+        return set()
+    return {str(f) for f in filtro} if isinstance(filtro, pikepdf.Array) else {str(filtro)}
+
+
+def recomprimir_imagenes(pdf, max_px, calidad, min_bytes):
+    """
+    Reduce y pasa a JPEG las imágenes de más de `min_bytes`. Solo se reemplaza la
+    imagen si la nueva pesa menos. Returns: (imágenes recomprimidas, bytes ahorrados)
+    """
+    if Image is None:
+        return 0, 0
+    vistas, cantidad, ahorro = set(), 0, 0
+    for pagina in pdf.pages:
+        for imagen in pagina.images.values():
+            if imagen.objgen in vistas:
+                continue
+            vistas.add(imagen.objgen)
+            largo = int(imagen.get('/Length', 0))
+            if (largo < min_bytes or not _filtros(imagen) <= FILTROS_RECOMPRIMIBLES
+                    or imagen.get('/ImageMask') or '/SMask' in imagen or '/Mask' in imagen
+                    or '/Decode' in imagen   # El JPEG nuevo no lo aplicaría: colores invertidos
+                    or int(imagen.get('/BitsPerComponent', 8)) != 8):
+                continue
+            try:
+                pil = pikepdf.PdfImage(imagen).as_pil_image()
+            except Exception:
+                continue   # Espacio de color o formato que Pillow no interpreta
+            if pil.mode not in ('RGB', 'L'):
+                pil = pil.convert('RGB')
+            pil.thumbnail((max_px, max_px), Image.LANCZOS)
+            buffer = BytesIO()
+            pil.save(buffer, format='JPEG', quality=calidad, optimize=True)
+            if buffer.tell() >= largo:
+                continue
+            imagen.write(buffer.getvalue(), filter=pikepdf.Name.DCTDecode)
+            imagen.Width, imagen.Height = pil.size
+            imagen.ColorSpace = pikepdf.Name.DeviceRGB if pil.mode == 'RGB' else pikepdf.Name.DeviceGray
+            imagen.BitsPerComponent = 8
+            if '/DecodeParms' in imagen:
+                del imagen['/DecodeParms']
+            cantidad += 1
+            ahorro += largo - buffer.tell()
+    return cantidad, ahorro
+
+
+def optimizar_archivo(origen, destino, max_px=2200, calidad=80, min_bytes=200 * 1024):
+    """
+    Escribe en `destino` la versión linealizada (y con imágenes recomprimidas) de `origen`.
+
+    Returns:
+        dict: {'linealizado_antes', 'imagenes', 'bytes_antes', 'bytes_despues'}
+    """
+    with pikepdf.open(origen) as pdf:
+        linealizado = pdf.is_linearized
+        imagenes, _ = recomprimir_imagenes(pdf, max_px, calidad, min_bytes)
+        pdf.save(destino, linearize=True, compress_streams=True,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    return {'linealizado_antes': linealizado, 'imagenes': imagenes,
+            'bytes_antes': os.path.getsize(origen), 'bytes_despues': os.path.getsize(destino)}
+
+
+def _publicar(origen, destino):
+    """Copia `origen` sobre `destino` de forma atómica"""
+    intermedio = f'{destino}.pdfs{os.getpid()}'
+    shutil.copyfile(origen, intermedio)
+    os.replace(intermedio, destino)
+
+
+def nombre_optimizado(archivo):
+    """
+    Nombre nuevo y único para la versión optimizada (cabe en resultados.archivo_pdf, 200).
+    El sufijo aleatorio evita que dos corridas sobre el mismo PDF se pisen los archivos.
+    """
+    marca = f'_{uuid.uuid4().hex[:12]}{SUFIJO}'
+    return f'{os.path.splitext(archivo)[0][:200 - len(marca)]}{marca}'
+
+
+def _borrar(*rutas):
+    for ruta in rutas:
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+
+
+def _referenciado(archivo):
+    """True si algún resultado apunta a `archivo` (se consulta justo antes de borrar)"""
+    from app.models import Resultado
+    return Resultado.query.filter_by(archivo_pdf=archivo).first() is not None
+
+
+def _descartar(archivo):
+    """Borra uploads/<archivo> y su backup solo si ningún resultado lo referencia"""
+    from app import db
+    db.session.rollback()
+    if not _referenciado(archivo):
+        _borrar(os.path.join(UPLOAD_DIR, archivo), os.path.join(BACKUP_DIR, archivo))
+
+
+def optimizar_resultado(archivo, config):
+    """
+    Optimiza uploads/<archivo> y, si vale la pena, lo publica con un nombre nuevo.
+
+    Orden: se escriben las copias nuevas (principal y backup) con un nombre único de esta
+    corrida, un UPDATE condicional cambia archivo_pdf y archivo_sha256 y se confirma; recién
+    entonces el original se mueve a ORIGINALES_DIR y se borra su backup, si ningún resultado
+    lo sigue usando. Si el UPDATE no encuentra el resultado (se reemplazó, se eliminó u otra
+    corrida lo optimizó mientras tanto) o el commit falla, se borran las copias nuevas.
+
+    Returns:
+        dict: resumen de optimizar_archivo() + 'estado' (optimizado, sin_mejora,
+        reemplazado, ya_optimizado, faltante) y 'archivo' (el nombre que quedó en uso)
+    """
+    from sqlalchemy import update
+    from app import db
+    from app.models import Resultado
+
+    if archivo.endswith(SUFIJO):
+        return {'estado': 'ya_optimizado', 'archivo': archivo}
+    principal = os.path.join(UPLOAD_DIR, archivo)
+    nuevo = nombre_optimizado(archivo)
+    principal_nuevo, backup_nuevo = os.path.join(UPLOAD_DIR, nuevo), os.path.join(BACKUP_DIR, nuevo)
+    temporal = f'{principal_nuevo}.optimizando{os.getpid()}'
+    creado, publicado = False, False
+    try:
+        sha256_original = _sha256(principal)
+        r = optimizar_archivo(principal, temporal, config['PDF_IMAGEN_MAX_PX'],
+                              config['PDF_IMAGEN_CALIDAD'], config['PDF_IMAGEN_MIN_KB'] * 1024)
+        r['archivo'] = archivo
+        # Ya linealizado y sin ahorro: no vale la pena cambiar el archivo
+        if r['linealizado_antes'] and r['bytes_despues'] >= r['bytes_antes']:
+            r['estado'] = 'sin_mejora'
+            return r
+
+        # 1. Copias nuevas en disco (todavía nadie las referencia)
+        sha256_nuevo = _sha256(temporal)
+        creado = True
+        os.replace(temporal, principal_nuevo)
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        _publicar(principal_nuevo, backup_nuevo)
+
+        # 2. Solo si el resultado sigue apuntando al mismo archivo con el mismo contenido
+        actualizado = db.session.execute(
+            update(Resultado)
+            .where(Resultado.archivo_pdf == archivo,
+                   (Resultado.archivo_sha256 == sha256_original) | Resultado.archivo_sha256.is_(None))
+            .values(archivo_pdf=nuevo, archivo_sha256=sha256_nuevo))
+        if not actualizado.rowcount:
+            _descartar(nuevo)
+            r['estado'] = 'reemplazado'
+            return r
+        db.session.commit()
+        publicado = True
+
+        # 3. La base ya apunta al nuevo: el original se conserva fuera de /static
+        if not _referenciado(archivo):
+            os.makedirs(ORIGINALES_DIR, exist_ok=True)
+            try:
+                shutil.move(principal, os.path.join(ORIGINALES_DIR, archivo))
+            except FileNotFoundError:
+                pass   # Otra corrida ya lo movió
+            _borrar(os.path.join(BACKUP_DIR, archivo))
+        r['estado'] = 'optimizado'
+        r['archivo'] = nuevo
+        return r
+    except Exception as e:
+        if not publicado:
+            db.session.rollback()
+            if creado:
+                _descartar(nuevo)
+            elif isinstance(e, FileNotFoundError):
+                # El original se eliminó o lo movió otra corrida antes de terminar
+                return {'estado': 'faltante', 'archivo': archivo}
+        raise
+    finally:
+        _borrar(temporal)
+
+
+def _optimizar_en_segundo_plano(app, archivo):
+    with app.app_context():
+        try:
+            inicio = time.perf_counter()
+            r = optimizar_resultado(archivo, app.config)
+            if r['estado'] == 'optimizado':
+                print(f"📄 PDF optimizado: {archivo} → {r['archivo']} {r['bytes_antes'] / 1024:.0f} KB → "
+                      f"{r['bytes_despues'] / 1024:.0f} KB, {r['imagenes']} imágenes, "
+                      f"{time.perf_counter() - inicio:.2f}s")
+        except Exception as e:
+            print(f"⚠ Error optimizando {archivo}: {e}")
+        finally:
+            from app import db
+            db.session.remove()
+
+
+def optimizar_en_segundo_plano(archivo):
+    """Encola el PDF recién guardado (llamar después del commit del resultado)"""
+    if pikepdf is None or not current_app.config.get('PDF_OPTIMIZAR'):
+        return
+    _pool().submit(_optimizar_en_segundo_plano, current_app._get_current_object(), archivo)
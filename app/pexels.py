@@ -0,0 +1,334 @@
+"""
+Imágenes de stock desde Pexels - Laboratorio Pérez
+- Búsquedas y descargas concurrentes con asyncio (concurrencia acotada por semáforo)
+- Respeta los encabezados X-Ratelimit-* de la API y reintenta los 429/5xx
+- Cache en disco de las respuestas por consulta: repetir una corrida no gasta cuota
+- Estado persistente: una corrida interrumpida continúa donde quedó y las fotos
+  ya usadas no se repiten entre corridas
+Uso: flask --app run lab imagenes-pexels
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from app.clasificador import clasificar_catalogo
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATOS_DIR = os.path.join(BASE_DIR, 'instance', 'pexels')   # cache/ + estado.json
+API_URL = 'https://api.pexels.com/v1'
+
+POR_PAGINA = 15          # Una sola página alcanza casi siempre (antes: 5 por página, hasta 3 páginas)
+PAGINAS = 3
+CONCURRENCIA = 6
+REINTENTOS = 4
+MARGEN_CUOTA = 2         # Consultas que se dejan sin usar antes del reinicio de la ventana
+MAX_ESPERA = 15 * 60     # Si la cuota se reinicia más tarde que esto, cortar y continuar otro día
+
+
+class ErrorPexels(Exception):
+    pass
+
+
+class CuotaAgotada(ErrorPexels):
+    """La ventana de la API no se reinicia pronto: el estado queda guardado para continuar después"""
+
+
+def _escribir_json(ruta, datos):
+    temporal = f'{ruta}.tmp{os.getpid()}'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+class CacheConsultas:
+    """Un JSON por consulta (clave = SHA-1 de los parámetros) con los metadatos que usamos"""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, parametros):
+        clave = hashlib.sha1(json.dumps(parametros, sort_keys=True).encode('utf-8')).hexdigest()
+        return os.path.join(self.directorio, f'{clave}.json')
+
+    def leer(self, parametros):
+        try:
+            with open(self._ruta(parametros), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def guardar(self, parametros, datos):
+        _escribir_json(self._ruta(parametros), datos)
+
+
+class Estado:
+    """
+    Checkpoint en JSON:
+    - usadas: IDs de fotos ya asignadas (nunca se repiten)
+    - resueltos: clave del pedido -> {'photo_id', 'archivo'} (archivo None = sin resultados)
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            datos = {}
+        self.usadas = set(datos.get('usadas', []))
+        self.resueltos = datos.get('resueltos', {})
+
+    def resolver(self, clave, photo_id, archivo):
+        self.resueltos[clave] = {'photo_id': photo_id, 'archivo': archivo}
+        self.guardar()
+
+    def guardar(self):
+        _escribir_json(self.ruta, {'usadas': sorted(self.usadas), 'resueltos': self.resueltos})
+
+
+class LimiteTasa:
+    """Lleva la cuenta de X-Ratelimit-Remaining/Reset y frena antes de agotar la ventana"""
+
+    def __init__(self, max_espera=MAX_ESPERA):
+        self.max_espera = max_espera
+        self.restantes = None
+        self.reinicio = 0.0
+        self.pausa_hasta = 0.0
+
+    async def esperar(self):
+        while True:
+            ahora = time.time()
+            espera = self.pausa_hasta - ahora
+            if self.restantes is not None and self.restantes <= MARGEN_CUOTA:
+                espera = max(espera, self.reinicio - ahora)
+            if espera <= 0:
+                if self.restantes is not None:
+                    self.restantes -= 1   # Reservar antes de que la respuesta traiga el valor real
+                return
+            if espera > self.max_espera:
+                raise CuotaAgotada(f'La cuota de Pexels se reinicia en {int(espera // 60)} minutos')
+            await asyncio.sleep(min(espera, 30))
+
+    def actualizar(self, headers):
+        restantes = headers.get('X-Ratelimit-Remaining')
+        reinicio = headers.get('X-Ratelimit-Reset')
+        if restantes is not None:
+            self.restantes = int(restantes)
+        if reinicio:
+            self.reinicio = float(reinicio)
+
+    def pausar(self, segundos):
+        self.pausa_hasta = max(self.pausa_hasta, time.time() + segundos)
+
+
+def _http_get(url, headers, timeout=20):
+    """GET bloqueante (se ejecuta en un hilo). Returns (status, headers, cuerpo)"""
+    peticion = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(peticion, timeout=timeout) as respuesta:
+            return respuesta.status, respuesta.headers, respuesta.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+class ClientePexels:
+    """Búsquedas (con cache) y descargas; todas pasan por el semáforo y el límite de tasa"""
+
+    def __init__(self, api_key, cache, concurrencia=CONCURRENCIA, api_url=None, max_espera=MAX_ESPERA):
+        self.api_key = api_key
+        self.cache = cache
+        self.api_url = (api_url or os.environ.get('PEXELS_API_URL') or API_URL).rstrip('/')
+        self.semaforo = asyncio.Semaphore(concurrencia)
+        self.limite = LimiteTasa(max_espera)
+        self.consultas_api = 0
+        self.consultas_cache = 0
+        self.descargas = 0
+        self._en_curso = {}      # Consultas idénticas simultáneas comparten una sola petición
+
+    async def _get(self, url, api):
+        headers = {'User-Agent': 'laboratorio-perez'}
+        if api:
+            headers['Authorization'] = self.api_key
+        for intento in range(REINTENTOS + 1):
+            if api:
+                await self.limite.esperar()
+            try:
+                async with self.semaforo:
+                    status, respuesta, cuerpo = await asyncio.to_thread(_http_get, url, headers)
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                status, respuesta, cuerpo = None, {}, str(e).encode()
+            if api and status is not None:
+                self.limite.actualizar(respuesta)
+
+            if status is not None and status < 400:
+                return cuerpo
+            if status is not None and status != 429 and status < 500:
+                raise ErrorPexels(f'HTTP {status} en {url}')
+
+            espera = float(respuesta.get('Retry-After') or 2 ** intento)
+            if status == 429:
+                self.limite.pausar(espera)
+            else:
+                await asyncio.sleep(espera)
+        raise ErrorPexels(f'Sin respuesta de {url} después de {REINTENTOS + 1} intentos')
+
+    async def buscar(self, consulta, pagina=1):
+        parametros = {'query': consulta, 'per_page': POR_PAGINA, 'page': pagina, 'orientation': 'landscape'}
+        datos = self.cache.leer(parametros)
+        if datos is not None:
+            self.consultas_cache += 1
+            return datos
+
+        clave = json.dumps(parametros, sort_keys=True)
+        if clave not in self._en_curso:
+            self._en_curso[clave] = asyncio.ensure_future(self._buscar_api(parametros))
+        return await asyncio.shield(self._en_curso[clave])
+
+    async def _buscar_api(self, parametros):
+        cuerpo = await self._get(f'{self.api_url}/search?{urllib.parse.urlencode(parametros)}', api=True)
+        self.consultas_api += 1
+        respuesta = json.loads(cuerpo)
+        datos = {'photos': [{'id': foto['id'], 'src': {'medium': foto['src']['medium']},
+                             'photographer': foto.get('photographer')}
+                            for foto in respuesta.get('photos') or []]}
+        self.cache.guardar(parametros, datos)
+        return datos
+
+    async def descargar(self, url):
+        contenido = await self._get(url, api=False)
+        self.descargas += 1
+        return contenido
+
+
+def _guardar_descarga(contenido):
+    """Guarda la foto con nombre por contenido y genera sus derivados (en un hilo)"""
+    from app.imagenes import PRUEBAS_UPLOAD_DIR, nombre_por_contenido, generar_derivados
+
+    os.makedirs(PRUEBAS_UPLOAD_DIR, exist_ok=True)
+    archivo = nombre_por_contenido(contenido, 'pexels.jpg')
+    ruta = os.path.join(PRUEBAS_UPLOAD_DIR, archivo)
+    if not os.path.exists(ruta):
+        temporal = f'{ruta}.tmp{os.getpid()}'
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+    try:
+        generar_derivados(archivo)
+    except Exception as e:
+        print(f"      ⚠️ Derivados de {archivo}: {e}")
+    return archivo
+
+
+async def obtener_imagenes(pedidos, api_key, concurrencia=CONCURRENCIA, directorio=DATOS_DIR, api_url=None,
+                           reemplazar=False):
+    """
+    Resuelve una imagen única por pedido.
+
+    Args:
+        pedidos: lista de (clave estable, consulta)
+        reemplazar: olvidar lo resuelto antes para estos pedidos y buscar fotos nuevas
+            (las ya usadas no se repiten; las búsquedas salen de la cache)
+
+    Returns:
+        tuple: (dict clave -> archivo o None, dict con estadísticas y errores)
+    """
+    from app.imagenes import PRUEBAS_UPLOAD_DIR
+
+    estado = Estado(os.path.join(directorio, 'estado.json'))
+    cliente = ClientePexels(api_key, CacheConsultas(os.path.join(directorio, 'cache')),
+                            concurrencia=concurrencia, api_url=api_url)
+    if reemplazar:
+        for clave, _ in pedidos:
+            estado.resueltos.pop(clave, None)
+
+    def resuelto(clave):
+        previo = estado.resueltos.get(clave)
+        return previo is not None and (previo['archivo'] is None or
+                                       os.path.exists(os.path.join(PRUEBAS_UPLOAD_DIR, previo['archivo'])))
+
+    pendientes = [(clave, consulta) for clave, consulta in pedidos if not resuelto(clave)]
+    total = len(pendientes)
+    hechos = 0
+
+    async def resolver(clave, consulta):
+        nonlocal hechos
+        foto = None
+        for pagina in range(1, PAGINAS + 1):
+            fotos = (await cliente.buscar(consulta, pagina))['photos']
+            # Elegir y reservar sin await de por medio: dos pedidos nunca toman la misma foto
+            foto = next((f for f in fotos if f['id'] not in estado.usadas), None)
+            if foto is not None or len(fotos) < POR_PAGINA:
+                break
+        if foto is None:
+            estado.resolver(clave, None, None)
+            return
+
+        estado.usadas.add(foto['id'])
+        try:
+            contenido = await cliente.descargar(foto['src']['medium'])
+        except Exception:
+            estado.usadas.discard(foto['id'])
+            raise
+        archivo = await asyncio.to_thread(_guardar_descarga, contenido)
+        estado.resolver(clave, foto['id'], archivo)
+        hechos += 1
+        print(f"  [{hechos}/{total}] ✅ {clave[:50]} (ID: {foto['id']})")
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(resolver(c, q) for c, q in pendientes), return_exceptions=True)
+    errores = [(clave, str(r)) for (clave, _), r in zip(pendientes, resultados) if isinstance(r, Exception)]
+    estado.guardar()
+
+    archivos = {clave: (estado.resueltos.get(clave) or {}).get('archivo') for clave, _ in pedidos}
+    return archivos, {
+        'pedidos': len(pedidos),
+        'ya_resueltos': len(pedidos) - total,
+        'consultas_api': cliente.consultas_api,
+        'consultas_cache': cliente.consultas_cache,
+        'descargas': cliente.descargas,
+        'cuota_agotada': any(isinstance(r, CuotaAgotada) for r in resultados),
+        'errores': errores,
+        'segundos': time.perf_counter() - inicio,
+    }
+
+
+def asignar_imagenes(pruebas, api_key, reemplazar=False, concurrencia=CONCURRENCIA):
+    """
+    Busca y descarga imágenes para `pruebas` y actualiza la BD en un solo UPDATE por lotes.
+    La clave de cada pedido es categoría + nombre: sobrevive a que se recreen las filas.
+
+    Returns:
+        dict: estadísticas de obtener_imagenes() más 'actualizadas'
+    """
+    from sqlalchemy import update
+    from app import db
+    from app.imagenes import generar_lqip
+    from app.models import Prueba
+
+    objetivo = [p for p in pruebas if reemplazar or not p.imagen]
+    claves = {p.id: f'{p.categoria or ""}|{p.nombre}' for p in objetivo}
+    consultas = clasificar_catalogo((p.nombre, p.categoria) for p in objetivo)
+    pedidos = list({claves[p.id]: consulta for p, consulta in zip(objetivo, consultas)}.items())
+
+    archivos, estadisticas = asyncio.run(obtener_imagenes(pedidos, api_key, concurrencia=concurrencia,
+                                                          reemplazar=reemplazar))
+
+    filas = []
+    for prueba in objetivo:
+        archivo = archivos.get(claves[prueba.id])
+        if archivo and archivo != prueba.imagen:
+            try:
+                lqip = generar_lqip(archivo)
+            except Exception:
+                lqip = None
+            filas.append({'id': prueba.id, 'imagen': archivo, 'imagen_lqip': lqip})
+    if filas:
+        db.session.execute(update(Prueba), filas)
+        db.session.commit()
+    estadisticas['actualizadas'] = len(filas)
+    return estadisticas
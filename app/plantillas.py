@@ -0,0 +1,55 @@
+"""
+Plantillas Jinja - Laboratorio Pérez
+- Cache de bytecode en disco (instance/jinja), compartida por todos los workers:
+  cada plantilla se compila una sola vez por versión de su código fuente
+- Precompilación opcional de todas las plantillas al crear la app
+  (PRECOMPILAR_PLANTILLAS), así el primer visitante de cada página después de un
+  deploy o de un arranque en frío de Render no paga la compilación. Con
+  preload_app de gunicorn se hace una sola vez en el master y los workers la heredan.
+Benchmark: python benchmark_arranque.py
+"""
+import os
+import time
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+
+def directorio_cache(app):
+    return app.config.get('JINJA_CACHE_DIR') or os.path.join(app.instance_path, 'jinja')
+
+
+def precompilar(app):
+    """
+    Compila todas las plantillas .html y las deja en la cache del entorno Jinja.
+
+    Returns:
+        tuple: [(nombre, milisegundos)] de las compiladas y [(nombre, error)] de las que fallan
+    """
+    tiempos, errores = [], []
+    for nombre in app.jinja_env.list_templates(extensions=['html']):
+        inicio = time.perf_counter()
+        try:
+            app.jinja_env.get_template(nombre)
+        except TemplateError as e:
+            errores.append((nombre, str(e)))
+            continue
+        tiempos.append((nombre, (time.perf_counter() - inicio) * 1000))
+    return tiempos, errores
+
+
+def init_app(app):
+    directorio = directorio_cache(app)
+    try:
+        os.makedirs(directorio, exist_ok=True)
+    except OSError as e:
+        # Sin disco escribible se compila en memoria como siempre
+        app.logger.warning(f'Cache de plantillas desactivada ({directorio}): {e}')
+    else:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directorio, 'plantilla_%s.cache')
+
+    if app.config.get('PRECOMPILAR_PLANTILLAS'):
+        inicio = time.perf_counter()
+        tiempos, errores = precompilar(app)
+        for nombre, error in errores:
+            app.logger.error(f'Plantilla {nombre} no compila: {error}')
+        app.logger.info(f'{len(tiempos)} plantillas precompiladas en '
+                        f'{(time.perf_counter() - inicio) * 1000:.0f} ms')
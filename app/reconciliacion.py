@@ -0,0 +1,156 @@
+"""
+Conciliación de archivos de resultados - Laboratorio Pérez
+- Huérfanos: archivos en uploads/ o uploads/backups/ que ningún resultado referencia
+  (quedan de subidas, reemplazos o eliminaciones que fallaron a medias)
+- Colgantes: resultados cuyo archivo_pdf no está en el directorio
+- Memoria constante con millones de archivos: os.scandir se recorre en streaming y
+  se ordena por fuera (tandas ordenadas en archivos temporales + heapq.merge); la
+  base entrega los nombres ya ordenados con un cursor del lado del servidor; las dos
+  listas ordenadas se cruzan en una sola pasada (merge-join)
+- El reporte se escribe línea a línea (JSON Lines) en instance/reconciliacion/
+- Con cuarentena, los huérfanos se mueven a instance/cuarentena/<fecha>/ (nunca se borran);
+  los que tienen menos de `min_edad_horas` se ignoran: pueden ser una subida en curso
+Uso: flask --app run lab reconciliar [--cuarentena]
+"""
+import heapq
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from sqlalchemy import select
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, 'app', 'static', 'uploads')
+BACKUP_DIR = os.path.join(UPLOAD_DIR, 'backups')
+CUARENTENA_DIR = os.path.join(BASE_DIR, 'instance', 'cuarentena')   # Fuera de /static: deja de ser público
+DATOS_DIR = os.path.join(BASE_DIR, 'instance', 'reconciliacion')
+
+TAMANO_TANDA = 100_000   # Nombres ordenados en memoria antes de volcarlos a un archivo temporal
+LOTE_DB = 5_000
+
+HUERFANO, COLGANTE = 'huerfano', 'colgante'
+
+
+def nombres_en_directorio(directorio):
+    """Archivos (no carpetas ni ocultos) del directorio, sin cargar la lista completa"""
+    try:
+        with os.scandir(directorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith('.') or '\n' in entrada.name:
+                    continue
+                if entrada.is_file(follow_symlinks=False):
+                    yield entrada.name
+    except FileNotFoundError:
+        return
+
+
+def ordenar_externo(nombres, temporal, tamano_tanda=TAMANO_TANDA):
+    """
+    Los nombres en orden, usando como mucho `tamano_tanda` en memoria: tandas
+    ordenadas en archivos de `temporal` que después se mezclan con heapq.merge.
+    """
+    tandas, tanda = [], []
+
+    def volcar():
+        ruta = os.path.join(temporal, f'tanda_{len(tandas)}.txt')
+        with open(ruta, 'w', encoding='utf-8', errors='surrogateescape') as f:
+            f.writelines(f'{nombre}\n' for nombre in sorted(tanda))
+        tandas.append(ruta)
+        tanda.clear()
+
+    for nombre in nombres:
+        tanda.append(nombre)
+        if len(tanda) >= tamano_tanda:
+            volcar()
+    if not tandas:
+        yield from sorted(tanda)   # Entra todo en una tanda: sin archivos temporales
+        return
+    if tanda:
+        volcar()
+
+    archivos = [open(ruta, encoding='utf-8', errors='surrogateescape') for ruta in tandas]
+    try:
+        yield from heapq.merge(*((linea[:-1] for linea in f) for f in archivos))
+    finally:
+        for f in archivos:
+            f.close()
+
+
+def nombres_referenciados(lote=LOTE_DB):
+    """archivo_pdf de todos los resultados, sin repetir, en el mismo orden que sorted()"""
+    from app import db
+    from app.models import Resultado
+
+    columna = Resultado.archivo_pdf
+    if db.session.get_bind().dialect.name == 'postgresql':
+        columna = columna.collate('C')   # Orden por bytes, igual al de Python (no el del idioma)
+    consulta = (select(columna)   # DISTINCT + ORDER BY: la misma expresión en ambos
+                .where(Resultado.archivo_pdf.isnot(None), Resultado.archivo_pdf != '')
+                .distinct()
+                .order_by(columna)
+                .execution_options(yield_per=lote))
+    for filas in db.session.execute(consulta).scalars().partitions():
+        yield from filas
+
+
+def cruzar(en_disco, referenciados):
+    """
+    Merge-join de dos iteradores ordenados. Devuelve (HUERFANO, nombre) para lo que solo
+    está en disco y (COLGANTE, nombre) para lo que solo está en la base.
+    """
+    centinela = object()
+    disco, base = next(en_disco, centinela), next(referenciados, centinela)
+    while disco is not centinela or base is not centinela:
+        if base is centinela or (disco is not centinela and disco < base):
+            yield HUERFANO, disco
+            disco = next(en_disco, centinela)
+        elif disco is centinela or base < disco:
+            yield COLGANTE, base
+            base = next(referenciados, centinela)
+        else:
+            disco, base = next(en_disco, centinela), next(referenciados, centinela)
+
+
+def reconciliar(cuarentena=False, min_edad_horas=24, tamano_tanda=TAMANO_TANDA):
+    """
+    Concilia uploads/ y uploads/backups/ con la tabla resultados.
+
+    Returns:
+        tuple: (resumen por directorio, ruta del reporte JSON Lines)
+    """
+    os.makedirs(DATOS_DIR, exist_ok=True)
+    ahora = time.time()
+    fecha = datetime.now().strftime('%Y%m%d_%H%M%S')
+    ruta_reporte = os.path.join(DATOS_DIR, f'reporte_{fecha}.jsonl')
+    resumen = {}
+
+    with open(ruta_reporte, 'w', encoding='utf-8', errors='backslashreplace') as reporte:
+        for etiqueta, directorio in (('uploads', UPLOAD_DIR), ('backups', BACKUP_DIR)):
+            cuenta = {HUERFANO: 0, COLGANTE: 0, 'recientes': 0, 'en_cuarentena': 0, 'bytes_huerfanos': 0}
+            with tempfile.TemporaryDirectory(prefix='reconciliacion_') as temporal:
+                en_disco = ordenar_externo(nombres_en_directorio(directorio), temporal, tamano_tanda)
+                for tipo, nombre in cruzar(en_disco, nombres_referenciados()):
+                    fila = {'directorio': etiqueta, 'tipo': tipo, 'archivo': nombre}
+                    if tipo == HUERFANO:
+                        ruta = os.path.join(directorio, nombre)
+                        try:
+                            st = os.stat(ruta)
+                        except FileNotFoundError:
+                            continue   # Se eliminó mientras se recorría
+                        if ahora - st.st_mtime < min_edad_horas * 3600:
+                            cuenta['recientes'] += 1
+                            continue
+                        fila['bytes'] = st.st_size
+                        cuenta['bytes_huerfanos'] += st.st_size
+                        if cuarentena:
+                            destino = os.path.join(CUARENTENA_DIR, fecha, etiqueta)
+                            os.makedirs(destino, exist_ok=True)
+                            shutil.move(ruta, os.path.join(destino, nombre))
+                            fila['cuarentena'] = os.path.relpath(os.path.join(destino, nombre), BASE_DIR)
+                            cuenta['en_cuarentena'] += 1
+                    cuenta[tipo] += 1
+                    reporte.write(json.dumps(fila, ensure_ascii=False, default=str) + '\n')
+            resumen[etiqueta] = cuenta
+    return resumen, ruta_reporte
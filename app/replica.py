@@ -0,0 +1,179 @@
+"""
+Réplica de lectura - Laboratorio Pérez
+- DATABASE_REPLICA_URL agrega el bind 'replica' (SQLALCHEMY_BINDS)
+- Las vistas marcadas con @solo_lectura (catálogo público, consulta de resultados,
+  dashboard) leen de la réplica; el resto y cualquier escritura van a la primaria
+- La réplica se deja de usar durante REPLICA_PAUSA_SEGUNDOS si falla o si su retraso
+  supera REPLICA_MAX_RETRASO_SEGUNDOS (se mide como mucho cada REPLICA_VERIFICAR_SEGUNDOS).
+  Si falla en medio de un request, la vista se repite en la primaria
+- Después de escribir, el proceso lee de la primaria durante REPLICA_MAX_RETRASO_SEGUNDOS,
+  así ve sus propios cambios aunque la réplica todavía no los tenga
+"""
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from app import circuito
+
+BIND = 'replica'
+
+_estado = {
+    'pausa_hasta': 0.0,          # time.monotonic() hasta el que no se usa la réplica
+    'verificada': float('-inf'),  # Última medición del retraso
+    'escritura': float('-inf'),   # Última escritura de este proceso
+    'retraso': None,              # Segundos, según la última medición
+    'motivo': None,               # Por qué se pausó la última vez
+}
+_lock = threading.Lock()
+
+
+def configurada(app=None):
+    app = app or current_app
+    return BIND in (app.config.get('SQLALCHEMY_BINDS') or {})
+
+
+def retraso_replica(conexion):
+    """
+    Segundos de retraso de una réplica PostgreSQL (0 si está al día, si es una
+    primaria o si no es PostgreSQL). Si no llegan cambios nuevos, la réplica está
+    al día aunque la última transacción aplicada sea antigua.
+    """
+    if conexion.dialect.name != 'postgresql':
+        return 0.0
+    return float(conexion.execute(text("""
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """)).scalar())
+
+
+def _pausar(motivo):
+    ahora = time.monotonic()
+    if ahora >= _estado['pausa_hasta']:
+        current_app.logger.warning(f'Réplica de lectura en pausa, se usa la primaria: {motivo}')
+    _estado['pausa_hasta'] = ahora + current_app.config['REPLICA_PAUSA_SEGUNDOS']
+    _estado['motivo'] = motivo
+
+
+def _verificar(motor):
+    try:
+        with motor.connect() as conexion:
+            retraso = retraso_replica(conexion)
+    except Exception as e:
+        _pausar(f'sin conexión ({e.__class__.__name__})')
+        return
+    _estado['retraso'] = retraso
+    if retraso > current_app.config['REPLICA_MAX_RETRASO_SEGUNDOS']:
+        _pausar(f'retraso de {retraso:.1f} s')
+
+
+def _motor_replica():
+    """El motor de la réplica si se puede usar ahora, o None para usar la primaria"""
+    if not configurada():
+        return None
+    config = current_app.config
+    ahora = time.monotonic()
+    if ahora - _estado['escritura'] < config['REPLICA_MAX_RETRASO_SEGUNDOS'] or ahora < _estado['pausa_hasta']:
+        return None
+
+    motor = current_app.extensions['sqlalchemy'].engines[BIND]
+    if ahora - _estado['verificada'] >= config['REPLICA_VERIFICAR_SEGUNDOS']:
+        with _lock:
+            if time.monotonic() - _estado['verificada'] >= config['REPLICA_VERIFICAR_SEGUNDOS']:
+                _verificar(motor)
+                _estado['verificada'] = time.monotonic()
+        if time.monotonic() < _estado['pausa_hasta']:
+            return None
+    return motor
+
+
+class SesionConReplica(Session):
+    """
+    Sesión de Flask-SQLAlchemy que envía las lecturas de @solo_lectura a la réplica.
+    Con el circuito de la primaria abierto (app/circuito.py) lanza CircuitoAbierto.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            if self._flushing or getattr(clause, 'is_dml', False):
+                _estado['escritura'] = time.monotonic()
+            elif g.get('solo_lectura'):
+                motor = _motor_replica()
+                if motor is not None:
+                    g.uso_replica = True
+                    return motor
+            circuito.verificar()  # Primaria caída: fallar ya, sin esperar connect_timeout
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def solo_lectura(vista):
+    """
+    Decorador para vistas que solo leen: sus consultas van a la réplica si está
+    disponible. Si la réplica falla a mitad del request, la vista se repite en la primaria.
+    """
+    @wraps(vista)
+    def envoltura(*args, **kwargs):
+        if not configurada():
+            return vista(*args, **kwargs)
+        from app import db
+
+        g.solo_lectura = True
+        try:
+            return vista(*args, **kwargs)
+        except DBAPIError as e:
+            if not g.pop('uso_replica', False):
+                raise
+            db.session.rollback()
+            _pausar(f'error en consulta ({e.__class__.__name__})')
+            g.solo_lectura = False
+            return vista(*args, **kwargs)
+        finally:
+            g.solo_lectura = False
+    return envoltura
+
+
+@contextmanager
+def primaria():
+    """Dentro de una vista @solo_lectura, fuerza la lectura desde la primaria"""
+    anterior = g.get('solo_lectura', False)
+    g.solo_lectura = False
+    try:
+        yield
+    finally:
+        g.solo_lectura = anterior
+
+
+def leyo_de_replica():
+    return bool(g.get('uso_replica'))
+
+
+def estado():
+    """Estado para /health (None si no hay réplica configurada)"""
+    if not configurada():
+        return None
+    pausada = time.monotonic() < _estado['pausa_hasta']
+    return {
+        'disponible': not pausada,
+        'retraso_segundos': _estado['retraso'],
+        'motivo': _estado['motivo'] if pausada else None,
+    }
+
+
+def init_app(app):
+    if not configurada(app):
+        return
+    with app.app_context():
+        motor = app.extensions['sqlalchemy'].engines[BIND]
+
+    @event.listens_for(motor, 'handle_error')
+    def _error_replica(contexto):
+        # Una conexión caída pausa la réplica para los requests siguientes
+        if contexto.is_disconnect:
+            with app.app_context():
+                _pausar('conexión perdida')
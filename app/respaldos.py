@@ -0,0 +1,408 @@
+"""
+Respaldo incremental de los PDFs de resultados - Laboratorio Pérez
+- Destino fuera del disco de la app (RESPALDO_DESTINO: otro disco, un volumen montado...),
+  a diferencia de uploads/backups/, que solo protege de un borrado accidental
+- Segmentos tipo tar comprimidos con zstd (gzip si zstandard no está instalado):
+  cada PDF es un miembro tar en su propio frame, así que un archivo se restaura
+  leyendo solo su frame (offset y largo en el manifiesto) y el segmento completo
+  sigue siendo un .tar.zst normal (zstd -dc seg.tar.zst | tar t)
+- Deduplicado por SHA-256: un contenido se guarda una sola vez aunque cambie de
+  nombre o lo compartan varios resultados
+- manifiesto.jsonl (solo se agrega): una línea por versión de cada resultado y por
+  resultado eliminado, con la fecha de la corrida. El estado en cualquier momento es
+  la última línea de cada resultado hasta ese momento (restauración a un punto en el tiempo)
+- Incremental: los archivos con el mismo nombre, tamaño y mtime que en la última
+  versión no se vuelven a leer
+- Programado: con RESPALDO_DESTINO y RESPALDO_HORA, un hilo por worker lo ejecuta cada
+  noche; un lock de archivo en el destino hace que corra uno solo
+Uso: flask --app run lab respaldo crear | restaurar
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+
+try:
+    import zstandard
+except ImportError:  # zstandard es opcional: sin él los segmentos son .tar.gz
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows (desarrollo): sin lock entre procesos
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, 'app', 'static', 'uploads')
+BACKUP_DIR = os.path.join(UPLOAD_DIR, 'backups')
+
+MANIFIESTO = 'manifiesto.jsonl'
+SEGMENTOS = 'segmentos'
+FIN_TAR = b'\0' * 1024   # Dos bloques vacíos: fin del archivo tar
+
+_programador = {'pid': None}
+
+
+class RespaldoOcupado(Exception):
+    """Otra corrida tiene el lock del destino"""
+
+
+def _ahora():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+# ============ COMPRESIÓN ============
+
+def _extension():
+    return '.tar.zst' if zstandard is not None else '.tar.gz'
+
+
+def _comprimir(datos, nivel):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=nivel).compress(datos)
+    return gzip.compress(datos, compresslevel=6)
+
+
+def _descomprimir(segmento, datos):
+    if segmento.endswith('.tar.zst'):
+        if zstandard is None:
+            raise RuntimeError(f'{segmento} necesita zstandard (pip install zstandard)')
+        return zstandard.ZstdDecompressor().decompress(datos)
+    return gzip.decompress(datos)
+
+
+def _miembro_tar(nombre, contenido):
+    """Encabezado tar + datos con relleno a 512 bytes (un miembro suelto)"""
+    info = tarfile.TarInfo(nombre)
+    info.size = len(contenido)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    return info.tobuf(tarfile.USTAR_FORMAT) + contenido + b'\0' * (-len(contenido) % tarfile.BLOCKSIZE)
+
+
+class EscritorSegmentos:
+    """Agrega miembros a segmentos nuevos de esta corrida, cortando en `maximo_bytes`"""
+
+    def __init__(self, destino, maximo_bytes, nivel):
+        self.directorio = os.path.join(destino, SEGMENTOS)
+        os.makedirs(self.directorio, exist_ok=True)
+        self.maximo = maximo_bytes
+        self.nivel = nivel
+        self.prefijo = f"seg_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.numero = 0
+        self.actual = None
+        self.nombre = None
+        self.escritos = []
+
+    def agregar(self, sha256, contenido):
+        """Returns: (segmento, offset, largo) del frame del miembro"""
+        if self.actual is None or self.actual.tell() >= self.maximo:
+            self._sellar()
+            self.numero += 1
+            self.nombre = f'{self.prefijo}_{self.numero:03d}{_extension()}'
+            self.actual = open(os.path.join(self.directorio, self.nombre), 'ab')
+            self.escritos.append(self.nombre)
+        frame = _comprimir(_miembro_tar(f'{sha256}.pdf', contenido), self.nivel)
+        offset = self.actual.tell()
+        self.actual.write(frame)
+        return self.nombre, offset, len(frame)
+
+    def sincronizar(self):
+        """Datos en disco antes de escribir en el manifiesto las líneas que los referencian"""
+        if self.actual is not None:
+            self.actual.flush()
+            os.fsync(self.actual.fileno())
+
+    def _sellar(self):
+        if self.actual is not None:
+            self.actual.write(_comprimir(FIN_TAR, self.nivel))
+            self.sincronizar()
+            self.actual.close()
+            self.actual = None
+
+    def cerrar(self):
+        self._sellar()
+
+
+# ============ MANIFIESTO ============
+
+def leer_manifiesto(destino, hasta=None):
+    """
+    Returns:
+        tuple: (último registro por resultado_id hasta `hasta`, {sha256: (segmento, offset, largo)})
+    """
+    ultimos, blobs = {}, {}
+    try:
+        f = open(os.path.join(destino, MANIFIESTO), encoding='utf-8')
+    except FileNotFoundError:
+        return ultimos, blobs
+    with f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            registro = json.loads(linea)
+            if registro.get('tipo') == 'version':
+                blobs.setdefault(registro['sha256'], (registro['segmento'], registro['offset'], registro['largo']))
+            if registro.get('tipo') in ('version', 'eliminado') and (hasta is None or registro['t'] <= hasta):
+                ultimos[registro['resultado_id']] = registro
+    return ultimos, blobs
+
+
+def _agregar_al_manifiesto(destino, registros):
+    if not registros:
+        return
+    with open(os.path.join(destino, MANIFIESTO), 'a', encoding='utf-8') as f:
+        f.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in registros)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class _Lock:
+    """Lock exclusivo no bloqueante sobre destino/.lock"""
+
+    def __init__(self, destino):
+        self.ruta = os.path.join(destino, '.lock')
+        self.f = None
+
+    def __enter__(self):
+        self.f = open(self.ruta, 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self.f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.f.close()
+                raise RespaldoOcupado(f'Otro respaldo está en curso en {self.ruta}')
+        return self
+
+    def __exit__(self, *exc):
+        self.f.close()  # Cerrar el archivo libera el flock
+
+
+# ============ CREAR ============
+
+def _leer_pdf(archivo, sha256_bd, upload_dir, backup_dir):
+    """(contenido, sha256, stat) de la copia principal, o del backup si la principal falta o no coincide"""
+    candidato = None
+    for ruta in (os.path.join(upload_dir, archivo), os.path.join(backup_dir, archivo)):
+        try:
+            st = os.stat(ruta)
+            with open(ruta, 'rb') as f:
+                contenido = f.read()
+        except FileNotFoundError:
+            continue
+        sha256 = hashlib.sha256(contenido).hexdigest()
+        if sha256_bd is None or sha256 == sha256_bd:
+            return contenido, sha256, st
+        candidato = candidato or (contenido, sha256, st)
+    return candidato
+
+
+def crear_respaldo(destino, maximo_mb=256, nivel=10, lote=500, upload_dir=UPLOAD_DIR, backup_dir=BACKUP_DIR):
+    """
+    Una corrida incremental. Lanza RespaldoOcupado si otra corrida tiene el lock.
+
+    Returns:
+        dict: resumen (revisados, sin_cambios, versiones, blobs nuevos, deduplicados,
+        eliminados, faltantes, bytes originales y comprimidos, segmentos, segundos)
+    """
+    from app import db
+    from app.models import Resultado
+
+    os.makedirs(destino, exist_ok=True)
+    inicio = time.perf_counter()
+    resumen = {'revisados': 0, 'sin_cambios': 0, 'versiones': 0, 'blobs_nuevos': 0, 'deduplicados': 0,
+               'eliminados': 0, 'faltantes': [], 'no_coinciden': 0, 'bytes_originales': 0,
+               'bytes_comprimidos': 0, 'segmentos': []}
+
+    with _Lock(destino):
+        ultimos, blobs = leer_manifiesto(destino)
+        vistos = set()
+        t = _ahora()
+        escritor = EscritorSegmentos(destino, int(maximo_mb * 1024 * 1024), nivel)
+        consulta = (select(Resultado.id, Resultado.numero_orden, Resultado.archivo_pdf,
+                           Resultado.archivo_sha256, Resultado.fecha_creacion)
+                    .where(Resultado.archivo_pdf.isnot(None), Resultado.archivo_pdf != '')
+                    .order_by(Resultado.id)
+                    .execution_options(yield_per=lote))
+        try:
+            for filas in db.session.execute(consulta).partitions():
+                registros = []
+                for resultado_id, numero_orden, archivo, sha256_bd, fecha_creacion in filas:
+                    resumen['revisados'] += 1
+                    vistos.add(resultado_id)
+                    previo = ultimos.get(resultado_id)
+                    ruta = os.path.join(upload_dir, archivo)
+                    try:
+                        st = os.stat(ruta)
+                    except FileNotFoundError:
+                        st = None
+                    if (previo and previo.get('tipo') == 'version' and previo['archivo'] == archivo and st
+                            and [st.st_size, st.st_mtime_ns] == previo.get('stat')):
+                        resumen['sin_cambios'] += 1
+                        continue
+
+                    leido = _leer_pdf(archivo, sha256_bd, upload_dir, backup_dir)
+                    if leido is None:
+                        resumen['faltantes'].append(archivo)
+                        continue
+                    contenido, sha256, st = leido
+                    if sha256_bd and sha256 != sha256_bd:
+                        resumen['no_coinciden'] += 1   # Se respalda lo que hay; `lab scrub` lo reporta
+
+                    if sha256 in blobs:
+                        resumen['deduplicados'] += 1
+                    else:
+                        blobs[sha256] = escritor.agregar(sha256, contenido)
+                        resumen['blobs_nuevos'] += 1
+                        resumen['bytes_originales'] += len(contenido)
+                        resumen['bytes_comprimidos'] += blobs[sha256][2]
+                    if previo and previo.get('tipo') == 'version' and previo['sha256'] == sha256 \
+                            and previo['archivo'] == archivo:
+                        # Mismo contenido (p. ej. solo cambió el mtime): no es una versión nueva
+                        resumen['sin_cambios'] += 1
+                        continue
+                    segmento, offset, largo = blobs[sha256]
+                    registro = {
+                        'tipo': 'version', 't': t, 'resultado_id': resultado_id, 'numero_orden': numero_orden,
+                        'archivo': archivo, 'fecha_creacion': fecha_creacion.isoformat() if fecha_creacion else None,
+                        'sha256': sha256, 'tamano': len(contenido), 'stat': [st.st_size, st.st_mtime_ns],
+                        'segmento': segmento, 'offset': offset, 'largo': largo,
+                    }
+                    registros.append(registro)
+                    ultimos[resultado_id] = registro
+                    resumen['versiones'] += 1
+                escritor.sincronizar()
+                _agregar_al_manifiesto(destino, registros)
+
+            eliminados = [{'tipo': 'eliminado', 't': t, 'resultado_id': resultado_id}
+                          for resultado_id, registro in ultimos.items()
+                          if resultado_id not in vistos and registro.get('tipo') == 'version']
+            _agregar_al_manifiesto(destino, eliminados)
+            resumen['eliminados'] = len(eliminados)
+        finally:
+            escritor.cerrar()
+        resumen['segmentos'] = escritor.escritos
+        resumen['segundos'] = round(time.perf_counter() - inicio, 1)
+        _agregar_al_manifiesto(destino, [{'tipo': 'corrida', 't': t,
+                                          **{k: v for k, v in resumen.items() if k != 'faltantes'},
+                                          'faltantes': len(resumen['faltantes'])}])
+    return resumen
+
+
+# ============ RESTAURAR ============
+
+def seleccionar(destino, momento=None, resultado_id=None, desde=None, hasta=None):
+    """
+    Versiones vigentes en `momento` (ISO; None = la última corrida) de un resultado
+    o de los resultados creados entre `desde` y `hasta` (fechas, inclusive).
+    """
+    ultimos, _ = leer_manifiesto(destino, momento)
+    elegidos = []
+    for registro in ultimos.values():
+        if registro['tipo'] != 'version':
+            continue
+        if resultado_id is not None and registro['resultado_id'] != resultado_id:
+            continue
+        if desde or hasta:
+            creado = (registro.get('fecha_creacion') or '')[:10]
+            if not creado or (desde and creado < desde.isoformat()) or (hasta and creado > hasta.isoformat()):
+                continue
+        elegidos.append(registro)
+    return elegidos
+
+
+def restaurar(destino, registros, salida):
+    """
+    Escribe los PDFs de `registros` en `salida` con su nombre original, verificando el
+    SHA-256. Lee cada segmento una sola vez, en orden de offset (solo los frames pedidos);
+    los que ya existen con el mismo hash no se tocan.
+
+    Returns:
+        dict: {'restaurados', 'iguales' (ya estaban con el mismo hash), 'errores': [...]}
+    """
+    os.makedirs(salida, exist_ok=True)
+    resumen = {'restaurados': 0, 'iguales': 0, 'errores': []}
+    por_segmento = {}
+    for registro in registros:
+        por_segmento.setdefault(registro['segmento'], []).append(registro)
+
+    for segmento, lista in sorted(por_segmento.items()):
+        with open(os.path.join(destino, SEGMENTOS, segmento), 'rb') as f:
+            for registro in sorted(lista, key=lambda r: r['offset']):
+                ruta = os.path.join(salida, os.path.basename(registro['archivo']))
+                if os.path.exists(ruta):
+                    with open(ruta, 'rb') as actual:
+                        if hashlib.file_digest(actual, 'sha256').hexdigest() == registro['sha256']:
+                            resumen['iguales'] += 1
+                            continue
+                try:
+                    f.seek(registro['offset'])
+                    miembro = _descomprimir(segmento, f.read(registro['largo']))
+                    with tarfile.open(fileobj=io.BytesIO(miembro)) as tar:
+                        contenido = tar.extractfile(tar.next()).read()
+                    if hashlib.sha256(contenido).hexdigest() != registro['sha256']:
+                        raise ValueError('el SHA-256 no coincide')
+                except Exception as e:
+                    resumen['errores'].append(f"{registro['archivo']}: {e}")
+                    continue
+                temporal = f'{ruta}.restaurando{os.getpid()}'
+                with open(temporal, 'wb') as salida_f:
+                    salida_f.write(contenido)
+                os.replace(temporal, ruta)
+                resumen['restaurados'] += 1
+    return resumen
+
+
+# ============ PROGRAMADO ============
+
+def segundos_hasta(hora, ahora=None):
+    """Segundos hasta la próxima vez que el reloj marque `hora` ('HH:MM')"""
+    ahora = ahora or datetime.now()
+    hh, mm = (int(x) for x in hora.split(':'))
+    proxima = ahora.replace(hour=hh, minute=mm, second=0, microsecond=0)
+    if proxima <= ahora:
+        proxima += timedelta(days=1)
+    return (proxima - ahora).total_seconds()
+
+
+def _ciclo(app):
+    config = app.config
+    while True:
+        time.sleep(segundos_hasta(config['RESPALDO_HORA']))
+        with app.app_context():
+            try:
+                r = crear_respaldo(config['RESPALDO_DESTINO'], config['RESPALDO_SEGMENTO_MB'],
+                                   config['RESPALDO_NIVEL_ZSTD'])
+                app.logger.info(f"Respaldo nocturno: {r['versiones']} versiones, {r['blobs_nuevos']} archivos "
+                                f"nuevos, {r['bytes_comprimidos'] / 1024 / 1024:.1f} MB en {r['segundos']}s")
+                if r['faltantes']:
+                    app.logger.warning(f"Respaldo nocturno: {len(r['faltantes'])} PDFs no encontrados")
+            except RespaldoOcupado:
+                pass  # Otro worker ya lo está haciendo
+            except Exception as e:
+                app.logger.error(f'Respaldo nocturno falló: {e}')
+            finally:
+                from app import db
+                db.session.remove()
+
+
+def init_app(app):
+    if not (app.config.get('RESPALDO_DESTINO') and app.config.get('RESPALDO_HORA')):
+        return
+
+    @app.before_request
+    def _iniciar_programador():
+        # Un hilo por worker (no en el master de gunicorn: no sobreviviría al fork)
+        if _programador['pid'] != os.getpid():
+            _programador['pid'] = os.getpid()
+            threading.Thread(target=_ciclo, args=(app,), name='respaldo', daemon=True).start()
+
+
+def parsear_fecha(texto):
+    return date.fromisoformat(texto) if texto else None
@@ -3,6 +3,17 @@ from flask_login import login_required, current_user
 from app import db
 from app.models import Paciente, Resultado, Prueba
 from app.utils import admin_required
+from app.replica import solo_lectura, primaria, leyo_de_replica, estado as estado_replica
+from app.salud import estado as estado_salud
+from app.circuito import abierto as circuito_abierto, estado as estado_circuito
+from app.imagenes import guardar_imagen_prueba, eliminar_imagen_prueba
+from app.catalogo import (snapshot_catalogo, invalidar_snapshot, documento_json,
+                          asignar_categoria, categorias_ordenadas, recontar_categorias)
+from app.compresion import respuesta_precomprimida
+from app.busqueda import buscar
+from app.descargas import EnlaceInvalido, firmar as firmar_descarga, verificar as verificar_descarga, sha256_archivo
+from app.pdfs import optimizar_en_segundo_plano
+from app import carrito
 from werkzeug.utils import secure_filename
 from datetime import datetime, timedelta
 from sqlalchemy import func, extract
@@ -33,25 +44,51 @@ def health_check():
     """
     Health check endpoint para Render
     - Verifica que la app está viva
-    - Verifica conexión a la base de datos
-    - Retorna 200 OK si todo está bien
+    - Estado de la base de datos según la última revisión en segundo plano (app/salud.py),
+      sin consultar la BD en cada probe
+    - Retorna 200 OK si todo está bien (o si la primera revisión aún no termina)
     """
-    try:
-        # Intentar hacer una query simple a la BD
-        db.session.execute(db.text('SELECT 1'))
-        return jsonify({
-            'status': 'healthy',
-            'database': 'connected',
-            'timestamp': datetime.now().isoformat()
-        }), 200
-    except Exception as e:
-        # Si falla la BD, aún responder pero con status unhealthy
-        return jsonify({
-            'status': 'unhealthy',
-            'database': 'disconnected',
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 503  # Service Unavailable
+    salud = estado_salud()
+    if salud['database'] is None:
+        status, codigo = 'starting', 200
+    elif salud['database'] and salud['vigente']:
+        status, codigo = 'healthy', 200
+    else:
+        status, codigo = 'unhealthy', 503  # Service Unavailable
+    return jsonify({
+        'status': status,
+        'database': {True: 'connected', False: 'disconnected', None: 'unknown'}[salud['database']],
+        'error': salud['error'],
+        'latencia_ms': salud['latencia_ms'],
+        'revisado': salud['revisado'],
+        'edad_segundos': salud['edad_segundos'],
+        'pool': salud['pool'],
+        'replica': estado_replica(),
+        'circuito': estado_circuito(),
+        'timestamp': datetime.now().isoformat()
+    }), codigo
+
+@main.route('/ready')
+def ready_check():
+    """Listo para recibir tráfico: BD conectada, revisión reciente y espacio en disco"""
+    salud = estado_salud()
+    motivos = []
+    if not salud['database']:
+        motivos.append('base de datos sin revisar' if salud['database'] is None else 'base de datos desconectada')
+    elif not salud['vigente']:
+        motivos.append('revisión de salud atrasada')
+    if circuito_abierto():
+        motivos.append('circuito de base de datos abierto')
+    if salud['disco'] is not None and not salud['disco_suficiente']:
+        motivos.append('poco espacio en disco')
+    return jsonify({
+        'ready': not motivos,
+        'motivos': motivos,
+        'revisado': salud['revisado'],
+        'edad_segundos': salud['edad_segundos'],
+        'pool': salud['pool'],
+        'disco': salud['disco'],
+    }), 503 if motivos else 200
 
 @main.route('/ping')
 def ping():
@@ -171,40 +208,127 @@ def index():
 
 @main.route('/portal-resultados')
 def portal_resultados():
-    return render_template('publico/portal_resultados.html')
+    # Con la base caída el portal se muestra igual, avisando que la consulta no funciona
+    return render_template('publico/portal_resultados.html', sin_base=circuito_abierto())
 
 @main.route('/catalogo-pruebas')
+@solo_lectura
 def catalogo_pruebas():
-    # Obtener todas las pruebas ordenadas por categoría y nombre
-    pruebas = Prueba.query.order_by(Prueba.categoria, Prueba.nombre).all()
-
-    # Organizar pruebas por categoría
-    pruebas_por_categoria = {}
-    for prueba in pruebas:
-        categoria = prueba.categoria or 'General'
-        if categoria not in pruebas_por_categoria:
-            pruebas_por_categoria[categoria] = []
-        pruebas_por_categoria[categoria].append(prueba)
+    # El HTML trae solo la categoría elegida (la primera por defecto);
+    # las demás se piden a /api/catalogo/<slug> al tocar su botón
+    snapshot = snapshot_catalogo()
+    seleccion = request.args.get('categoria')
+    if seleccion != 'todas' and seleccion not in snapshot['por_slug']:
+        seleccion = snapshot['categorias'][0]['slug'] if snapshot['categorias'] else 'todas'
 
     return render_template('publico/catalogo/lista_pruebas.html',
-                         pruebas=pruebas,
-                         pruebas_por_categoria=pruebas_por_categoria)
+                         categorias=snapshot['categorias'],
+                         total_pruebas=snapshot['total'],
+                         seleccion=seleccion,
+                         carrito_cantidad=carrito.resumen(snapshot)['cantidad'])
+
+# Los clientes revalidan siempre con el ETag: un 304 cuesta casi nada
+CACHE_API_CATALOGO = 'public, no-cache'
+
+@main.route('/api/catalogo/buscar')
+@solo_lectura
+def buscar_pruebas():
+    """Búsqueda sin acentos y con sinónimos sobre nombre, categoría y descripción"""
+    consulta = request.args.get('q', '').strip()[:100]
+    limite = max(1, min(request.args.get('limite', 30, type=int), 100))
+    resultados = buscar(snapshot_catalogo(), consulta, limite) if len(consulta) >= 2 else []
+    respuesta = jsonify({'q': consulta, 'total': len(resultados), 'resultados': resultados})
+    respuesta.headers['Cache-Control'] = 'public, max-age=60'
+    return respuesta
+
+@main.route('/api/catalogo')
+@main.route('/api/catalogo/<slug>')
+@solo_lectura
+def api_catalogo(slug=None):
+    """JSON compacto del catálogo completo o de una categoría (ETag fuerte + gzip/brotli)"""
+    documento = documento_json(snapshot_catalogo(), slug)
+    if documento is None:
+        return jsonify({'error': 'Categoría no encontrada'}), 404
+    contenido, variantes, etag = documento
+    return respuesta_precomprimida(contenido, variantes, etag, 'application/json', CACHE_API_CATALOGO)
+
+# ============ CARRITO DE COTIZACIÓN ============
+
+def _respuesta_carrito(ok=True):
+    """JSON para los botones del catálogo (fetch) o redirección para los formularios"""
+    if request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json':
+        datos = carrito.resumen(snapshot_catalogo())
+        return jsonify({'ok': ok, 'cantidad': datos['cantidad'], 'total': datos['total']}), (200 if ok else 400)
+    if not ok:
+        flash('No se pudo agregar la prueba a la cotización', 'warning')
+    return redirect(request.referrer or url_for('main.ver_carrito'))
+
+@main.route('/carrito')
+@solo_lectura
+def ver_carrito():
+    datos = carrito.resumen(snapshot_catalogo())
+    return render_template('publico/catalogo/carrito.html', carrito=datos['items'], **datos)
+
+@main.route('/carrito/agregar/<int:prueba_id>', methods=['POST'])
+def agregar_carrito(prueba_id):
+    cantidad = request.form.get('cantidad', 1, type=int)
+    return _respuesta_carrito(carrito.agregar(snapshot_catalogo(), prueba_id, cantidad))
+
+@main.route('/carrito/quitar/<int:prueba_id>', methods=['POST'])
+def eliminar_carrito(prueba_id):
+    carrito.quitar(prueba_id)
+    return _respuesta_carrito()
+
+@main.route('/carrito/vaciar', methods=['POST'])
+def vaciar_carrito():
+    carrito.vaciar()
+    return _respuesta_carrito()
+
+@main.route('/carrito/whatsapp')
+@solo_lectura
+def carrito_whatsapp():
+    """Toda la cotización en un solo mensaje de WhatsApp"""
+    datos = carrito.resumen(snapshot_catalogo())
+    if not datos['items']:
+        return redirect(url_for('main.ver_carrito'))
+    nombre = request.args.get('nombre', '').strip()[:80]
+    return redirect(carrito.url_whatsapp(datos, nombre))
+
+@main.route('/carrito/cotizacion')
+@solo_lectura
+def imprimir_cotizacion():
+    """Cotización lista para imprimir o guardar como PDF desde el navegador"""
+    datos = carrito.resumen(snapshot_catalogo())
+    if not datos['items']:
+        return redirect(url_for('main.ver_carrito'))
+    return render_template('publico/catalogo/cotizacion.html', carrito=datos['items'],
+                           fecha=carrito.fecha_cotizacion(), **datos)
 
 @main.route('/consultar-resultado', methods=['POST'])
+@solo_lectura
 def consultar_resultado():
     ci = request.form.get('ci')
     codigo = request.form.get('codigo')
 
     resultado = Resultado.query.filter_by(paciente_ci=ci, codigo_acceso=codigo).first()
+    if not resultado and leyo_de_replica():
+        # Recién subido: puede que la réplica todavía no lo tenga
+        with primaria():
+            resultado = Resultado.query.filter_by(paciente_ci=ci, codigo_acceso=codigo).first()
 
     if resultado:
-        return render_template('publico/ver_resultado.html', resultado=resultado)
+        enlace = None
+        if resultado.archivo_pdf:
+            token = firmar_descarga(resultado, os.path.join(UPLOAD_DIR, resultado.archivo_pdf))
+            enlace = url_for('main.descargar_resultado_firmado', token=token)
+        return render_template('publico/ver_resultado.html', resultado=resultado, enlace_descarga=enlace)
     else:
         flash('CI o código de acceso incorrecto', 'danger')
         return redirect(url_for('main.portal_resultados'))
 
 @main.route('/dashboard')
 @admin_required
+@solo_lectura
 def dashboard():
     # Estadísticas básicas
     total_pacientes = Paciente.query.count()
@@ -436,12 +560,16 @@ def admin_resultados():
                 paciente_ci=paciente.ci,
                 fecha_muestra=fecha_muestra,
                 archivo_pdf=filename_guardado,
+                archivo_sha256=sha256_archivo(filepath),
                 codigo_acceso=codigo_acceso
             )
 
             db.session.add(resultado)
             db.session.commit()
 
+            # Linealizar para la vista web en segundo plano (app/pdfs.py)
+            optimizar_en_segundo_plano(filename_guardado)
+
             # ============ ÉXITO COMPLETO ============
             print("=" * 80)
             print("✅ RESULTADO GUARDADO EXITOSAMENTE")
@@ -944,42 +1072,37 @@ def descargar_credenciales_word(resultado_id):
 def admin_pruebas():
     if request.method == 'POST':
         try:
-            # Manejar imagen si se subió
-            imagen_filename = None
+            # Manejar imagen si se subió (derivados WebP/AVIF se generan en segundo plano)
+            imagen_filename, imagen_lqip = None, None
             if 'imagen' in request.files:
                 imagen = request.files['imagen']
                 if imagen and imagen.filename:
-                    # Crear carpeta si no existe
-                    os.makedirs(PRUEBAS_UPLOAD_DIR, exist_ok=True)
-
-                    # Guardar imagen con nombre seguro
-                    from werkzeug.utils import secure_filename
-                    import time
-                    filename = secure_filename(imagen.filename)
-                    imagen_filename = f"{int(time.time())}_{filename}"
-                    imagen.save(os.path.join(PRUEBAS_UPLOAD_DIR, imagen_filename))
+                    imagen_filename, imagen_lqip = guardar_imagen_prueba(imagen)
 
             prueba = Prueba(
                 nombre=request.form['nombre'],
-                categoria=request.form.get('categoria'),
                 descripcion=request.form.get('descripcion'),
                 precio=float(request.form.get('precio', 0)),
-                imagen=imagen_filename
+                imagen=imagen_filename,
+                imagen_lqip=imagen_lqip
             )
+            asignar_categoria(prueba, request.form.get('categoria'))
             db.session.add(prueba)
+            recontar_categorias()
             db.session.commit()
+            invalidar_snapshot()
             flash('Prueba registrada exitosamente', 'success')
         except Exception as e:
+            db.session.rollback()
             flash(f'Error: {str(e)}', 'danger')
         return redirect(url_for('main.admin_pruebas'))
 
     pruebas = Prueba.query.order_by(Prueba.nombre).all()
 
-    # Obtener categorías únicas de la base de datos
-    categorias = db.session.query(Prueba.categoria).distinct().filter(Prueba.categoria.isnot(None)).order_by(Prueba.categoria).all()
-    categorias_list = [cat[0] for cat in categorias if cat[0]]
+    # Categorías con su total de pruebas (una sola lectura de la tabla 'categorias')
+    categorias = categorias_ordenadas()
 
-    return render_template('admin/pruebas.html', pruebas=pruebas, categorias=categorias_list)
+    return render_template('admin/pruebas.html', pruebas=pruebas, categorias=categorias)
 
 @main.route('/prueba/<int:prueba_id>')
 @admin_required
@@ -1000,30 +1123,26 @@ def editar_prueba(prueba_id):
     try:
         prueba = Prueba.query.get_or_404(prueba_id)
         prueba.nombre = request.form['nombre']
-        prueba.categoria = request.form.get('categoria')
+        asignar_categoria(prueba, request.form.get('categoria'))
         prueba.descripcion = request.form.get('descripcion')
         prueba.precio = float(request.form.get('precio', 0))
 
         # Manejar nueva imagen si se subió
+        imagen_anterior = None
         if 'imagen' in request.files:
             imagen = request.files['imagen']
             if imagen and imagen.filename:
-                # Eliminar imagen anterior si existe
-                if prueba.imagen:
-                    old_path = os.path.join(PRUEBAS_UPLOAD_DIR, prueba.imagen)
-                    if os.path.exists(old_path):
-                        os.remove(old_path)
-
-                # Guardar nueva imagen
-                from werkzeug.utils import secure_filename
-                import time
-                filename = secure_filename(imagen.filename)
-                imagen_filename = f"{int(time.time())}_{filename}"
-                os.makedirs(PRUEBAS_UPLOAD_DIR, exist_ok=True)
-                imagen.save(os.path.join(PRUEBAS_UPLOAD_DIR, imagen_filename))
-                prueba.imagen = imagen_filename
+                # Guardar nueva imagen (si el contenido ya existe se reutiliza el archivo)
+                imagen_anterior = prueba.imagen
+                prueba.imagen, prueba.imagen_lqip = guardar_imagen_prueba(imagen)
 
+        recontar_categorias()
         db.session.commit()
+        invalidar_snapshot()
+
+        # Eliminar imagen anterior y sus derivados si ninguna otra prueba la usa
+        if imagen_anterior and imagen_anterior != prueba.imagen:
+            eliminar_imagen_prueba(imagen_anterior, prueba.id)
         flash('Prueba actualizada exitosamente', 'success')
     except Exception as e:
         db.session.rollback()
@@ -1037,17 +1156,17 @@ def eliminar_prueba(prueba_id):
         prueba = Prueba.query.get_or_404(prueba_id)
         nombre_prueba = prueba.nombre
 
-        # Eliminar imagen si existe
+        # Eliminar imagen y sus derivados si ninguna otra prueba la usa
         if prueba.imagen:
             try:
-                imagen_path = os.path.join(PRUEBAS_UPLOAD_DIR, prueba.imagen)
-                if os.path.exists(imagen_path):
-                    os.remove(imagen_path)
+                eliminar_imagen_prueba(prueba.imagen, prueba.id)
             except Exception as e:
                 print(f"Error eliminando imagen {prueba.imagen}: {e}")
 
         db.session.delete(prueba)
+        recontar_categorias()
         db.session.commit()
+        invalidar_snapshot()
         flash(f'Prueba "{nombre_prueba}" eliminada exitosamente', 'success')
     except Exception as e:
         db.session.rollback()
@@ -1075,66 +1194,53 @@ def descargar(resultado_id):
 @main.route('/descargar-resultado-publico/<int:resultado_id>')
 def descargar_resultado_publico(resultado_id):
     """
-    Descarga pública de PDFs para pacientes
-    - Sin @admin_required para acceso público
-    - Siempre obtiene el archivo MÁS RECIENTE de la BD
-    - Headers anti-cache para evitar descargas viejas
+    Enlace antiguo por id (adivinable): ya no descarga nada. El paciente
+    vuelve al portal y obtiene un enlace firmado al consultar con CI + código.
     """
-    from flask import make_response
-
-    # LOGGING DETALLADO
-    print("=" * 80)
-    print("🔍 DESCARGA PÚBLICA DE PDF")
-    print(f"   Resultado ID: {resultado_id}")
-
-    resultado = Resultado.query.get_or_404(resultado_id)
+    flash('Por seguridad, consulta tu resultado con tu CI y código de acceso para descargarlo', 'info')
+    return redirect(url_for('main.portal_resultados'))
 
-    print(f"   Paciente: {resultado.paciente_nombre}")
-    print(f"   CI: {resultado.paciente_ci}")
-    print(f"   Archivo en BD: {resultado.archivo_pdf}")
-
-    if not resultado.archivo_pdf:
-        print("   ❌ ERROR: No hay archivo PDF en la BD")
-        flash('No hay archivo PDF disponible', 'warning')
+@main.route('/resultado/descargar/<token>')
+def descargar_resultado_firmado(token):
+    """
+    Descarga pública de PDFs para pacientes con enlace firmado (app/descargas.py)
+    - Sin @admin_required para acceso público
+    - Sin consultar la BD: id, archivo y hash vienen firmados en el token
+    - ETag = SHA-256 del archivo: el navegador revalida y recibe 304 si ya lo tiene
+    - Con ?ver=1 se abre en el visor del navegador; con el PDF linealizado (app/pdfs.py)
+      el visor pide por Range solo lo necesario y muestra la primera página enseguida
+    """
+    try:
+        datos = verificar_descarga(token)
+    except EnlaceInvalido as e:
+        print(f"⚠ Descarga pública rechazada: {e}")
+        if e.vencido:
+            flash('El enlace de descarga venció. Consulta tu resultado nuevamente', 'warning')
+        else:
+            flash('Enlace de descarga no válido', 'danger')
         return redirect(url_for('main.portal_resultados'))
 
-    # Construir ruta del archivo más reciente desde BD
-    pdf_path = os.path.join(UPLOAD_DIR, resultado.archivo_pdf)
-    print(f"   Ruta completa: {pdf_path}")
-    print(f"   Archivo existe? {os.path.exists(pdf_path)}")
-
-    # Verificar que existe
+    pdf_path = os.path.join(UPLOAD_DIR, datos['archivo'])
     if not os.path.exists(pdf_path):
         # Si no existe el principal, buscar en backup
-        backup_path = os.path.join(BACKUP_DIR, resultado.archivo_pdf)
-        print(f"   Buscando en backup: {backup_path}")
-        print(f"   Backup existe? {os.path.exists(backup_path)}")
-        if os.path.exists(backup_path):
-            pdf_path = backup_path
-            print("   ✓ Usando archivo desde backup")
-        else:
-            print("   ❌ ERROR: Archivo no encontrado ni en principal ni en backup")
-            flash(f'El archivo PDF no se encuentra disponible', 'danger')
+        pdf_path = os.path.join(BACKUP_DIR, datos['archivo'])
+        if not os.path.exists(pdf_path):
+            # Reemplazado, optimizado (app/pdfs.py) o eliminado después de emitir el enlace
+            print(f"❌ Descarga pública: archivo no encontrado ({datos['archivo']})")
+            flash('El archivo PDF no se encuentra disponible. Consulta tu resultado nuevamente', 'danger')
             return redirect(url_for('main.portal_resultados'))
 
-    # Nombre de descarga único basado en timestamp para romper cache
-    from datetime import datetime
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    download_name = f"Resultado_{resultado.numero_orden}_{timestamp}.pdf"
-
-    print(f"   Nombre descarga: {download_name}")
-    print("   ✅ ENVIANDO ARCHIVO AL PACIENTE")
-    print("=" * 80)
-
-    # Enviar archivo con headers anti-cache FUERTES
-    return send_file(
+    respuesta = send_file(
         pdf_path,
-        as_attachment=True,
-        download_name=download_name,
+        as_attachment=not request.args.get('ver'),
+        download_name=f"Resultado_{datos['numero_orden']}.pdf",
         mimetype='application/pdf',
-        max_age=0,  # No cache
-        last_modified=datetime.now()
+        etag=datos['sha256'] or True,
+        max_age=0,  # Siempre revalidar (con el ETag es un 304 sin cuerpo)
+        conditional=True  # If-None-Match y Range (206)
     )
+    respuesta.headers['Cache-Control'] = 'private, no-cache'
+    return respuesta
 
 @main.route('/resultado/eliminar/<int:resultado_id>', methods=['POST'])
 @admin_required
@@ -1226,8 +1332,11 @@ def reemplazar_pdf(resultado_id):
 
         # Actualizar registro en BD
         resultado.archivo_pdf = filename_nuevo
+        resultado.archivo_sha256 = sha256_archivo(filepath_nuevo)
         db.session.commit()
 
+        optimizar_en_segundo_plano(filename_nuevo)
+
         print("=" * 80)
         print("✅ PDF REEMPLAZADO EXITOSAMENTE")
         print(f"   Resultado ID: {resultado.id}")
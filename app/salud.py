@@ -0,0 +1,144 @@
+"""
+Estado de salud en segundo plano - Laboratorio Pérez
+- Un hilo por worker revisa cada SALUD_INTERVALO_SEGUNDOS la base de datos (SELECT 1
+  y latencia), el uso del pool de conexiones y el espacio libre en UPLOAD_DIR
+- /health y /ready responden con la última revisión sin tocar la base: un probe
+  no ocupa una conexión del pool ni espera connect_timeout si Supabase está lento
+- El hilo arranca en cada worker (post_worker_init de gunicorn o el primer request),
+  nunca en el master de gunicorn: no sobreviviría al fork
+"""
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import text
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_DIR = os.path.join(BASE_DIR, 'app', 'static', 'uploads')
+
+_estado = {
+    'revisado': None,           # datetime de la última revisión
+    'revisado_mono': None,      # time.monotonic() de la última revisión
+    'database': None,           # True / False (None: todavía no se revisó)
+    'latencia_ms': None,
+    'error': None,
+    'pool': None,
+    'disco': None,
+}
+_lock = threading.Lock()
+_hilo = {'pid': None, 'thread': None, 'detener': None}
+
+
+def estadisticas_pool(motor):
+    """Uso del pool del motor (None con NullPool, que no guarda conexiones)"""
+    pool = motor.pool
+    if not hasattr(pool, 'checkedout'):
+        return None
+    return {
+        'tamano': pool.size(),
+        'en_uso': pool.checkedout(),
+        'libres': pool.checkedin(),
+        'desborde': max(pool.overflow(), 0),
+    }
+
+
+def espacio_disco(ruta):
+    """Espacio libre donde se guardan los archivos subidos"""
+    os.makedirs(ruta, exist_ok=True)
+    uso = shutil.disk_usage(ruta)
+    return {
+        'libre_mb': round(uso.free / 1024 / 1024),
+        'total_mb': round(uso.total / 1024 / 1024),
+        'libre_pct': round(uso.free / uso.total * 100, 1) if uso.total else 0.0,
+    }
+
+
+def revisar(app):
+    """Una revisión completa; actualiza el estado compartido del proceso"""
+    from app import db
+
+    with app.app_context():
+        motor = db.engine
+        inicio = time.perf_counter()
+        try:
+            with motor.connect() as conexion:
+                conexion.execute(text('SELECT 1'))
+            database, error = True, None
+        except Exception as e:
+            database, error = False, str(e)
+        latencia = round((time.perf_counter() - inicio) * 1000, 1)
+
+        try:
+            disco = espacio_disco(UPLOAD_DIR)
+        except OSError as e:
+            disco = {'error': str(e)}
+
+        with _lock:
+            _estado.update({
+                'revisado': datetime.now(),
+                'revisado_mono': time.monotonic(),
+                'database': database,
+                'latencia_ms': latencia,
+                'error': error,
+                'pool': estadisticas_pool(motor),
+                'disco': disco,
+            })
+        if not database:
+            app.logger.warning(f'Salud: base de datos no disponible ({error})')
+
+
+def _ciclo(app, detener):
+    intervalo = app.config['SALUD_INTERVALO_SEGUNDOS']
+    while not detener.is_set():
+        try:
+            revisar(app)
+        except Exception as e:  # El hilo nunca debe morir: /health lo vería como detenido
+            app.logger.error(f'Salud: error en la revisión: {e}')
+        detener.wait(intervalo)
+
+
+def iniciar(app):
+    """Arranca el hilo de revisión en este proceso (una vez por worker)"""
+    with _lock:
+        hilo = _hilo['thread']
+        if _hilo['pid'] == os.getpid() and hilo is not None and hilo.is_alive():
+            return
+        detener = threading.Event()
+        hilo = threading.Thread(target=_ciclo, args=(app, detener), name='salud', daemon=True)
+        _hilo.update({'pid': os.getpid(), 'thread': hilo, 'detener': detener})
+    hilo.start()
+
+
+def detener():
+    if _hilo['detener'] is not None:
+        _hilo['detener'].set()
+
+
+def estado():
+    """
+    Última revisión para /health y /ready. 'vigente' es False si la revisión tiene
+    más de tres intervalos (el hilo se detuvo o la revisión está colgada).
+    """
+    config = current_app.config
+    with _lock:
+        actual = dict(_estado)
+    mono = actual.pop('revisado_mono')
+    edad = None if mono is None else time.monotonic() - mono
+    disco = actual['disco'] or {}
+    return {
+        **actual,
+        'revisado': actual['revisado'].isoformat() if actual['revisado'] else None,
+        'edad_segundos': round(edad, 1) if edad is not None else None,
+        'vigente': edad is not None and edad <= 3 * config['SALUD_INTERVALO_SEGUNDOS'],
+        'disco_suficiente': disco.get('libre_mb', 0) >= config['SALUD_DISCO_MIN_MB'],
+    }
+
+
+def init_app(app):
+    @app.before_request
+    def _asegurar_hilo():
+        # Con el servidor de desarrollo o si gunicorn no llamó a iniciar()
+        if _hilo['pid'] != os.getpid():
+            iniciar(app)
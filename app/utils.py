@@ -1,9 +1,23 @@
 """
 Utilidades de seguridad - Laboratorio Pérez
 """
-from functools import wraps
-from flask import flash, redirect, url_for
+import threading
+import time
+from collections import deque
+from functools import lru_cache, wraps
+from flask import flash, redirect, url_for, current_app
 from flask_login import current_user
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+    _argon2 = PasswordHasher()
+except ImportError:  # argon2-cffi es opcional
+    _argon2 = None
+
+# Método usado si no hay app activa o si se pidió argon2 sin tener argon2-cffi
+METODO_HASH_POR_DEFECTO = 'scrypt:32768:8:1'
 
 
 def admin_required(f):
@@ -21,3 +35,128 @@ def admin_required(f):
             return redirect(url_for('main.index'))
         return f(*args, **kwargs)
     return decorated_function
+
+
+# ============ HASH DE CONTRASEÑAS ============
+
+def metodo_hash_configurado():
+    """Devuelve el método de hash configurado (PASSWORD_HASH_METHOD)"""
+    try:
+        metodo = current_app.config.get('PASSWORD_HASH_METHOD') or METODO_HASH_POR_DEFECTO
+    except RuntimeError:  # Fuera de un contexto de aplicación
+        metodo = METODO_HASH_POR_DEFECTO
+    if metodo.startswith('argon2') and _argon2 is None:
+        return METODO_HASH_POR_DEFECTO
+    return metodo
+
+
+def hashear_password(password):
+    """Genera el hash de una contraseña con el método configurado"""
+    metodo = metodo_hash_configurado()
+    if metodo.startswith('argon2'):
+        return _argon2.hash(password)
+    return generate_password_hash(password, method=metodo)
+
+
+def verificar_password(password_hash, password):
+    """Verifica una contraseña contra un hash de Werkzeug o de argon2"""
+    if password_hash.startswith('$argon2'):
+        if _argon2 is None:
+            return False
+        try:
+            return _argon2.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(password_hash, password)
+
+
+def necesita_rehash(password_hash):
+    """
+    Indica si un hash fue generado con un algoritmo o costo distinto al configurado.
+    Se usa al iniciar sesión para actualizar hashes antiguos (ej. pbkdf2) de forma transparente.
+    """
+    metodo = metodo_hash_configurado()
+    if metodo.startswith('argon2'):
+        return not password_hash.startswith('$argon2') or _argon2.check_needs_rehash(password_hash)
+    return password_hash.split('$', 1)[0] != _prefijo_hash(metodo)
+
+
+@lru_cache(maxsize=8)
+def _prefijo_hash(metodo):
+    """
+    Prefijo que Werkzeug guarda para `metodo`, con los parámetros completos
+    ('scrypt' → 'scrypt:32768:8:1', 'pbkdf2:sha256' → 'pbkdf2:sha256:600000').
+    Se calcula un hash de prueba una sola vez por método.
+    """
+    return generate_password_hash('x', method=metodo).split('$', 1)[0]
+
+
+# ============ LIMITADOR DE INTENTOS DE LOGIN ============
+
+class LimitadorIntentos:
+    """
+    Cuenta los intentos fallidos de login por clave (usuario, IP) en una ventana deslizante.
+
+    bloqueado() rechaza las claves que superaron el límite; se usa solo con la IP, porque
+    bloquear por usuario dejaría a cualquiera sin acceso a la cuenta del administrador.
+    retraso() da una espera creciente para las claves de usuario. La verificación se hace
+    ANTES de calcular el hash, así una ráfaga de intentos no deja a todos los workers
+    ocupados con scrypt/pbkdf2. El estado es por proceso: con N workers el límite
+    efectivo puede llegar a N veces el configurado.
+    """
+
+    def __init__(self, max_intentos=5, ventana=300):
+        self.max_intentos = max_intentos
+        self.ventana = ventana
+        self._fallos = {}
+        self._lock = threading.Lock()
+        self._ultima_limpieza = time.monotonic()
+
+    def _vigentes(self, clave, ahora):
+        fallos = self._fallos.get(clave)
+        if fallos is None:
+            return None
+        while fallos and ahora - fallos[0] > self.ventana:
+            fallos.popleft()
+        if not fallos:
+            del self._fallos[clave]
+            return None
+        return fallos
+
+    def _limpiar(self, ahora):
+        """Descarta claves expiradas para que la memoria no crezca sin límite"""
+        if ahora - self._ultima_limpieza < self.ventana:
+            return
+        for clave in list(self._fallos):
+            self._vigentes(clave, ahora)
+        self._ultima_limpieza = ahora
+
+    def bloqueado(self, *claves):
+        """Retorna los segundos de espera si alguna clave superó el límite, o 0"""
+        ahora = time.monotonic()
+        espera = 0
+        with self._lock:
+            self._limpiar(ahora)
+            for clave in claves:
+                fallos = self._vigentes(clave, ahora)
+                if fallos and len(fallos) >= self.max_intentos:
+                    espera = max(espera, self.ventana - (ahora - fallos[0]))
+        return int(espera) + 1 if espera else 0
+
+    def retraso(self, clave, maximo):
+        """Segundos a esperar antes de verificar: 0.25, 0.5, 1... por fallo reciente, hasta `maximo`"""
+        with self._lock:
+            fallos = self._vigentes(clave, time.monotonic())
+        return min(maximo, 0.25 * 2 ** (len(fallos) - 1)) if fallos else 0
+
+    def registrar_fallo(self, *claves):
+        ahora = time.monotonic()
+        with self._lock:
+            for clave in claves:
+                fallos = self._fallos.setdefault(clave, deque(maxlen=self.max_intentos))
+                fallos.append(ahora)
+
+    def reiniciar(self, *claves):
+        with self._lock:
+            for clave in claves:
+                self._fallos.pop(clave, None)
@@ -0,0 +1,167 @@
+"""
+Librerías externas servidas desde nuestro dominio - Laboratorio Pérez
+- Descarga Bootstrap y las librerías del dashboard a app/static/vendor
+- Escanea templates y JS buscando los iconos usados (fa-*, bi-*)
+- Genera iconos.css solo con esos iconos (SVG como máscara CSS, sin webfonts)
+- Mientras no se ejecute `flask lab vendor`, asset_url() usa los CDN de siempre
+"""
+import json
+import os
+import re
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+FONT_AWESOME = '6.4.0'
+BOOTSTRAP_ICONS = '1.11.3'
+
+# Nombre en app/static -> URL del CDN (también es el respaldo si no se vendorizó)
+CDN = {
+    'vendor/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/chart.umd.min.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js',
+    'vendor/html2canvas.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/html2canvas/1.4.1/html2canvas.min.js',
+    'vendor/jspdf.umd.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/jspdf/2.5.1/jspdf.umd.min.js',
+    'vendor/xlsx.full.min.js': 'https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js',
+    # Sin vendorizar se usa Font Awesome completo: mismas clases, mismo resultado
+    'vendor/iconos.css': f'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/{FONT_AWESOME}/css/all.min.css',
+}
+
+FA_METADATA = f'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@{FONT_AWESOME}/metadata/icon-families.json'
+BI_SVG = f'https://cdn.jsdelivr.net/npm/bootstrap-icons@{BOOTSTRAP_ICONS}/icons/{{}}.svg'
+
+# Clases fa-* que son modificadores y no iconos
+MODIFICADORES_FA = {
+    'fa-xs', 'fa-sm', 'fa-lg', 'fa-xl', 'fa-2xl', 'fa-fw', 'fa-spin', 'fa-pulse', 'fa-solid',
+    'fa-regular', 'fa-brands', 'fa-1x', 'fa-2x', 'fa-3x', 'fa-4x', 'fa-5x', 'fa-6x', 'fa-7x',
+    'fa-8x', 'fa-9x', 'fa-10x',
+}
+ESTILOS_FA = {'fas': 'solid', 'fa-solid': 'solid', 'far': 'regular', 'fa-regular': 'regular',
+              'fab': 'brands', 'fa-brands': 'brands', 'fa': 'solid'}
+
+ICONOS_BASE = """\
+.fa,.fas,.far,.fab,.fa-solid,.fa-regular,.fa-brands,.bi{display:inline-block;width:1em;height:1em;\
+vertical-align:-.125em;background-color:currentColor;-webkit-mask:var(--icono) no-repeat center/contain;\
+mask:var(--icono) no-repeat center/contain}
+.fa-fw{width:1.25em}.fa-xs{font-size:.75em}.fa-sm{font-size:.875em}.fa-lg{font-size:1.25em;vertical-align:-.2em}
+.fa-xl{font-size:1.5em}.fa-2xl{font-size:2em}.fa-1x{font-size:1em}.fa-2x{font-size:2em}.fa-3x{font-size:3em}
+.fa-4x{font-size:4em}.fa-5x{font-size:5em}.fa-6x{font-size:6em}.fa-7x{font-size:7em}.fa-8x{font-size:8em}
+.fa-9x{font-size:9em}.fa-10x{font-size:10em}
+.fa-spin{animation:fa-spin 2s linear infinite}.fa-pulse{animation:fa-spin 1s steps(8) infinite}
+@keyframes fa-spin{0%{transform:rotate(0)}100%{transform:rotate(360deg)}}
+"""
+
+_SEGUROS_DATA_URI = " /=:;,.-_'"
+_PATRON_CLASES = re.compile(r'class(?:Name)?\s*=\s*["\']([^"\']*)["\']|classList\.add\(([^)]*)\)')
+
+
+def escanear_iconos(rutas):
+    """
+    Busca los iconos usados en los templates y JS.
+
+    Returns:
+        tuple: (set de (estilo, icono) de Font Awesome, set de iconos bi-*)
+    """
+    fa, bi = set(), set()
+    for ruta in rutas:
+        for raiz, _, archivos in os.walk(ruta):
+            for archivo in archivos:
+                if not archivo.endswith(('.html', '.js')):
+                    continue
+                with open(os.path.join(raiz, archivo), encoding='utf-8-sig') as f:
+                    contenido = f.read()
+                for m in _PATRON_CLASES.finditer(contenido):
+                    clases = re.findall(r'[\w-]+', m.group(1) or m.group(2))
+                    estilo = next((ESTILOS_FA[c] for c in clases if c in ESTILOS_FA), 'solid')
+                    for clase in clases:
+                        if clase.startswith('fa-') and clase not in MODIFICADORES_FA:
+                            fa.add((estilo, clase[3:]))
+                        elif clase.startswith('bi-'):
+                            bi.add(clase[3:])
+    return fa, bi
+
+
+def _descargar(url):
+    with urllib.request.urlopen(url, timeout=30) as respuesta:
+        return respuesta.read()
+
+
+def _descargar_o_none(url):
+    try:
+        return _descargar(url)
+    except Exception:
+        return None
+
+
+def _mascara(svg):
+    """SVG como data URI para usar en mask-image"""
+    svg = re.sub(r'\s+', ' ', svg.decode('utf-8') if isinstance(svg, bytes) else svg).strip()
+    svg = svg.replace('"', "'")
+    return f'url("data:image/svg+xml,{quote(svg, safe=_SEGUROS_DATA_URI)}")'
+
+
+def _regla(selector, svg):
+    return f'{selector}{{--icono:{_mascara(svg)}}}'
+
+
+def generar_iconos_css(fa, bi):
+    """
+    Genera el CSS con solo los iconos usados.
+
+    Returns:
+        tuple: (css, lista de iconos no encontrados)
+    """
+    metadata = json.loads(_descargar(FA_METADATA))
+    alias = {}
+    for nombre, datos in metadata.items():
+        alias[nombre] = nombre
+        for otro in (datos.get('aliases') or {}).get('names', []):
+            alias.setdefault(otro, nombre)
+
+    reglas, faltantes = [], []
+    for estilo, icono in sorted(fa):
+        canonico = alias.get(icono)
+        svgs = metadata[canonico]['svgs'].get('classic', {}) if canonico else {}
+        svg = svgs.get(estilo) or next(iter(svgs.values()), None)
+        if svg is None:
+            faltantes.append(f'fa-{icono}')
+            continue
+        # El estilo solo se agrega al selector si no es el predeterminado (solid)
+        prefijo = '' if estilo == 'solid' else {'regular': '.far', 'brands': '.fab'}[estilo]
+        reglas.append(_regla(f'{prefijo}.fa-{icono}', svg['raw']))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        descargas = dict(zip(sorted(bi), pool.map(lambda n: _descargar_o_none(BI_SVG.format(n)), sorted(bi))))
+    for icono, svg in descargas.items():
+        if svg is None:
+            faltantes.append(f'bi-{icono}')
+        else:
+            reglas.append(_regla(f'.bi-{icono}', svg))
+
+    return ICONOS_BASE + '\n'.join(reglas) + '\n', faltantes
+
+
+def vendorizar(static_folder, template_folder):
+    """
+    Descarga las librerías y genera iconos.css en app/static/vendor.
+
+    Returns:
+        tuple: (dict nombre -> bytes escritos, lista de iconos no encontrados)
+    """
+    vendor_dir = os.path.join(static_folder, 'vendor')
+    os.makedirs(vendor_dir, exist_ok=True)
+
+    nombres = [n for n in CDN if n != 'vendor/iconos.css']
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        contenidos = dict(zip(nombres, pool.map(lambda n: _descargar(CDN[n]), nombres)))
+
+    fa, bi = escanear_iconos([template_folder, os.path.join(static_folder, 'js')])
+    iconos_css, faltantes = generar_iconos_css(fa, bi)
+    contenidos['vendor/iconos.css'] = iconos_css.encode('utf-8')
+
+    escritos = {}
+    for nombre, contenido in contenidos.items():
+        with open(os.path.join(static_folder, nombre), 'wb') as f:
+            f.write(contenido)
+        escritos[nombre] = len(contenido)
+    return escritos, faltantes
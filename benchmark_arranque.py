@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque - Laboratorio Pérez
+- Mide cuánto tarda create_app y la primera visita a cada página grande en un
+  worker recién iniciado (lo que paga el primer visitante después de un deploy)
+- Compara: sin cache de plantillas, con la cache de bytecode ya llena y con
+  PRECOMPILAR_PLANTILLAS (la compilación pasa al arranque)
+- Cada medición corre en un proceso nuevo; usa una base SQLite temporal, no
+  necesita Supabase
+
+Uso: python benchmark_arranque.py [rondas]
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PAGINAS = [
+    '/',
+    '/catalogo-pruebas',
+    '/auth/login',
+    '/dashboard',
+    '/pruebas',
+    '/resultados',
+    '/pacientes',
+]
+
+ESCENARIOS = [
+    # (título, cache llena de antemano, precompilar al arrancar)
+    ('Sin cache (deploy nuevo, compilación perezosa)', False, False),
+    ('Sin cache + precompilar al arrancar', False, True),
+    ('Cache de bytecode llena', True, False),
+    ('Cache de bytecode llena + precompilar', True, True),
+]
+
+
+def medir():
+    """Se ejecuta en el proceso hijo: imprime los tiempos en JSON"""
+    inicio = time.perf_counter()
+    from app import create_app
+    from app.models import Usuario
+
+    app = create_app()
+    arranque = (time.perf_counter() - inicio) * 1000
+
+    with app.app_context():
+        admin_id = Usuario.query.filter_by(username='admin').first().id
+    cliente = app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['_user_id'] = str(admin_id)
+        sesion['_fresh'] = True
+
+    primeras, segundas = {}, {}
+    for pagina in PAGINAS:
+        for tiempos in (primeras, segundas):
+            t = time.perf_counter()
+            respuesta = cliente.get(pagina)
+            tiempos[pagina] = (time.perf_counter() - t) * 1000
+            if respuesta.status_code != 200:
+                raise SystemExit(f'{pagina} respondió {respuesta.status_code}')
+    print(json.dumps({'arranque': arranque, 'primeras': primeras, 'segundas': segundas}))
+
+
+def preparar_base():
+    """Crea la base SQLite temporal con un usuario admin"""
+    from app import create_app, db
+    from app.models import Usuario
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        admin = Usuario(username='admin', is_admin=True)
+        admin.password_hash = 'sin-login'  # La sesión se abre directamente, sin verificar contraseña
+        db.session.add(admin)
+        db.session.commit()
+
+
+def ejecutar(entorno):
+    salida = subprocess.run([sys.executable, __file__, '--medir'], env=entorno, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def main():
+    rondas = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    temporal = tempfile.mkdtemp(prefix='benchmark_arranque_')
+    base = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(temporal, 'lab.db')}",
+                JINJA_CACHE_DIR=os.path.join(temporal, 'jinja_base'), PRECOMPILAR_PLANTILLAS='false')
+    os.environ.update(base)
+
+    print("\n" + "=" * 70)
+    print("🚀 BENCHMARK DE ARRANQUE - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Rondas por escenario: {rondas} (mediana) | Páginas: {len(PAGINAS)}\n")
+
+    try:
+        preparar_base()
+        resultados = []
+        for titulo, cache_llena, precompilar in ESCENARIOS:
+            mediciones = []
+            for ronda in range(rondas):
+                cache = os.path.join(temporal, f'jinja_{len(resultados)}_{ronda}')
+                if cache_llena:
+                    ejecutar(dict(base, JINJA_CACHE_DIR=cache))  # Un worker anterior ya la llenó
+                mediciones.append(ejecutar(dict(base, JINJA_CACHE_DIR=cache,
+                                                PRECOMPILAR_PLANTILLAS=str(precompilar).lower())))
+            resultados.append((titulo, mediciones))
+
+        for titulo, mediciones in resultados:
+            arranque = statistics.median(m['arranque'] for m in mediciones)
+            primeras = {p: statistics.median(m['primeras'][p] for m in mediciones) for p in PAGINAS}
+            segundas = {p: statistics.median(m['segundas'][p] for m in mediciones) for p in PAGINAS}
+            print(f"   {titulo}")
+            print(f"      create_app: {arranque:7.1f} ms | primeras visitas: {sum(primeras.values()):7.1f} ms"
+                  f" | ya en caliente: {sum(segundas.values()):6.1f} ms")
+            for pagina in PAGINAS:
+                print(f"         {pagina:<22} 1ª {primeras[pagina]:7.1f} ms   2ª {segundas[pagina]:6.1f} ms")
+            print()
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+    print("=" * 70 + "\n")
+
+
+if __name__ == '__main__':
+    if '--medir' in sys.argv:
+        medir()
+    else:
+        main()
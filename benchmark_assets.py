@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los paquetes CSS por página (app/assets.py) - Laboratorio Pérez
+- Renderiza cada página con el cliente de pruebas sobre una base SQLite temporal
+  (misma preparación que benchmark_compresion.py, no necesita Supabase)
+- "Antes": el mismo HTML con cada paquete propio (PAQUETES) vuelto a poner en línea
+  como <style> con el CSS fuente, que es como estaban las plantillas antes de los paquetes
+- "Ahora": el HTML servido, más los paquetes que enlaza en la primera visita
+  (en las siguientes salen de la cache del navegador)
+- Tamaños sin comprimir y con brotli (o gzip si brotli no está instalado)
+
+Uso: python benchmark_assets.py
+"""
+
+import gzip
+import os
+import re
+import shutil
+import tempfile
+
+from benchmark_compresion import preparar
+
+PAGINAS = [
+    ('admin/dashboard', 'GET', '/dashboard', None),
+    ('admin/pacientes', 'GET', '/pacientes', None),
+    ('admin/pruebas', 'GET', '/pruebas', None),
+    ('admin/resultados', 'GET', '/resultados', None),
+    ('catalogo/lista_pruebas', 'GET', '/catalogo-pruebas', None),
+    ('catalogo/carrito', 'GET', '/carrito', None),
+    ('ver_resultado', 'POST', '/consultar-resultado', {'ci': '1234567', 'codigo': 'BENCH1'}),
+]
+
+ENLACE = re.compile(r'<link rel="stylesheet" href="/assets/([^"]+)">')
+
+
+def main():
+    temporal = tempfile.mkdtemp(prefix='benchmark_assets_')
+    try:
+        cliente = preparar(temporal)
+        app = cliente.application
+
+        from app import db
+        from app.assets import PAQUETES, brotli, cargar_manifiesto
+        from app.models import Resultado
+
+        with app.app_context():
+            db.session.add(Resultado(numero_orden='BENCH-1', paciente_nombre='Paciente Benchmark',
+                                     paciente_ci='1234567', codigo_acceso='BENCH1'))
+            db.session.commit()
+            paquetes = {publicado: nombre for nombre, publicado in cargar_manifiesto(app).items()
+                        if nombre in PAQUETES}
+
+        if brotli is not None:
+            titulo, encoding, comprimir = 'Brotli', 'br', lambda datos: len(brotli.compress(datos, quality=11))
+        else:
+            titulo, encoding, comprimir = 'Gzip', 'gzip', lambda datos: len(gzip.compress(datos, compresslevel=9))
+
+        def fuente(nombre):
+            texto = ''
+            for ruta in PAQUETES[nombre]:
+                with open(os.path.join(app.static_folder, ruta), encoding='utf-8') as f:
+                    texto += f.read() + '\n'
+            return texto
+
+        def en_linea(coincidencia):
+            publicado = coincidencia.group(1)
+            if publicado not in paquetes:
+                return coincidencia.group(0)   # Librerías vendor: ya eran archivos externos
+            return f'<style>\n{fuente(paquetes[publicado])}</style>'
+
+        print("\n" + "=" * 80)
+        print("📦 BENCHMARK DE PAQUETES CSS POR PÁGINA - LABORATORIO PÉREZ")
+        print("=" * 80)
+        print(f"   HTML sin comprimir y con {titulo.lower()}; CSS propio enlazado, con {titulo.lower()}\n")
+        print(f"   {'Página':<24}{'HTML antes':>12}{'ahora':>10}{titulo + ' antes':>14}{'ahora':>10}"
+              f"{'CSS 1ª visita':>15}")
+
+        totales = [0, 0, 0, 0, 0]
+        for pagina, metodo, ruta, datos in PAGINAS:
+            respuesta = cliente.open(ruta, method=metodo, data=datos, headers={'Accept-Encoding': 'identity'})
+            if respuesta.status_code != 200:
+                raise SystemExit(f'{ruta} respondió {respuesta.status_code}')
+            ahora = respuesta.get_data(as_text=True)
+            antes = ENLACE.sub(en_linea, ahora)
+
+            css = 0
+            for publicado in ENLACE.findall(ahora):
+                if publicado in paquetes:
+                    enlazado = cliente.get(f'/assets/{publicado}', headers={'Accept-Encoding': encoding})
+                    css += len(enlazado.get_data())
+                    enlazado.close()
+
+            fila = [len(antes.encode('utf-8')), len(ahora.encode('utf-8')),
+                    comprimir(antes.encode('utf-8')), comprimir(ahora.encode('utf-8')), css]
+            totales = [t + n for t, n in zip(totales, fila)]
+            print(f"   {pagina:<24}{fila[0] / 1024:9.1f} KB{fila[1] / 1024:7.1f} KB"
+                  f"{fila[2] / 1024:11.1f} KB{fila[3] / 1024:7.1f} KB{fila[4] / 1024:12.1f} KB")
+
+        print(f"\n   {'Total':<24}{totales[0] / 1024:9.1f} KB{totales[1] / 1024:7.1f} KB"
+              f"{totales[2] / 1024:11.1f} KB{totales[3] / 1024:7.1f} KB{totales[4] / 1024:12.1f} KB")
+        print("\n   El CSS se descarga una vez; en las visitas siguientes solo viaja el HTML")
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+    print("=" * 80 + "\n")
+
+
+if __name__ == '__main__':
+    main()
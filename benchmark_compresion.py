@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de compresión - Laboratorio Pérez
+- Bytes enviados por ruta sin comprimir, con gzip y con brotli
+- Tiempo de cada request (incluye la compresión al vuelo)
+- Usa una base SQLite temporal con el catálogo de app/data/catalogo.json,
+  no necesita Supabase
+
+Uso: python benchmark_compresion.py [repeticiones]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+RUTAS = [
+    '/',
+    '/catalogo-pruebas',
+    '/catalogo-pruebas?categoria=todas',
+    '/api/catalogo',
+    '/api/catalogo/buscar?q=glucosa',
+    '/auth/login',
+    '/dashboard',
+    '/pruebas',
+    '/resultados',
+    '/pacientes',
+    '/static/css/laboratorio_perez.css',
+    '/static/js/admin/dashboard.js',
+]
+
+ENCODINGS = [('identity', 'Sin comprimir'), ('gzip', 'Gzip'), ('br', 'Brotli')]
+
+
+def preparar(temporal):
+    """App sobre SQLite con el catálogo cargado y un cliente con sesión de admin"""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(temporal, 'lab.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(temporal, 'jinja')
+
+    from app import create_app, db
+    from app.catalogo import aplicar_diferencias, calcular_diferencias, cargar_catalogo
+    from app.models import Usuario
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        catalogo = cargar_catalogo()
+        aplicar_diferencias(catalogo, calcular_diferencias(catalogo))
+        admin = Usuario(username='admin', is_admin=True)
+        admin.password_hash = 'sin-login'  # La sesión se abre directamente, sin verificar contraseña
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+
+    cliente = app.test_client()
+    with cliente.session_transaction() as sesion:
+        sesion['_user_id'] = str(admin_id)
+        sesion['_fresh'] = True
+    return cliente
+
+
+def medir(cliente, ruta, encoding, repeticiones):
+    """(bytes enviados, Content-Encoding, mediana en ms)"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        respuesta = cliente.get(ruta, headers={'Accept-Encoding': encoding})
+        cuerpo = respuesta.get_data()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        respuesta.close()
+    if respuesta.status_code != 200:
+        raise SystemExit(f'{ruta} respondió {respuesta.status_code}')
+    return len(cuerpo), respuesta.headers.get('Content-Encoding', '-'), statistics.median(tiempos)
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    temporal = tempfile.mkdtemp(prefix='benchmark_compresion_')
+
+    print("\n" + "=" * 70)
+    print("🗜️  BENCHMARK DE COMPRESIÓN - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Repeticiones por medición: {repeticiones} (mediana)\n")
+
+    try:
+        cliente = preparar(temporal)
+        totales = {encoding: 0 for encoding, _ in ENCODINGS}
+        for ruta in RUTAS:
+            medido = {encoding: medir(cliente, ruta, encoding, repeticiones) for encoding, _ in ENCODINGS}
+            base = medido['identity'][0]
+            print(f"   {ruta}")
+            for encoding, titulo in ENCODINGS:
+                tam, enviado, ms = medido[encoding]
+                totales[encoding] += tam
+                print(f"      {titulo:<14} {tam / 1024:8.1f} KB  ({tam / base:6.1%})  {ms:6.1f} ms"
+                      f"  Content-Encoding: {enviado}")
+        print("\n   Total de las rutas:")
+        for encoding, titulo in ENCODINGS:
+            print(f"      {titulo:<14} {totales[encoding] / 1024:8.1f} KB")
+        if medido['br'][1] == '-':
+            print("\n   ⚠ Los estáticos no tienen .gz/.br: ejecuta flask --app run lab assets")
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+    print("=" * 70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Prueba de saturación de conexiones - Laboratorio Pérez
+- Simula N workers de gunicorn (procesos) con H hilos cada uno haciendo consultas
+  sin pausa, con las opciones de motor de cada DB_POOL_MODE (directo y pgbouncer)
+- Cuenta las conexiones abiertas a la vez (máximo por worker y suma) y los
+  timeouts esperando el pool; en PostgreSQL también las que ve el servidor
+  (pg_stat_activity filtrado por application_name)
+- Falla (código 1) si el modo directo supera DB_MAX_CONEXIONES
+- Usa DATABASE_URL si está definida; si no, una base SQLite temporal
+
+Uso: python benchmark_conexiones.py [workers] [hilos_por_worker] [segundos]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from config import Config, opciones_motor
+
+CONSULTA_PG = "SELECT pg_sleep(0.02)"
+PAUSA_SQLITE = 0.02  # Segundos con la conexión tomada en cada consulta (simula una consulta real)
+
+
+def worker(url, modo, presupuesto, workers, hilos, segundos):
+    """Un 'worker de gunicorn': su propio motor y `hilos` hilos consultando sin pausa"""
+    opciones = opciones_motor(url, modo, presupuesto, workers, Config.DB_PGBOUNCER_POOL,
+                              Config.DB_APPLICATION_NAME)
+    if 'pool_size' in opciones:
+        opciones['pool_timeout'] = 5  # Que la espera por el pool se vea como timeout en la prueba
+    motor = create_engine(url, **opciones)
+    abiertas = {'actual': 0, 'maximo': 0}
+    lock = threading.Lock()
+
+    @event.listens_for(motor, 'connect')
+    def _abrir(*args):
+        with lock:
+            abiertas['actual'] += 1
+            abiertas['maximo'] = max(abiertas['maximo'], abiertas['actual'])
+
+    @event.listens_for(motor.pool, 'close')
+    def _cerrar(*args):
+        with lock:
+            abiertas['actual'] -= 1
+
+    contadores = {'consultas': 0, 'timeouts': 0}
+
+    def hilo():
+        fin = time.monotonic() + segundos
+        while time.monotonic() < fin:
+            try:
+                with motor.connect() as conexion:
+                    if motor.dialect.name == 'postgresql':
+                        conexion.execute(text(CONSULTA_PG))
+                    else:
+                        conexion.execute(text('SELECT 1'))
+                        time.sleep(PAUSA_SQLITE)
+                with lock:
+                    contadores['consultas'] += 1
+            except PoolTimeout:
+                with lock:
+                    contadores['timeouts'] += 1
+
+    hilos_activos = [threading.Thread(target=hilo) for _ in range(hilos)]
+    for h in hilos_activos:
+        h.start()
+    for h in hilos_activos:
+        h.join()
+    motor.dispose()
+    return {'maximo': abiertas['maximo'], 'pool': opciones.get('pool_size'),
+            'desborde': opciones.get('max_overflow'), **contadores}
+
+
+def observar_servidor(url, segundos, resultado):
+    """Máximo de conexiones de la app que ve PostgreSQL durante la prueba"""
+    motor = create_engine(url)
+    fin = time.monotonic() + segundos
+    with motor.connect() as conexion:
+        while time.monotonic() < fin:
+            n = conexion.execute(text(
+                "SELECT count(*) FROM pg_stat_activity WHERE application_name = :nombre"
+            ), {'nombre': Config.DB_APPLICATION_NAME}).scalar()
+            resultado['maximo'] = max(resultado.get('maximo', 0), n)
+            time.sleep(0.05)
+    motor.dispose()
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    hilos = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    segundos = float(sys.argv[3]) if len(sys.argv) > 3 else 3
+    presupuesto = Config.DB_MAX_CONEXIONES
+
+    temporal = None
+    url = Config.SQLALCHEMY_DATABASE_URI
+    if not url:
+        temporal = tempfile.mkdtemp(prefix='benchmark_conexiones_')
+        url = f"sqlite:///{os.path.join(temporal, 'lab.db')}"
+    postgres = url.startswith('postgresql')
+
+    print("\n" + "=" * 70)
+    print("🔌 SATURACIÓN DE CONEXIONES - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Base: {'PostgreSQL' if postgres else 'SQLite temporal (solo conexiones del lado cliente)'}")
+    print(f"   Workers: {workers} | Hilos por worker: {hilos} | Duración: {segundos}s"
+          f" | DB_MAX_CONEXIONES: {presupuesto}")
+    print(f"   Antes (pool_size=5 + max_overflow=2 fijos por proceso): hasta {workers * 7} conexiones\n")
+
+    excedido = False
+    try:
+        for modo in ('directo', 'pgbouncer'):
+            servidor = {}
+            observador = None
+            if postgres:
+                observador = threading.Thread(target=observar_servidor, args=(url, segundos + 1, servidor))
+                observador.start()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                resultados = list(pool.map(worker, *zip(*[(url, modo, presupuesto, workers, hilos, segundos)] * workers)))
+            if observador:
+                observador.join()
+
+            suma = sum(r['maximo'] for r in resultados)
+            consultas = sum(r['consultas'] for r in resultados)
+            timeouts = sum(r['timeouts'] for r in resultados)
+            pool_txt = ('NullPool' if resultados[0]['pool'] is None
+                        else f"pool_size={resultados[0]['pool']} max_overflow={resultados[0]['desborde']}")
+            print(f"   Modo {modo} ({pool_txt} por worker)")
+            print(f"      Conexiones abiertas a la vez: máx. {max(r['maximo'] for r in resultados)} por worker,"
+                  f" {suma} sumando workers")
+            if postgres:
+                print(f"      Vistas por el servidor (pg_stat_activity): máx. {servidor.get('maximo', 0)}")
+            print(f"      Consultas: {consultas} ({consultas / segundos:.0f}/s) | Timeouts del pool: {timeouts}")
+            if modo == 'directo':
+                excedido = suma > presupuesto
+                print(f"      {'❌ Supera' if excedido else '✅ Dentro de'} DB_MAX_CONEXIONES ({presupuesto})")
+            print()
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+    print("=" * 70 + "\n")
+    if excedido:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de verificación de contraseñas - Laboratorio Pérez
+- Mide logins/segundo por núcleo para cada algoritmo de hash
+- Mide el costo de un intento rechazado por el limitador (sin hash)
+- No necesita base de datos
+
+Uso: python benchmark_login.py [segundos_por_prueba]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils import LimitadorIntentos, _argon2
+
+PASSWORD = 'Contraseña-De-Prueba-574'
+
+METODOS = [
+    'pbkdf2:sha256:600000',   # Default de Werkzeug 3.0 para pbkdf2
+    'scrypt:32768:8:1',       # Default actual (PASSWORD_HASH_METHOD)
+]
+
+
+def verificaciones_por_segundo(password_hash, segundos):
+    """Verifica el hash en bucle durante `segundos` y retorna verificaciones/segundo"""
+    if password_hash.startswith('$argon2'):
+        verificar = lambda: _argon2.verify(password_hash, PASSWORD)
+    else:
+        verificar = lambda: check_password_hash(password_hash, PASSWORD)
+    n = 0
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < segundos:
+        verificar()
+        n += 1
+    return n / (time.perf_counter() - inicio)
+
+
+def medir_limitador(iteraciones=100000):
+    """Microsegundos por intento rechazado por el limitador"""
+    limitador = LimitadorIntentos(max_intentos=5, ventana=300)
+    claves = ('usuario:admin', 'ip:10.0.0.1')
+    for _ in range(5):
+        limitador.registrar_fallo(*claves)
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        limitador.bloqueado(*claves)
+    return (time.perf_counter() - inicio) / iteraciones * 1e6
+
+
+def main():
+    segundos = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    nucleos = os.cpu_count() or 1
+
+    hashes = [(m, generate_password_hash(PASSWORD, method=m)) for m in METODOS]
+    if _argon2 is not None:
+        hashes.append(('argon2id', _argon2.hash(PASSWORD)))
+
+    print("\n" + "=" * 70)
+    print("⏱️  BENCHMARK DE LOGIN - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Núcleos: {nucleos} | Duración por prueba: {segundos}s\n")
+
+    for metodo, password_hash in hashes:
+        un_nucleo = verificaciones_por_segundo(password_hash, segundos)
+        with ProcessPoolExecutor(max_workers=nucleos) as pool:
+            total = sum(pool.map(verificaciones_por_segundo, [password_hash] * nucleos, [segundos] * nucleos))
+        print(f"   {metodo:<24} {un_nucleo:8.1f} logins/s por núcleo | {total:8.1f} logins/s con {nucleos} núcleos")
+
+    print(f"\n   Intento rechazado por el limitador: {medir_limitador():.2f} µs (sin calcular hash)")
+    print("=" * 70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
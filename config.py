@@ -3,6 +3,65 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def tamano_pool(max_conexiones, workers):
+    """
+    Reparte el presupuesto de conexiones entre los workers: (pool_size, max_overflow).
+    Cada worker tiene al menos 1 conexión; ~1/4 de su parte queda como desborde.
+    """
+    por_worker = max(1, max_conexiones // max(1, workers))
+    max_overflow = por_worker // 4
+    return por_worker - max_overflow, max_overflow
+
+
+def opciones_motor(url, modo, max_conexiones, workers, pool_pgbouncer, application_name):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS según el modo de conexión (ver DB_POOL_MODE).
+    Con SQLite (desarrollo) se aplica el mismo pool, sin las opciones de psycopg2.
+    """
+    if not url or url in ('sqlite://', 'sqlite:///:memory:'):
+        return {}  # SQLite en memoria: pool propio de SQLAlchemy
+
+    connect_args = {} if url.startswith('sqlite') else {
+        'connect_timeout': 10,       # Timeout de conexión: 10 segundos
+        'keepalives': 1,             # Mantener conexión viva
+        'keepalives_idle': 30,       # Enviar keepalive cada 30s
+        'keepalives_interval': 10,   # Intervalo entre keepalives
+        'keepalives_count': 5,       # Máximo 5 intentos de keepalive
+        'application_name': application_name,  # Identifica a la app en pg_stat_activity
+    }
+
+    if modo == 'pgbouncer':
+        # En modo transacción cada transacción puede ir a otra conexión del servidor:
+        # nada de sentencias preparadas del lado del servidor. psycopg2 no las usa;
+        # psycopg 3 sí (prepare_threshold), así que se desactivan.
+        if url.startswith('postgresql+psycopg:'):
+            connect_args['prepare_threshold'] = None
+        opciones = {'connect_args': connect_args}
+        if pool_pgbouncer > 0:
+            opciones.update(pool_size=pool_pgbouncer, max_overflow=0, pool_recycle=280, pool_pre_ping=True,
+                            pool_timeout=30)
+        else:
+            from sqlalchemy.pool import NullPool
+            opciones['poolclass'] = NullPool  # Una conexión al pooler por checkout
+        return opciones
+
+    if modo != 'directo':
+        raise ValueError(f"DB_POOL_MODE debe ser 'directo' o 'pgbouncer', no {modo!r}")
+
+    pool_size, max_overflow = tamano_pool(max_conexiones, workers)
+    return {
+        # Pool de conexiones: workers x (pool_size + max_overflow) <= DB_MAX_CONEXIONES
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': 280,         # Reciclar conexiones cada 280s (antes de 5min timeout)
+        'pool_pre_ping': True,       # Verificar conexión antes de usar (evita errores)
+        'pool_timeout': 30,          # Timeout esperando conexión del pool
+        'echo_pool': False,          # No hacer logging del pool (menos ruido)
+        'connect_args': connect_args,
+    }
+
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'lab_perez_default_key')
 
@@ -15,28 +74,75 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    # ============ CONFIGURACIÓN OPTIMIZADA PARA RENDER ============
-    # Connection pooling optimizado para evitar "Connection refused"
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        # Pool de conexiones
-        'pool_size': 5,              # Máximo 5 conexiones simultáneas (Render free tier)
-        'pool_recycle': 280,         # Reciclar conexiones cada 280s (antes de 5min timeout)
-        'pool_pre_ping': True,       # Verificar conexión antes de usar (evita errores)
-        'max_overflow': 2,           # Máximo 2 conexiones extra si pool está lleno
-
-        # Timeouts y reconexión automática
-        'connect_args': {
-            'connect_timeout': 10,   # Timeout de conexión: 10 segundos
-            'keepalives': 1,         # Mantener conexión viva
-            'keepalives_idle': 30,   # Enviar keepalive cada 30s
-            'keepalives_interval': 10,  # Intervalo entre keepalives
-            'keepalives_count': 5,   # Máximo 5 intentos de keepalive
-        },
-
-        # Reintentos automáticos si falla la conexión
-        'echo_pool': False,          # No hacer logging del pool (menos ruido)
-        'pool_timeout': 30,          # Timeout esperando conexión del pool
-    }
+    # Réplica de lectura opcional (ver app/replica.py): catálogo público, consulta de
+    # resultados y dashboard. Sin ella todo va a la primaria.
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+    if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith('postgres://'):
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    REPLICA_MAX_RETRASO_SEGUNDOS = float(os.getenv('REPLICA_MAX_RETRASO_SEGUNDOS', 5))  # Más atrasada: se usa la primaria
+    REPLICA_VERIFICAR_SEGUNDOS = float(os.getenv('REPLICA_VERIFICAR_SEGUNDOS', 10))     # Cada cuánto se mide el retraso
+    REPLICA_PAUSA_SEGUNDOS = float(os.getenv('REPLICA_PAUSA_SEGUNDOS', 30))             # Tiempo sin usarla tras un fallo
+
+    # ============ CONEXIONES A LA BASE DE DATOS ============
+    # DB_POOL_MODE=directo: pool por proceso repartiendo DB_MAX_CONEXIONES entre los workers
+    # DB_POOL_MODE=pgbouncer: para el pooler de Supabase en modo transacción (puerto 6543)
+    DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'directo')
+    DB_MAX_CONEXIONES = int(os.getenv('DB_MAX_CONEXIONES', 10))   # Presupuesto total de la app
+    DB_WORKERS = int(os.getenv('WEB_CONCURRENCY', 1))              # Workers de gunicorn (Render lo define)
+    DB_PGBOUNCER_POOL = int(os.getenv('DB_PGBOUNCER_POOL', 0))     # 0 = NullPool (PgBouncer hace el pool)
+    DB_APPLICATION_NAME = os.getenv('DB_APPLICATION_NAME', 'laboratorio-perez')
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_motor(SQLALCHEMY_DATABASE_URI, DB_POOL_MODE, DB_MAX_CONEXIONES,
+                                               DB_WORKERS, DB_PGBOUNCER_POOL, DB_APPLICATION_NAME)
+
+    # Circuit breaker: tras CIRCUITO_FALLOS fallos de conexión seguidos las consultas fallan
+    # al instante (503) y un hilo prueba la base cada CIRCUITO_PAUSA_SEGUNDOS (app/circuito.py)
+    CIRCUITO_FALLOS = int(os.getenv('CIRCUITO_FALLOS', 3))
+    CIRCUITO_PAUSA_SEGUNDOS = float(os.getenv('CIRCUITO_PAUSA_SEGUNDOS', 5))
+
+    # /health y /ready: cada worker revisa BD, pool y disco en segundo plano (app/salud.py)
+    SALUD_INTERVALO_SEGUNDOS = float(os.getenv('SALUD_INTERVALO_SEGUNDOS', 10))
+    SALUD_DISCO_MIN_MB = int(os.getenv('SALUD_DISCO_MIN_MB', 200))  # Menos libre en uploads: /ready 503
+
+    # ============ SEGURIDAD DEL LOGIN ============
+    # Algoritmo de hash para contraseñas ('scrypt:N:r:p', 'pbkdf2:sha256:iter' o 'argon2' si
+    # argon2-cffi está instalado). Los hashes antiguos se actualizan solos al iniciar sesión.
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    LOGIN_MAX_INTENTOS = int(os.getenv('LOGIN_MAX_INTENTOS', 5))          # Fallos permitidos por IP
+    LOGIN_RETRASO_MAX_SEGUNDOS = float(os.getenv('LOGIN_RETRASO_MAX_SEGUNDOS', 4))  # Demora máx. por fallos del usuario
+    LOGIN_VENTANA_SEGUNDOS = int(os.getenv('LOGIN_VENTANA_SEGUNDOS', 300))  # Ventana de conteo de fallos
+    LOGIN_MAX_VERIFICACIONES = int(os.getenv('LOGIN_MAX_VERIFICACIONES', 2))  # Hashes simultáneos por proceso
+    LOGIN_ESPERA_VERIFICACION = float(os.getenv('LOGIN_ESPERA_VERIFICACION', 2))  # Segundos esperando turno
+
+    # Proxies delante de la app (Render = 1) para obtener la IP real del cliente
+    PROXIES_CONFIABLES = int(os.getenv('PROXIES_CONFIABLES', 1))
+
+    # Enlaces de descarga firmados del portal de resultados (app/descargas.py)
+    DESCARGA_TOKEN_SEGUNDOS = int(os.getenv('DESCARGA_TOKEN_SEGUNDOS', 1800))
+
+    # PDFs de resultados: linealizar y recomprimir imágenes grandes al subirlos (app/pdfs.py, requiere pikepdf)
+    PDF_OPTIMIZAR = os.getenv('PDF_OPTIMIZAR', 'true').lower() in ('1', 'true', 'si', 'sí')
+    PDF_IMAGEN_MAX_PX = int(os.getenv('PDF_IMAGEN_MAX_PX', 2200))    # Lado mayor (A4 a ~200 dpi)
+    PDF_IMAGEN_CALIDAD = int(os.getenv('PDF_IMAGEN_CALIDAD', 80))    # Calidad JPEG
+    PDF_IMAGEN_MIN_KB = int(os.getenv('PDF_IMAGEN_MIN_KB', 200))     # Imágenes más chicas no se tocan
+
+    # Respaldo incremental de PDFs (app/respaldos.py): destino fuera del disco de la app.
+    # Con RESPALDO_HORA ('HH:MM') se ejecuta cada noche en segundo plano; vacío = solo por CLI
+    RESPALDO_DESTINO = os.getenv('RESPALDO_DESTINO')
+    RESPALDO_HORA = os.getenv('RESPALDO_HORA', '03:00')
+    RESPALDO_SEGMENTO_MB = int(os.getenv('RESPALDO_SEGMENTO_MB', 256))
+    RESPALDO_NIVEL_ZSTD = int(os.getenv('RESPALDO_NIVEL_ZSTD', 10))
+
+    # Catálogo público: segundos que cada worker reutiliza el snapshot de pruebas
+    CATALOGO_CACHE_SEGUNDOS = int(os.getenv('CATALOGO_CACHE_SEGUNDOS', 300))
+
+    # Plantillas: cache de bytecode Jinja compartida por los workers (por defecto instance/jinja)
+    # y precompilación de todas las plantillas al arrancar (ver benchmark_arranque.py)
+    JINJA_CACHE_DIR = os.getenv('JINJA_CACHE_DIR')
+    PRECOMPILAR_PLANTILLAS = os.getenv('PRECOMPILAR_PLANTILLAS', 'true').lower() in ('1', 'true', 'si', 'sí')
+
+    # Pexels (solo para `flask lab imagenes-pexels`): https://www.pexels.com/api/
+    PEXELS_API_KEY = os.getenv('PEXELS_API_KEY')
 
     # Supabase configuración
     SUPABASE_URL = os.getenv('SUPABASE_URL')
@@ -64,7 +64,8 @@ def create_admin_user():
         print("\n" + "=" * 70)
         print("🔒 INFORMACIÓN DE SEGURIDAD:")
         print("=" * 70)
-        print("   ✓ Contraseña hasheada con Werkzeug (pbkdf2:sha256)")
+        print(f"   ✓ Contraseña hasheada con {verificacion.password_hash.split('$')[0] or 'argon2'}")
+        print("   ✓ Hashes antiguos se actualizan automáticamente al iniciar sesión")
         print("   ✓ Solo este usuario puede acceder al sistema administrativo")
         print("   ✓ Todas las rutas admin protegidas con @admin_required")
         print("   ✓ Hash almacenado de forma segura en Supabase")
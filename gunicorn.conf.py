@@ -0,0 +1,101 @@
+"""
+Configuración de gunicorn para producción - Laboratorio Pérez
+Uso (comando de inicio en Render): gunicorn -c gunicorn.conf.py run:app
+
+- preload_app: la app (reportlab, plantillas precompiladas, manifiesto de assets y
+  snapshot del catálogo) se carga una vez en el master y los workers la comparten
+  copy-on-write al hacer fork
+- Workers gthread: una descarga de PDF lenta ocupa un hilo, no el proceso entero
+- Workers y hilos según los CPU disponibles (WEB_CONCURRENCY y GUNICORN_THREADS mandan).
+  WEB_CONCURRENCY se exporta antes de cargar la app: config.py reparte
+  DB_MAX_CONEXIONES entre ese número de workers
+- post_fork descarta las conexiones heredadas del master y cada worker abre la suya
+  antes de recibir tráfico; post_worker_init arranca su revisión de salud (app/salud.py)
+"""
+import os
+
+try:
+    _cpus = len(os.sched_getaffinity(0))  # CPUs asignados al contenedor, no los del host
+except AttributeError:
+    _cpus = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY') or min(max(_cpus, 2), int(os.getenv('GUNICORN_MAX_WORKERS', 4))))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+os.environ['WEB_CONCURRENCY'] = str(workers)
+
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))   # Generar credenciales en PDF/Word es lo más lento
+graceful_timeout = 30
+keepalive = 5                                       # Detrás del proxy de Render
+
+# Reciclar workers de vez en cuando (con preload el fork nuevo es barato)
+max_requests = 1000
+max_requests_jitter = 100
+
+# El heartbeat de los workers en memoria: un disco lento no dispara WORKER TIMEOUT
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+
+def _app_y_db(server):
+    from app import db
+    return server.app.wsgi(), db
+
+
+def when_ready(server):
+    """En el master, ya con la app cargada: calienta las caches que heredan los workers"""
+    flask_app, db = _app_y_db(server)
+    # Contexto de request (no solo de app): el snapshot arma las URLs de imágenes con url_for
+    with flask_app.test_request_context('/'):
+        from app.assets import cargar_manifiesto
+        from app.catalogo import snapshot_catalogo
+
+        try:
+            cargar_manifiesto(flask_app)
+            snapshot = snapshot_catalogo()
+            server.log.info(f"Catálogo precargado: {snapshot['total']} pruebas")
+        except Exception:  # Cada worker lo armará al primer request
+            server.log.exception('No se pudo precargar el catálogo')
+        finally:
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()  # El master no se queda con conexiones abiertas
+
+    pool = flask_app.config['SQLALCHEMY_ENGINE_OPTIONS'].get('pool_size')
+    server.log.info(f"{workers} workers x {threads} hilos | modo {flask_app.config['DB_POOL_MODE']}"
+                    f" | pool por worker: {pool if pool is not None else 'NullPool'}")
+    if pool is not None and pool < threads:
+        server.log.warning(f'pool_size ({pool}) menor que los hilos por worker ({threads}): '
+                           'los hilos esperarán conexión (sube DB_MAX_CONEXIONES o baja GUNICORN_THREADS)')
+
+
+def post_fork(server, worker):
+    """En el worker recién creado: nunca reutilizar conexiones abiertas por el master"""
+    flask_app, db = _app_y_db(server)
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)  # close=False: no cerrar los sockets del master
+
+
+def post_worker_init(worker):
+    """
+    Abre la primera conexión del pool antes de aceptar requests (TLS con Supabase incluido)
+    y arranca el hilo que mantiene el estado de /health y /ready
+    """
+    from sqlalchemy import text
+    from app import db, salud
+
+    with worker.wsgi.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        except Exception as e:
+            worker.log.warning(f'Worker {worker.pid}: base de datos no disponible al iniciar ({e})')
+        finally:
+            db.session.remove()
+    salud.iniciar(worker.wsgi)
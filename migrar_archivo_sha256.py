@@ -0,0 +1,68 @@
+"""
+Script para agregar resultados.archivo_sha256 y calcularlo para los PDFs ya subidos.
+El hash va firmado en el enlace de descarga del portal (app/descargas.py) y es su ETag.
+Se puede ejecutar varias veces: solo procesa los resultados sin hash.
+"""
+
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+from app.descargas import sha256_archivo
+
+# Conectar a Supabase
+DATABASE_URL = os.getenv('DATABASE_URL')
+if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+engine = create_engine(DATABASE_URL)
+
+UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'static', 'uploads')
+BACKUP_DIR = os.path.join(UPLOAD_DIR, 'backups')
+
+print("🔐 Calculando el SHA-256 de los PDFs de resultados...")
+print("=" * 70)
+
+try:
+    with engine.connect() as conn:
+        # 1. Columna para el hash
+        conn.execute(text("ALTER TABLE resultados ADD COLUMN IF NOT EXISTS archivo_sha256 VARCHAR(64);"))
+        conn.commit()
+        print("✓ Columna archivo_sha256 lista")
+
+        # 2. Resultados con PDF y sin hash
+        filas = conn.execute(text("""
+            SELECT id, archivo_pdf FROM resultados
+            WHERE archivo_pdf IS NOT NULL AND archivo_sha256 IS NULL
+            ORDER BY id
+        """)).all()
+        print(f"✓ {len(filas)} resultados por procesar")
+
+        cambios, faltantes = [], []
+        for resultado_id, archivo in filas:
+            ruta = next((r for r in (os.path.join(UPLOAD_DIR, archivo), os.path.join(BACKUP_DIR, archivo))
+                         if os.path.exists(r)), None)
+            if ruta is None:
+                faltantes.append(archivo)
+                continue
+            cambios.append({'id': resultado_id, 'sha256': sha256_archivo(ruta)})
+
+        # 3. Guardar en un solo lote
+        if cambios:
+            conn.execute(text("UPDATE resultados SET archivo_sha256 = :sha256 WHERE id = :id"), cambios)
+            conn.commit()
+        print(f"✓ {len(cambios)} hashes guardados")
+        for archivo in faltantes:
+            print(f"   ⚠ Archivo no encontrado: {archivo}")
+
+        print("\n✅ Listo. Los enlaces de descarga firmados ya incluyen el hash de cada PDF.")
+
+except Exception as e:
+    print(f"\n❌ Error: {str(e)}")
+    print("\nSi el error persiste, ejecuta manualmente en Supabase SQL Editor:")
+    print("""
+    ALTER TABLE resultados ADD COLUMN IF NOT EXISTS archivo_sha256 VARCHAR(64);
+    -- Luego vuelve a ejecutar: python migrar_archivo_sha256.py
+    """)
@@ -0,0 +1,90 @@
+"""
+Script para agregar la búsqueda de texto completo al catálogo:
+- extensión unaccent y configuración 'es_unaccent' (español, sin acentos)
+- columna generada 'busqueda' (tsvector con pesos nombre > categoría > descripción)
+- índice GIN sobre esa columna
+Se puede ejecutar varias veces. Reinicia la app después para que la use.
+"""
+
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+# Conectar a Supabase
+DATABASE_URL = os.getenv('DATABASE_URL')
+if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+engine = create_engine(DATABASE_URL)
+
+print("🔎 Configurando la búsqueda del catálogo...")
+print("=" * 70)
+
+try:
+    with engine.connect() as conn:
+        # 1. unaccent (en Supabase puede estar instalada en el esquema 'extensions')
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent;"))
+        esquema = conn.execute(text("""
+            SELECT n.nspname FROM pg_ts_dict d
+            JOIN pg_namespace n ON n.oid = d.dictnamespace
+            WHERE d.dictname = 'unaccent';
+        """)).scalar()
+        print(f"✓ Extensión unaccent lista (esquema {esquema})")
+
+        # 2. Configuración de texto: español + sin acentos
+        conn.execute(text("""
+            DO $$ BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+                    CREATE TEXT SEARCH CONFIGURATION public.es_unaccent (COPY = pg_catalog.spanish);
+                END IF;
+            END $$;
+        """))
+        conn.execute(text(f"""
+            ALTER TEXT SEARCH CONFIGURATION public.es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH {esquema}.unaccent, spanish_stem;
+        """))
+        print("✓ Configuración es_unaccent lista")
+
+        # 3. Columna generada (PostgreSQL la mantiene sola en cada INSERT/UPDATE)
+        conn.execute(text("""
+            ALTER TABLE pruebas ADD COLUMN IF NOT EXISTS busqueda tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('public.es_unaccent', coalesce(nombre, '')), 'A') ||
+                setweight(to_tsvector('public.es_unaccent', coalesce(categoria, '')), 'B') ||
+                setweight(to_tsvector('public.es_unaccent', coalesce(descripcion, '')), 'C')
+            ) STORED;
+        """))
+        print("✓ Columna busqueda lista")
+
+        # 4. Índice GIN
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_pruebas_busqueda ON pruebas USING GIN (busqueda);"))
+        conn.commit()
+        print("✓ Índice idx_pruebas_busqueda listo")
+
+        # 5. Prueba rápida
+        filas = conn.execute(text("""
+            SELECT nombre FROM pruebas, to_tsquery('public.es_unaccent', 'acido & urico') AS q
+            WHERE busqueda @@ q ORDER BY ts_rank_cd(busqueda, q) DESC LIMIT 3;
+        """)).scalars().all()
+        print(f"✓ 'acido urico' -> {filas}")
+
+        print("\n✅ Listo. Reinicia la aplicación para activar la búsqueda.")
+
+except Exception as e:
+    print(f"\n❌ Error: {str(e)}")
+    print("\nSi el error persiste, ejecuta manualmente en Supabase SQL Editor:")
+    print("""
+    CREATE EXTENSION IF NOT EXISTS unaccent;
+    CREATE TEXT SEARCH CONFIGURATION public.es_unaccent (COPY = pg_catalog.spanish);
+    ALTER TEXT SEARCH CONFIGURATION public.es_unaccent
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    ALTER TABLE pruebas ADD COLUMN IF NOT EXISTS busqueda tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('public.es_unaccent', coalesce(nombre, '')), 'A') ||
+            setweight(to_tsvector('public.es_unaccent', coalesce(categoria, '')), 'B') ||
+            setweight(to_tsvector('public.es_unaccent', coalesce(descripcion, '')), 'C')
+        ) STORED;
+    CREATE INDEX IF NOT EXISTS idx_pruebas_busqueda ON pruebas USING GIN (busqueda);
+    """)
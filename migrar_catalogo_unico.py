@@ -0,0 +1,64 @@
+"""
+Script para crear el índice único (categoria, nombre) en 'pruebas', necesario para
+'flask lab catalogo sync'. Antes elimina las pruebas repetidas que dejaron los
+scripts de carga anteriores, conservando la que tiene imagen (o la más antigua).
+Se puede ejecutar varias veces.
+"""
+
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+# Conectar a Supabase
+DATABASE_URL = os.getenv('DATABASE_URL')
+if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+engine = create_engine(DATABASE_URL)
+
+print("🔧 Preparando el catálogo para la sincronización...")
+print("=" * 70)
+
+try:
+    with engine.connect() as conn:
+        # 1. Eliminar repetidas en una sola sentencia
+        resultado = conn.execute(text("""
+            DELETE FROM pruebas
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY categoria, nombre
+                        ORDER BY (imagen IS NULL OR imagen = ''), id
+                    ) AS n
+                    FROM pruebas
+                ) repetidas
+                WHERE n > 1
+            );
+        """))
+        print(f"✓ {resultado.rowcount} pruebas repetidas eliminadas")
+
+        # 2. Índice único (clave del upsert)
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_pruebas_categoria_nombre
+            ON pruebas (categoria, nombre);
+        """))
+        conn.commit()
+        print("✓ Índice uq_pruebas_categoria_nombre listo")
+
+        print("\n✅ Listo. Ahora ejecuta: flask --app run lab catalogo sync --dry-run")
+
+except Exception as e:
+    print(f"\n❌ Error: {str(e)}")
+    print("\nSi el error persiste, ejecuta manualmente en Supabase SQL Editor:")
+    print("""
+    DELETE FROM pruebas WHERE id IN (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY categoria, nombre
+                                          ORDER BY (imagen IS NULL OR imagen = ''), id) AS n
+            FROM pruebas
+        ) repetidas WHERE n > 1
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_pruebas_categoria_nombre ON pruebas (categoria, nombre);
+    """)
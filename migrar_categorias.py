@@ -0,0 +1,104 @@
+"""
+Script para normalizar las categorías del catálogo:
+- crea la tabla 'categorias' (nombre único, orden y total de pruebas)
+- la llena con las categorías que ya usan las pruebas, en el orden de app/data/catalogo.json
+  (las que no están en el archivo van al final, en orden alfabético)
+- agrega pruebas.categoria_id (FK a categorias) y lo completa en un solo UPDATE
+- calcula total_pruebas de cada categoría
+Se puede ejecutar varias veces. La columna pruebas.categoria se conserva como copia
+del nombre (clave del upsert del catálogo y parte de la búsqueda).
+"""
+
+import json
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+# Conectar a Supabase
+DATABASE_URL = os.getenv('DATABASE_URL')
+if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+engine = create_engine(DATABASE_URL)
+
+ARCHIVO_CATALOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'data', 'catalogo.json')
+with open(ARCHIVO_CATALOGO, encoding='utf-8') as f:
+    ORDEN = {c['nombre']: i for i, c in enumerate(json.load(f)['categorias'])}
+
+print("📂 Normalizando las categorías del catálogo...")
+print("=" * 70)
+
+try:
+    with engine.connect() as conn:
+        # 1. Tabla de categorías
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS categorias (
+                id SERIAL PRIMARY KEY,
+                nombre VARCHAR(100) UNIQUE NOT NULL,
+                orden INTEGER NOT NULL DEFAULT 0,
+                total_pruebas INTEGER NOT NULL DEFAULT 0
+            );
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_categorias_orden ON categorias (orden);"))
+        print("✓ Tabla categorias lista")
+
+        # 2. Una fila por categoría usada, con el orden del archivo
+        usadas = conn.execute(text(
+            "SELECT DISTINCT categoria FROM pruebas WHERE categoria IS NOT NULL AND categoria <> ''"
+        )).scalars().all()
+        nombres = sorted(set(usadas) | set(ORDEN), key=lambda n: (n not in ORDEN, ORDEN.get(n, 0), n))
+        if nombres:
+            conn.execute(text("""
+                INSERT INTO categorias (nombre, orden) VALUES (:nombre, :orden)
+                ON CONFLICT (nombre) DO UPDATE SET orden = EXCLUDED.orden;
+            """), [{'nombre': nombre, 'orden': i} for i, nombre in enumerate(nombres)])
+        print(f"✓ {len(nombres)} categorías registradas")
+
+        # 3. FK desde pruebas, completada en un solo UPDATE
+        conn.execute(text("""
+            ALTER TABLE pruebas ADD COLUMN IF NOT EXISTS categoria_id INTEGER REFERENCES categorias(id);
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_pruebas_categoria_id ON pruebas (categoria_id);"))
+        resultado = conn.execute(text("""
+            UPDATE pruebas p SET categoria_id = c.id
+            FROM categorias c
+            WHERE c.nombre = p.categoria AND p.categoria_id IS DISTINCT FROM c.id;
+        """))
+        print(f"✓ {resultado.rowcount} pruebas enlazadas a su categoría")
+
+        # 4. Totales por categoría
+        conn.execute(text("""
+            UPDATE categorias c SET total_pruebas = (
+                SELECT COUNT(*) FROM pruebas p WHERE p.categoria_id = c.id
+            );
+        """))
+        conn.commit()
+
+        filas = conn.execute(text("SELECT nombre, total_pruebas FROM categorias ORDER BY orden")).all()
+        for nombre, total in filas:
+            print(f"   • {nombre}: {total}")
+
+        print("\n✅ Listo. Reinicia la aplicación para usar la tabla de categorías.")
+
+except Exception as e:
+    print(f"\n❌ Error: {str(e)}")
+    print("\nSi el error persiste, ejecuta manualmente en Supabase SQL Editor:")
+    print("""
+    CREATE TABLE IF NOT EXISTS categorias (
+        id SERIAL PRIMARY KEY,
+        nombre VARCHAR(100) UNIQUE NOT NULL,
+        orden INTEGER NOT NULL DEFAULT 0,
+        total_pruebas INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_categorias_orden ON categorias (orden);
+    INSERT INTO categorias (nombre)
+        SELECT DISTINCT categoria FROM pruebas WHERE categoria IS NOT NULL AND categoria <> ''
+        ON CONFLICT (nombre) DO NOTHING;
+    ALTER TABLE pruebas ADD COLUMN IF NOT EXISTS categoria_id INTEGER REFERENCES categorias(id);
+    CREATE INDEX IF NOT EXISTS idx_pruebas_categoria_id ON pruebas (categoria_id);
+    UPDATE pruebas p SET categoria_id = c.id FROM categorias c WHERE c.nombre = p.categoria;
+    UPDATE categorias c SET total_pruebas = (SELECT COUNT(*) FROM pruebas p WHERE p.categoria_id = c.id);
+    -- Luego: flask --app run lab catalogo sync (ajusta el orden según app/data/catalogo.json)
+    """)
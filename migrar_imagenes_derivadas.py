@@ -0,0 +1,88 @@
+"""
+Script para agregar la columna imagen_lqip a 'pruebas' y generar los derivados
+(WebP/AVIF redimensionados + placeholder borroso) de las imágenes ya subidas.
+Se puede ejecutar varias veces: solo procesa lo que falta.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+from app.imagenes import (PRUEBAS_UPLOAD_DIR, DERIVADOS_DIR, ANCHOS, formatos_disponibles,
+                          nombre_derivado, generar_derivados, generar_lqip)
+
+# Conectar a Supabase
+DATABASE_URL = os.getenv('DATABASE_URL')
+if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+engine = create_engine(DATABASE_URL)
+
+
+def procesar(fila):
+    """Genera lo que falte para una prueba. Devuelve (id, lqip nuevo o None, derivados, error)"""
+    prueba_id, imagen, lqip = fila
+    try:
+        if not os.path.exists(os.path.join(PRUEBAS_UPLOAD_DIR, imagen)):
+            return prueba_id, None, 0, 'archivo no encontrado'
+        generados = 0
+        completos = all(os.path.exists(os.path.join(DERIVADOS_DIR, nombre_derivado(imagen, ANCHOS[0], f)))
+                        for f in formatos_disponibles())
+        if not completos:
+            generados = generar_derivados(imagen)
+        return prueba_id, (None if lqip else generar_lqip(imagen)), generados, None
+    except Exception as e:
+        return prueba_id, None, 0, str(e)
+
+
+print("🖼  Generando derivados de imágenes del catálogo...")
+print("=" * 70)
+
+if not formatos_disponibles():
+    print("❌ Pillow no está instalado o no soporta WebP/AVIF (pip install Pillow)")
+    raise SystemExit(1)
+print(f"✓ Formatos: {', '.join(formatos_disponibles())} | Anchos: {', '.join(map(str, ANCHOS))}")
+
+try:
+    with engine.connect() as conn:
+        # 1. Columna para el placeholder
+        conn.execute(text("ALTER TABLE pruebas ADD COLUMN IF NOT EXISTS imagen_lqip TEXT;"))
+        conn.commit()
+        print("✓ Columna imagen_lqip lista")
+
+        # 2. Pruebas con imagen
+        filas = conn.execute(text("""
+            SELECT id, imagen, imagen_lqip
+            FROM pruebas
+            WHERE imagen IS NOT NULL AND imagen <> ''
+            ORDER BY id;
+        """)).fetchall()
+        print(f"✓ {len(filas)} pruebas con imagen")
+
+        # 3. Generar en paralelo (Pillow libera el GIL al codificar)
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+            resultados = list(pool.map(procesar, filas))
+
+        lqips = [{'id': pid, 'lqip': lqip} for pid, lqip, _, error in resultados if lqip and not error]
+        if lqips:
+            conn.execute(text("UPDATE pruebas SET imagen_lqip = :lqip WHERE id = :id"), lqips)
+            conn.commit()
+
+        for pid, _, _, error in resultados:
+            if error:
+                print(f"  ⚠ Prueba {pid}: {error}")
+
+        total = sum(generados for _, _, generados, _ in resultados)
+        print(f"\n✅ {total} derivados y {len(lqips)} placeholders en {time.perf_counter() - inicio:.1f}s")
+
+except Exception as e:
+    print(f"\n❌ Error: {str(e)}")
+    print("\nSi el error persiste, ejecuta manualmente en Supabase SQL Editor:")
+    print("""
+    ALTER TABLE pruebas ADD COLUMN IF NOT EXISTS imagen_lqip TEXT;
+    """)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Prueba del carrito de cotización (app/carrito.py) - Laboratorio Pérez
+- Base SQLite temporal con el catálogo de app/data/catalogo.json, no necesita Supabase
+- Usa las rutas /carrito/agregar y /carrito/quitar como los botones del catálogo (JSON)
+- Sumar, restar con el botón "−" sin bajar de 1 y tope de MAX_CANTIDAD
+- Cantidad 0, o negativa para una prueba que no está en el carrito: se rechaza (400)
+  y el carrito no cambia
+- Termina con código 1 si algo no se cumple
+
+Uso: python prueba_carrito.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+
+def main():
+    temporal = tempfile.mkdtemp(prefix='prueba_carrito_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(temporal, 'lab.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(temporal, 'jinja')
+
+    from app import create_app, db
+    from app.carrito import MAX_CANTIDAD
+    from app.catalogo import aplicar_diferencias, calcular_diferencias, cargar_catalogo
+    from app.models import Prueba
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        catalogo = cargar_catalogo()
+        aplicar_diferencias(catalogo, calcular_diferencias(catalogo))
+        primera, segunda = [p.id for p in Prueba.query.order_by(Prueba.id).limit(2)]
+    cliente = app.test_client()
+    errores = []
+
+    def comprobar(condicion, texto):
+        print(f"      {'✅' if condicion else '❌'} {texto}")
+        if not condicion:
+            errores.append(texto)
+
+    def agregar(prueba_id, cantidad):
+        r = cliente.post(f'/carrito/agregar/{prueba_id}', data={'cantidad': cantidad},
+                         headers={'Accept': 'application/json'})
+        return r.status_code, r.get_json()['cantidad']
+
+    def contenido():
+        with cliente.session_transaction() as sesion:
+            return {int(i): c for i, c in sesion.get('carrito', {}).items()}
+
+    print("\n" + "=" * 70)
+    print("🛒 PRUEBA DEL CARRITO DE COTIZACIÓN - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Pruebas usadas: {primera} y {segunda} | temporal: {temporal}\n")
+
+    try:
+        print("   Sumar y restar")
+        comprobar(agregar(primera, 1) == (200, 1), 'Agregar 1 → 1 unidad')
+        comprobar(agregar(primera, 3) == (200, 4), 'Agregar 3 más → 4 unidades')
+        comprobar(agregar(primera, -1) == (200, 3), 'Botón "−" → 3 unidades')
+        comprobar(agregar(primera, -10) == (200, 1), 'Restar más de lo que hay → queda 1')
+        comprobar(agregar(primera, MAX_CANTIDAD * 2) == (200, MAX_CANTIDAD), f'Tope de {MAX_CANTIDAD} por prueba')
+
+        print("\n   Cantidades inválidas")
+        antes = contenido()
+        comprobar(agregar(primera, 0)[0] == 400 and contenido() == antes, 'Cantidad 0 → 400, sin cambios')
+        comprobar(agregar(segunda, -1)[0] == 400 and segunda not in contenido(),
+                  'Cantidad negativa para una prueba nueva → 400, no se agrega')
+        comprobar(agregar(segunda, -5)[0] == 400 and contenido() == antes, 'Tampoco con -5')
+
+        print("\n   Quitar")
+        cliente.post(f'/carrito/quitar/{primera}', headers={'Accept': 'application/json'})
+        comprobar(not contenido(), 'Quitar la prueba deja el carrito vacío')
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    print("\n" + "=" * 70)
+    print(f"   {'❌ ' + str(len(errores)) + ' comprobaciones fallaron' if errores else '✅ Todo correcto'}")
+    print("=" * 70 + "\n")
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
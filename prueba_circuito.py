@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Prueba del circuit breaker con un proxy local que corta las conexiones - Laboratorio Pérez
+- Pone un proxy TCP en 127.0.0.1 delante de la base de DATABASE_URL (PostgreSQL)
+  y arranca la app apuntando al proxy
+- Fase 1, proxy normal: el catálogo y la consulta de resultados funcionan
+- Fase 2, proxy cortando (cierra las conexiones abiertas y las nuevas): tras
+  CIRCUITO_FALLOS fallos el circuito se abre y las consultas fallan en milisegundos;
+  el catálogo, la búsqueda, la portada y el portal siguen respondiendo 200
+- Fase 3, proxy normal otra vez: el hilo de prueba cierra el circuito solo
+- Con --colgar el proxy acepta pero no responde (red caída): los primeros fallos
+  esperan connect_timeout y los siguientes ya no
+- Termina con código 1 si algo no se cumple
+
+Uso: python prueba_circuito.py [--colgar]
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
+
+PEDIDOS_CAIDA = 8  # Consultas con la base caída (las primeras abren el circuito)
+
+
+class Proxy:
+    """Proxy TCP de un solo destino que se puede cortar y restaurar"""
+
+    def __init__(self, destino):
+        self.destino = destino
+        self.modo = 'normal'   # normal | cortar | colgar
+        self.sockets = set()
+        self.lock = threading.Lock()
+        self.servidor = socket.create_server(('127.0.0.1', 0))
+        self.puerto = self.servidor.getsockname()[1]
+        threading.Thread(target=self._aceptar, daemon=True).start()
+
+    def _aceptar(self):
+        while True:
+            cliente, _ = self.servidor.accept()
+            if self.modo == 'cortar':
+                cliente.close()
+                continue
+            if self.modo == 'colgar':
+                self._guardar(cliente)  # Abierto pero mudo: el cliente espera su timeout
+                continue
+            try:
+                remoto = socket.create_connection(self.destino, timeout=10)
+            except OSError:
+                cliente.close()
+                continue
+            self._guardar(cliente, remoto)
+            for origen, destino in ((cliente, remoto), (remoto, cliente)):
+                threading.Thread(target=self._copiar, args=(origen, destino), daemon=True).start()
+
+    def _guardar(self, *sockets):
+        with self.lock:
+            self.sockets.update(sockets)
+
+    def _copiar(self, origen, destino):
+        try:
+            while self.modo == 'normal':
+                datos = origen.recv(65536)
+                if not datos:
+                    break
+                destino.sendall(datos)
+        except OSError:
+            pass
+        for s in (origen, destino):
+            try:
+                s.close()
+            except OSError:
+                pass
+
+    def cortar(self, modo='cortar'):
+        """Deja de reenviar y cierra todas las conexiones abiertas"""
+        self.modo = modo
+        with self.lock:
+            abiertos, self.sockets = self.sockets, set()
+        for s in abiertos:
+            try:
+                s.shutdown(socket.SHUT_RDWR)
+                s.close()
+            except OSError:
+                pass
+
+    def restaurar(self):
+        self.cortar()  # Los sockets mudos de --colgar también se cierran
+        self.modo = 'normal'
+
+
+def pedido(cliente, metodo, ruta, **kwargs):
+    inicio = time.perf_counter()
+    respuesta = getattr(cliente, metodo)(ruta, **kwargs)
+    return respuesta, (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    colgar = '--colgar' in sys.argv
+    load_dotenv()
+    url_original = os.getenv('DATABASE_URL', '')
+    if url_original.startswith('postgres://'):
+        url_original = url_original.replace('postgres://', 'postgresql://', 1)
+    if not url_original.startswith('postgresql'):
+        raise SystemExit('❌ Se necesita DATABASE_URL de PostgreSQL (el proxy corta conexiones TCP)')
+
+    url = make_url(url_original)
+    proxy = Proxy((url.host, url.port or 5432))
+    os.environ['DATABASE_URL'] = url.set(host='127.0.0.1', port=proxy.puerto).render_as_string(hide_password=False)
+    os.environ.setdefault('CIRCUITO_PAUSA_SEGUNDOS', '2')
+    os.environ['CATALOGO_CACHE_SEGUNDOS'] = '1'   # Que el catálogo intente reconstruirse con la base caída
+    os.environ['DB_POOL_MODE'] = 'directo'
+
+    from app import create_app, circuito
+
+    app = create_app()
+    app.logger.disabled = True
+    cliente = app.test_client()
+    consulta = {'data': {'ci': '0', 'codigo': 'NOEXISTE'}}
+    errores = []
+
+    def comprobar(condicion, texto):
+        print(f"      {'✅' if condicion else '❌'} {texto}")
+        if not condicion:
+            errores.append(texto)
+
+    print("\n" + "=" * 70)
+    print("🔌 PRUEBA DEL CIRCUIT BREAKER - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Proxy 127.0.0.1:{proxy.puerto} → {url.host}:{url.port or 5432}"
+          f" | Modo de caída: {'colgar' if colgar else 'cortar'}"
+          f" | CIRCUITO_FALLOS={app.config['CIRCUITO_FALLOS']}\n")
+
+    print("   Fase 1: base disponible")
+    r, ms = pedido(cliente, 'post', '/consultar-resultado', **consulta)
+    comprobar(r.status_code == 302, f'Consulta de resultado: {r.status_code} en {ms:.0f} ms')
+    r, ms = pedido(cliente, 'get', '/api/catalogo')
+    comprobar(r.status_code == 200, f'Catálogo: {r.status_code} en {ms:.0f} ms')
+
+    print("\n   Fase 2: proxy cortando conexiones")
+    proxy.cortar('colgar' if colgar else 'cortar')
+    time.sleep(1.1)  # Vence el snapshot del catálogo
+    tiempos = []
+    for i in range(PEDIDOS_CAIDA):
+        r, ms = pedido(cliente, 'post', '/consultar-resultado', **consulta)
+        tiempos.append(ms)
+        print(f"      Consulta {i + 1}: {r.status_code} en {ms:8.1f} ms | circuito {circuito.estado()['estado']}")
+    comprobar(circuito.abierto(), 'El circuito se abrió')
+    rapidas = tiempos[app.config['CIRCUITO_FALLOS']:]
+    comprobar(max(rapidas, default=0) < 100,
+              f'Con el circuito abierto falla rápido (máx. {max(rapidas, default=0):.1f} ms)')
+    for metodo, ruta in (('get', '/'), ('get', '/portal-resultados'), ('get', '/catalogo-pruebas'),
+                         ('get', '/api/catalogo'), ('get', '/api/catalogo/buscar?q=glucosa')):
+        r, ms = pedido(cliente, metodo, ruta)
+        comprobar(r.status_code == 200, f'Modo degradado {ruta}: {r.status_code} en {ms:.1f} ms')
+    r, _ = pedido(cliente, 'get', '/ready')
+    comprobar(r.status_code == 503, f'/ready: {r.status_code}')
+
+    print("\n   Fase 3: proxy restaurado")
+    proxy.restaurar()
+    limite = time.monotonic() + app.config['CIRCUITO_PAUSA_SEGUNDOS'] * 3 + 15
+    while circuito.abierto() and time.monotonic() < limite:
+        time.sleep(0.2)
+    comprobar(not circuito.abierto(), 'El hilo de prueba cerró el circuito')
+    r, ms = pedido(cliente, 'post', '/consultar-resultado', **consulta)
+    comprobar(r.status_code == 302 and 'portal' in r.headers.get('Location', ''),
+              f'Consulta de resultado: {r.status_code} en {ms:.0f} ms')
+
+    print("\n" + "=" * 70)
+    print(f"   {'❌ ' + str(len(errores)) + ' comprobaciones fallaron' if errores else '✅ Todo correcto'}")
+    print("=" * 70 + "\n")
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
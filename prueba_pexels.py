@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Prueba del cliente de Pexels (app/pexels.py) contra un servidor HTTP local - Laboratorio Pérez
+- Un stub en 127.0.0.1 imita /search y las descargas de fotos (PEXELS_API_URL apunta a él):
+  no gasta cuota ni necesita PEXELS_API_KEY
+- Corrida 1: el primer /search responde 429 con Retry-After y el reintento lo respeta;
+  dos pedidos con la misma consulta reciben fotos distintas; la descarga de una foto
+  falla y ese pedido queda pendiente en instance/pexels/estado.json (aquí, en un temporal)
+- Corrida 2: retoma desde el checkpoint, solo el pedido pendiente, con la búsqueda
+  servida desde CacheConsultas (ninguna consulta nueva a la API)
+- Corrida 3 con reemplazar=True (flask lab imagenes-pexels --todas): ignora el checkpoint
+  y busca fotos nuevas, distintas de las ya asignadas
+- X-Ratelimit-*: con Remaining en el margen espera hasta Reset, y si Reset queda más
+  lejos que max_espera corta con CuotaAgotada
+- Imágenes y derivados se escriben en el directorio temporal, no en uploads/pruebas
+- Termina con código 1 si algo no se cumple
+
+Uso: python prueba_pexels.py
+"""
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RETRY_AFTER = 1     # Segundos del 429 del stub
+RESET_CERCANO = 2   # Segundos hasta el reinicio de la cuota en la prueba de X-Ratelimit
+
+
+class Stub(BaseHTTPRequestHandler):
+    """API de Pexels mínima; el estado compartido vive en atributos de la clase"""
+
+    registro = []                 # (time.time(), 'search' | 'foto', consulta o id, status)
+    pedir_429 = {'blood test'}    # Consultas cuyo primer /search responde 429
+    fallar_fotos = set()          # Consultas cuyas fotos responden 404
+    cuota = None                  # (remaining, segundos hasta reset) o None: cuota holgada
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status, cuerpo, tipo, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        for nombre, valor in headers:
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path == '/v1/search':
+            consulta = urllib.parse.parse_qs(url.query)['query'][0]
+            with Stub.lock:
+                if consulta in Stub.pedir_429:
+                    Stub.pedir_429.discard(consulta)
+                    Stub.registro.append((time.time(), 'search', consulta, 429))
+                    return self._responder(429, b'{}', 'application/json', [('Retry-After', str(RETRY_AFTER))])
+                Stub.registro.append((time.time(), 'search', consulta, 200))
+                restantes, reset = Stub.cuota or (1000, 3600)
+            base = sum(map(ord, consulta)) * 100
+            fotos = [{'id': base + i, 'photographer': 'stub',
+                      'src': {'medium': f'http://{self.headers["Host"]}/fotos/{base + i}.jpg?q={urllib.parse.quote(consulta)}'}}
+                     for i in range(3)]
+            cuerpo = json.dumps({'photos': fotos}).encode()
+            return self._responder(200, cuerpo, 'application/json', [
+                ('X-Ratelimit-Limit', '1000'), ('X-Ratelimit-Remaining', str(restantes)),
+                ('X-Ratelimit-Reset', str(int(time.time() + reset)))])
+        if url.path.startswith('/fotos/'):
+            foto = int(url.path.rsplit('/', 1)[1].split('.')[0])
+            consulta = urllib.parse.parse_qs(url.query)['q'][0]
+            falla = consulta in Stub.fallar_fotos
+            with Stub.lock:
+                Stub.registro.append((time.time(), 'foto', foto, 404 if falla else 200))
+            if falla:
+                return self._responder(404, b'', 'text/plain')
+            from PIL import Image
+            buffer = io.BytesIO()
+            Image.new('RGB', (400, 300), (foto % 256, foto // 256 % 256, 90)).save(buffer, 'JPEG')
+            return self._responder(200, buffer.getvalue(), 'image/jpeg')
+        self._responder(404, b'', 'text/plain')
+
+
+def main():
+    temporal = tempfile.mkdtemp(prefix='prueba_pexels_')
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), Stub)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    os.environ['PEXELS_API_URL'] = f'http://127.0.0.1:{servidor.server_address[1]}/v1'
+
+    from app import imagenes
+    from app.pexels import MARGEN_CUOTA, CacheConsultas, ClientePexels, CuotaAgotada, obtener_imagenes
+
+    imagenes.PRUEBAS_UPLOAD_DIR = os.path.join(temporal, 'pruebas')
+    imagenes.DERIVADOS_DIR = os.path.join(imagenes.PRUEBAS_UPLOAD_DIR, 'derivados')
+    datos = os.path.join(temporal, 'pexels')
+    errores = []
+
+    def comprobar(condicion, texto):
+        print(f"      {'✅' if condicion else '❌'} {texto}")
+        if not condicion:
+            errores.append(texto)
+
+    def busquedas(desde=0):
+        return [r for r in Stub.registro[desde:] if r[1] == 'search']
+
+    pedidos = [
+        ('Hematología|Hemograma', 'blood test'),
+        ('Química|Glucosa', 'glucose meter'),
+        ('Química|Colesterol', 'glucose meter'),   # Misma consulta: otra foto
+        ('Orina|Urocultivo', 'urine sample'),
+    ]
+
+    print("\n" + "=" * 70)
+    print("🖼 PRUEBA DEL CLIENTE DE PEXELS (STUB LOCAL) - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   PEXELS_API_URL={os.environ['PEXELS_API_URL']} | temporal: {temporal}\n")
+
+    try:
+        print("   Corrida 1: 429 en la primera búsqueda, una descarga falla")
+        Stub.fallar_fotos = {'urine sample'}
+        archivos, r = asyncio.run(obtener_imagenes(pedidos, 'clave-falsa', concurrencia=3,
+                                                   directorio=datos, api_url=os.environ['PEXELS_API_URL']))
+        rechazo = next(t for t, tipo, consulta, status in busquedas() if status == 429)
+        reintento = next(t for t, tipo, consulta, status in busquedas()
+                         if consulta == 'blood test' and status == 200)
+        comprobar(reintento - rechazo >= RETRY_AFTER * 0.9,
+                  f'Reintento tras el 429 a los {reintento - rechazo:.2f}s (Retry-After: {RETRY_AFTER})')
+        comprobar(r['consultas_api'] == 3, f"{r['consultas_api']} consultas a la API para 3 consultas distintas")
+        comprobar(archivos['Química|Glucosa'] and archivos['Química|Colesterol']
+                  and archivos['Química|Glucosa'] != archivos['Química|Colesterol'],
+                  'Misma consulta, fotos distintas')
+        comprobar(len(r['errores']) == 1 and r['errores'][0][0] == 'Orina|Urocultivo',
+                  f"Pedido con la descarga fallida: {[clave for clave, _ in r['errores']]}")
+        with open(os.path.join(datos, 'estado.json'), encoding='utf-8') as f:
+            estado = json.load(f)
+        comprobar(len(estado['resueltos']) == 3 and 'Orina|Urocultivo' not in estado['resueltos'],
+                  f"Checkpoint con {len(estado['resueltos'])} pedidos resueltos")
+
+        print("\n   Corrida 2: retoma desde estado.json")
+        Stub.fallar_fotos = set()
+        antes = len(Stub.registro)
+        archivos, r = asyncio.run(obtener_imagenes(pedidos, 'clave-falsa', concurrencia=3,
+                                                   directorio=datos, api_url=os.environ['PEXELS_API_URL']))
+        comprobar(r['ya_resueltos'] == 3 and r['descargas'] == 1 and not r['errores'],
+                  f"{r['ya_resueltos']} ya resueltos, {r['descargas']} descarga nueva")
+        comprobar(r['consultas_api'] == 0 and r['consultas_cache'] >= 1 and not busquedas(antes),
+                  f"Búsqueda desde CacheConsultas ({r['consultas_cache']} aciertos, "
+                  f"{len(busquedas(antes))} consultas al stub)")
+        comprobar(all(archivos.values()), 'Los cuatro pedidos tienen imagen')
+
+        print("\n   Corrida 3: reemplazar=True (--todas) ignora estado.json")
+        with open(os.path.join(datos, 'estado.json'), encoding='utf-8') as f:
+            anteriores = {r['photo_id'] for r in json.load(f)['resueltos'].values()}
+        archivos, r = asyncio.run(obtener_imagenes(pedidos, 'clave-falsa', concurrencia=3, directorio=datos,
+                                                   api_url=os.environ['PEXELS_API_URL'], reemplazar=True))
+        with open(os.path.join(datos, 'estado.json'), encoding='utf-8') as f:
+            nuevas = {r['photo_id'] for r in json.load(f)['resueltos'].values()} - {None}
+        comprobar(r['ya_resueltos'] == 0, f"{r['ya_resueltos']} pedidos salteados por el checkpoint")
+        comprobar(len(nuevas) == sum(1 for a in archivos.values() if a) and not nuevas & anteriores,
+                  f'{len(nuevas)} fotos nuevas, ninguna repetida de las corridas anteriores')
+
+        print("\n   X-Ratelimit-*")
+
+        async def dos_busquedas(max_espera):
+            cliente = ClientePexels('clave-falsa', CacheConsultas(tempfile.mkdtemp(dir=temporal)),  # Sin aciertos
+                                    max_espera=max_espera)
+            await cliente.buscar('microscope')
+            inicio = time.time()
+            await cliente.buscar('pipette')
+            return time.time() - inicio
+
+        Stub.cuota = (MARGEN_CUOTA, RESET_CERCANO)
+        espera = asyncio.run(dos_busquedas(max_espera=60))
+        comprobar(espera >= RESET_CERCANO - 1.1,   # Reset viaja en segundos enteros
+                  f'Remaining={MARGEN_CUOTA}: la siguiente búsqueda esperó {espera:.2f}s hasta Reset')
+        Stub.cuota = (0, 3600)
+        try:
+            asyncio.run(dos_busquedas(max_espera=1))
+            comprobar(False, 'Cuota agotada con Reset lejano: CuotaAgotada')
+        except CuotaAgotada as e:
+            comprobar(True, f'Cuota agotada con Reset lejano: CuotaAgotada ({e})')
+    finally:
+        servidor.shutdown()
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    print("\n" + "=" * 70)
+    print(f"   {'❌ ' + str(len(errores)) + ' comprobaciones fallaron' if errores else '✅ Todo correcto'}")
+    print("=" * 70 + "\n")
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
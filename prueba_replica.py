@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Prueba de la réplica de lectura (app/replica.py) con dos bases SQLite - Laboratorio Pérez
+- primaria.db (DATABASE_URL) y replica.db (DATABASE_REPLICA_URL) en un directorio
+  temporal, con el mismo resultado pero distinto paciente_nombre: la respuesta dice
+  de qué base se leyó
+- Lecturas de @solo_lectura (la consulta de resultados real) → réplica
+- Escrituras dentro de @solo_lectura y lecturas con primaria() → primaria; después
+  de escribir, las lecturas van a la primaria durante REPLICA_MAX_RETRASO_SEGUNDOS
+- Una vista cuya consulta falla en la réplica se repite en la primaria y la réplica
+  queda en pausa REPLICA_PAUSA_SEGUNDOS
+- Retraso mayor a REPLICA_MAX_RETRASO_SEGUNDOS → primaria (SQLite no tiene WAL de
+  PostgreSQL: el retraso medido se reemplaza por uno fijo)
+- Termina con código 1 si algo no se cumple
+
+Uso: python prueba_replica.py
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+MAX_RETRASO = 0.5   # REPLICA_MAX_RETRASO_SEGUNDOS (ventana de lectura propia tras escribir)
+PAUSA = 1.0         # REPLICA_PAUSA_SEGUNDOS
+
+
+def main():
+    temporal = tempfile.mkdtemp(prefix='prueba_replica_')
+    rutas = {base: os.path.join(temporal, f'{base}.db') for base in ('primaria', 'replica')}
+    os.environ['DATABASE_URL'] = f"sqlite:///{rutas['primaria']}"
+    os.environ['DATABASE_REPLICA_URL'] = f"sqlite:///{rutas['replica']}"
+    os.environ['REPLICA_MAX_RETRASO_SEGUNDOS'] = str(MAX_RETRASO)
+    os.environ['REPLICA_PAUSA_SEGUNDOS'] = str(PAUSA)
+    os.environ['REPLICA_VERIFICAR_SEGUNDOS'] = '0'   # Medir el retraso en cada lectura
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(temporal, 'jinja')
+
+    from sqlalchemy import text
+    from app import create_app, db, replica
+    from app.models import Resultado
+    from app.replica import primaria, solo_lectura
+
+    app = create_app()
+    app.logger.disabled = True
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica'])
+    for base, ruta in rutas.items():
+        with sqlite3.connect(ruta) as conexion:
+            conexion.execute("INSERT INTO resultados (numero_orden, paciente_nombre, paciente_ci, codigo_acceso) "
+                             "VALUES ('ORD-1', ?, '123', 'COD1')", (f'Paciente {base.upper()}',))
+    with sqlite3.connect(rutas['primaria']) as conexion:
+        conexion.execute('CREATE TABLE solo_primaria (x INTEGER)')   # La réplica no la tiene
+
+    def origen():
+        return Resultado.query.filter_by(codigo_acceso='COD1').first().paciente_nombre.split()[-1].lower()
+
+    @solo_lectura
+    def leer():
+        return origen()
+
+    @solo_lectura
+    def leer_con_primaria():
+        with primaria():
+            return origen()
+
+    @solo_lectura
+    def escribir():
+        db.session.add(Resultado(numero_orden='ORD-2', paciente_nombre='Nuevo', paciente_ci='456',
+                                 codigo_acceso='COD2'))
+        db.session.commit()
+        return origen()
+
+    @solo_lectura
+    def falla_en_replica():
+        db.session.execute(text('SELECT count(*) FROM solo_primaria')).scalar()
+        return origen()
+
+    for vista in (leer, leer_con_primaria, escribir, falla_en_replica):
+        app.add_url_rule(f'/prueba/{vista.__name__}', vista.__name__, vista)
+    cliente = app.test_client()
+    errores = []
+
+    def comprobar(condicion, texto):
+        print(f"      {'✅' if condicion else '❌'} {texto}")
+        if not condicion:
+            errores.append(texto)
+
+    def pedir(vista):
+        return cliente.get(f'/prueba/{vista}').get_data(as_text=True)
+
+    def filas(base, codigo):
+        with sqlite3.connect(rutas[base]) as conexion:
+            return conexion.execute('SELECT count(*) FROM resultados WHERE codigo_acceso = ?', (codigo,)).fetchone()[0]
+
+    print("\n" + "=" * 70)
+    print("🪞 PRUEBA DE LA RÉPLICA DE LECTURA (SQLITE) - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Temporal: {temporal} | retraso máx. {MAX_RETRASO}s | pausa {PAUSA}s\n")
+
+    try:
+        print("   Lecturas")
+        r = cliente.post('/consultar-resultado', data={'ci': '123', 'codigo': 'COD1'})
+        comprobar('Paciente REPLICA' in r.get_data(as_text=True),
+                  f'/consultar-resultado (@solo_lectura) lee de la réplica ({r.status_code})')
+        comprobar(pedir('leer') == 'replica', 'Vista @solo_lectura → réplica')
+        comprobar(pedir('leer_con_primaria') == 'primaria', 'primaria() dentro de @solo_lectura → primaria')
+        with app.app_context():
+            comprobar(origen() == 'primaria', 'Fuera de @solo_lectura → primaria')
+
+        print("\n   Falla en la réplica")
+        comprobar(pedir('falla_en_replica') == 'primaria', 'La vista se repite en la primaria')
+        with app.app_context():
+            estado = replica.estado()
+        comprobar(not estado['disponible'] and 'error en consulta' in (estado['motivo'] or ''),
+                  f"Réplica en pausa: {estado['motivo']}")
+        comprobar(pedir('leer') == 'primaria', 'Durante la pausa, las lecturas van a la primaria')
+        time.sleep(PAUSA + 0.1)
+        comprobar(pedir('leer') == 'replica', 'Pasada la pausa vuelve a la réplica')
+
+        print("\n   Retraso de la réplica")
+        medir = replica.retraso_replica
+        replica.retraso_replica = lambda conexion: MAX_RETRASO * 10
+        try:
+            comprobar(pedir('leer') == 'primaria', f'Retraso de {MAX_RETRASO * 10:g}s → primaria')
+            with app.app_context():
+                estado = replica.estado()
+            comprobar('retraso' in (estado['motivo'] or ''), f"Motivo: {estado['motivo']}")
+        finally:
+            replica.retraso_replica = medir
+        time.sleep(PAUSA + 0.1)
+        comprobar(pedir('leer') == 'replica', 'Al día otra vez → réplica')
+
+        print("\n   Escrituras")
+        comprobar(pedir('escribir') == 'primaria', 'Leer después de escribir en el mismo request → primaria')
+        comprobar(filas('primaria', 'COD2') == 1 and filas('replica', 'COD2') == 0,
+                  'La escritura dentro de @solo_lectura fue a la primaria')
+        comprobar(pedir('leer') == 'primaria', f'Durante {MAX_RETRASO}s después de escribir → primaria')
+        time.sleep(MAX_RETRASO + 0.1)
+        comprobar(pedir('leer') == 'replica', 'Pasada la ventana → réplica')
+    finally:
+        with app.app_context():
+            for motor in db.engines.values():
+                motor.dispose()
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    print("\n" + "=" * 70)
+    print(f"   {'❌ ' + str(len(errores)) + ' comprobaciones fallaron' if errores else '✅ Todo correcto'}")
+    print("=" * 70 + "\n")
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
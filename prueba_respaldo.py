@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Prueba del respaldo incremental de PDFs (app/respaldos.py) - Laboratorio Pérez
+- Base SQLite, uploads/ y destino del respaldo en un directorio temporal local:
+  no necesita Supabase ni tocar los PDFs reales
+- Corrida 1: cuatro resultados, dos con el mismo contenido (se guarda una vez)
+- Corrida 2 sin cambios: no lee ni agrega nada
+- Corrida 3: se reemplaza un PDF y se elimina un resultado
+- Restaura un resultado en el momento de la corrida 1 y en el último, un rango de
+  fechas de creación, y verifica que cada segmento sea un tar normal
+- Termina con código 1 si algo no se cumple
+
+Uso: python prueba_respaldo.py
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import date, datetime
+
+
+def pdf(texto):
+    """PDF mínimo con contenido distinto por texto"""
+    return b'%PDF-1.4\n' + texto.encode() * 2000 + b'\n%%EOF\n'
+
+
+def main():
+    temporal = tempfile.mkdtemp(prefix='prueba_respaldo_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(temporal, 'lab.db')}"
+    os.environ['JINJA_CACHE_DIR'] = os.path.join(temporal, 'jinja')
+    uploads = os.path.join(temporal, 'uploads')
+    backups = os.path.join(uploads, 'backups')
+    destino = os.path.join(temporal, 'respaldo')
+    os.makedirs(backups)
+
+    from app import create_app, db
+    from app.models import Resultado
+    from app.respaldos import SEGMENTOS, crear_respaldo, restaurar, seleccionar, zstandard
+
+    app = create_app()
+    errores = []
+
+    def comprobar(condicion, texto):
+        print(f"      {'✅' if condicion else '❌'} {texto}")
+        if not condicion:
+            errores.append(texto)
+
+    def guardar(archivo, contenido):
+        for carpeta in (uploads, backups):
+            with open(os.path.join(carpeta, archivo), 'wb') as f:
+                f.write(contenido)
+        return hashlib.sha256(contenido).hexdigest()
+
+    def respaldar():
+        time.sleep(1.1)  # El manifiesto guarda el momento de cada corrida con resolución de segundos
+        return crear_respaldo(destino, maximo_mb=1, nivel=3, lote=2, upload_dir=uploads, backup_dir=backups)
+
+    def hash_restaurado(salida, archivo):
+        with open(os.path.join(salida, archivo), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    print("\n" + "=" * 70)
+    print("💾 PRUEBA DEL RESPALDO INCREMENTAL - LABORATORIO PÉREZ")
+    print("=" * 70)
+    print(f"   Directorio temporal: {temporal} | compresión: {'zstd' if zstandard else 'gzip (sin zstandard)'}\n")
+
+    try:
+        with app.app_context():
+            db.create_all()
+            contenidos = {'A': pdf('hemograma'), 'B': pdf('glucosa'), 'C': pdf('orina'), 'D': pdf('hemograma')}
+            creados = {'A': datetime(2026, 1, 10), 'B': datetime(2026, 1, 20),
+                       'C': datetime(2026, 2, 5), 'D': datetime(2026, 3, 1)}
+            resultados, hashes = {}, {}
+            for letra, contenido in contenidos.items():
+                archivo = f'resultado_{letra}_1.pdf'
+                hashes[letra] = guardar(archivo, contenido)
+                resultados[letra] = Resultado(numero_orden=f'ORD-{letra}', paciente_nombre='Paciente', paciente_ci=letra,
+                                              archivo_pdf=archivo, archivo_sha256=hashes[letra],
+                                              codigo_acceso=f'COD{letra}', fecha_creacion=creados[letra])
+                db.session.add(resultados[letra])
+            db.session.commit()
+            ids = {letra: r.id for letra, r in resultados.items()}
+
+            print("   Corrida 1: cuatro resultados, A y D con el mismo PDF")
+            r = respaldar()
+            momento_1 = datetime.now().isoformat(timespec='seconds')
+            comprobar(r['versiones'] == 4 and r['blobs_nuevos'] == 3 and r['deduplicados'] == 1,
+                      f"{r['versiones']} versiones, {r['blobs_nuevos']} archivos guardados, "
+                      f"{r['deduplicados']} deduplicado")
+
+            print("\n   Corrida 2: sin cambios")
+            r = respaldar()
+            comprobar(r['sin_cambios'] == 4 and r['versiones'] == 0 and not r['segmentos'],
+                      f"{r['sin_cambios']} sin cambios, {r['versiones']} versiones, {len(r['segmentos'])} segmentos")
+
+            print("\n   Corrida 3: se reemplaza el PDF de B y se elimina C")
+            hash_b_viejo = hashes['B']
+            hashes['B'] = guardar('resultado_B_2.pdf', pdf('glucosa corregida'))
+            resultados['B'].archivo_pdf, resultados['B'].archivo_sha256 = 'resultado_B_2.pdf', hashes['B']
+            db.session.delete(resultados['C'])
+            db.session.commit()
+            r = respaldar()
+            comprobar(r['versiones'] == 1 and r['blobs_nuevos'] == 1 and r['eliminados'] == 1,
+                      f"{r['versiones']} versión, {r['blobs_nuevos']} archivo guardado, {r['eliminados']} eliminado")
+
+        print("\n   Restauración")
+        salida = os.path.join(temporal, 'salida_1')
+        registros = seleccionar(destino, momento_1, ids['B'])
+        r = restaurar(destino, registros, salida)
+        comprobar(r['restaurados'] == 1 and hash_restaurado(salida, 'resultado_B_1.pdf') == hash_b_viejo,
+                  'B en el momento de la corrida 1: la versión original')
+
+        salida = os.path.join(temporal, 'salida_2')
+        r = restaurar(destino, seleccionar(destino, None, ids['B']), salida)
+        comprobar(r['restaurados'] == 1 and hash_restaurado(salida, 'resultado_B_2.pdf') == hashes['B'],
+                  'B en la última corrida: la versión reemplazada')
+        comprobar(not seleccionar(destino, None, ids['C']) and seleccionar(destino, momento_1, ids['C']),
+                  'C eliminado: solo existe antes de la corrida 3')
+
+        salida = os.path.join(temporal, 'salida_3')
+        registros = seleccionar(destino, momento_1, desde=date(2026, 1, 1), hasta=date(2026, 2, 28))
+        r = restaurar(destino, registros, salida)
+        comprobar(r['restaurados'] == 3 and sorted(os.listdir(salida)) ==
+                  ['resultado_A_1.pdf', 'resultado_B_1.pdf', 'resultado_C_1.pdf'],
+                  f"Rango enero-febrero en la corrida 1: {r['restaurados']} PDFs")
+        r = restaurar(destino, registros, salida)
+        comprobar(r['iguales'] == 3 and r['restaurados'] == 0, 'Restaurar otra vez no reescribe los iguales')
+
+        print("\n   Segmentos")
+        for nombre in sorted(os.listdir(os.path.join(destino, SEGMENTOS))):
+            with open(os.path.join(destino, SEGMENTOS, nombre), 'rb') as f:
+                if nombre.endswith('.zst'):
+                    datos = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True).read()
+                else:
+                    datos = f.read()
+            modo = 'r' if nombre.endswith('.zst') else 'r:gz'
+            with tarfile.open(fileobj=io.BytesIO(datos), mode=modo) as tar:
+                miembros = tar.getnames()
+            comprobar(miembros and all(m.endswith('.pdf') for m in miembros),
+                      f'{nombre}: tar con {len(miembros)} PDFs')
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    print("\n" + "=" * 70)
+    print(f"   {'❌ ' + str(len(errores)) + ' comprobaciones fallaron' if errores else '✅ Todo correcto'}")
+    print("=" * 70 + "\n")
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 ﻿from app import create_app, db
+# Servidor de desarrollo. En producción: gunicorn -c gunicorn.conf.py run:app
 # Ya no necesitamos importar 'Usuario' aquí
 # from app.models import Usuario 
 
@@ -13,6 +13,7 @@
 DROP TABLE IF EXISTS resultados CASCADE;
 DROP TABLE IF EXISTS pacientes CASCADE;
 DROP TABLE IF EXISTS pruebas CASCADE;
+DROP TABLE IF EXISTS categorias CASCADE;
 DROP TABLE IF EXISTS usuarios CASCADE;
 
 -- ============================================================
@@ -34,7 +35,7 @@ CREATE INDEX idx_usuarios_is_admin ON usuarios(is_admin);
 -- Comentarios de documentación
 COMMENT ON TABLE usuarios IS 'Usuarios del sistema administrativo';
 COMMENT ON COLUMN usuarios.username IS 'Nombre de usuario único';
-COMMENT ON COLUMN usuarios.password_hash IS 'Hash de contraseña (pbkdf2:sha256)';
+COMMENT ON COLUMN usuarios.password_hash IS 'Hash de contraseña (scrypt por defecto, se actualiza al iniciar sesión)';
 COMMENT ON COLUMN usuarios.is_admin IS 'Indica si el usuario es administrador';
 
 -- ============================================================
@@ -71,6 +72,7 @@ CREATE TABLE resultados (
     paciente_ci VARCHAR(20) NOT NULL,
     fecha_muestra DATE,
     archivo_pdf VARCHAR(200),
+    archivo_sha256 VARCHAR(64),
     codigo_acceso VARCHAR(20),
     fecha_creacion TIMESTAMP DEFAULT NOW()
 );
@@ -92,24 +94,56 @@ COMMENT ON COLUMN resultados.codigo_acceso IS 'Código para consulta pública de
 -- PASO 5: CREAR TABLA DE PRUEBAS
 -- ============================================================
 
+-- Búsqueda en español sin acentos ('acido urico' encuentra 'ÁCIDO ÚRICO')
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DROP TEXT SEARCH CONFIGURATION IF EXISTS public.es_unaccent;
+CREATE TEXT SEARCH CONFIGURATION public.es_unaccent (COPY = pg_catalog.spanish);
+ALTER TEXT SEARCH CONFIGURATION public.es_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+
+-- Categorías del catálogo (orden de app/data/catalogo.json y total de pruebas)
+CREATE TABLE categorias (
+    id SERIAL PRIMARY KEY,
+    nombre VARCHAR(100) UNIQUE NOT NULL,
+    orden INTEGER NOT NULL DEFAULT 0,
+    total_pruebas INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX idx_categorias_orden ON categorias(orden);
+
 CREATE TABLE pruebas (
     id SERIAL PRIMARY KEY,
     nombre VARCHAR(200) NOT NULL,
+    categoria_id INTEGER REFERENCES categorias(id),
     categoria VARCHAR(100),
     descripcion TEXT,
     precio NUMERIC(10, 2) DEFAULT 0.0,
     imagen VARCHAR(200),
-    fecha_creacion TIMESTAMP DEFAULT NOW()
+    imagen_lqip TEXT,
+    fecha_creacion TIMESTAMP DEFAULT NOW(),
+    busqueda tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('public.es_unaccent', coalesce(nombre, '')), 'A') ||
+        setweight(to_tsvector('public.es_unaccent', coalesce(categoria, '')), 'B') ||
+        setweight(to_tsvector('public.es_unaccent', coalesce(descripcion, '')), 'C')
+    ) STORED
 );
 
 -- Índices para mejorar rendimiento
 CREATE INDEX idx_pruebas_nombre ON pruebas(nombre);
 CREATE INDEX idx_pruebas_categoria ON pruebas(categoria);
+CREATE INDEX idx_pruebas_categoria_id ON pruebas(categoria_id);
 CREATE INDEX idx_pruebas_fecha_creacion ON pruebas(fecha_creacion DESC);
+-- Clave natural del catálogo (upsert de 'flask lab catalogo sync')
+CREATE UNIQUE INDEX uq_pruebas_categoria_nombre ON pruebas(categoria, nombre);
+CREATE INDEX idx_pruebas_busqueda ON pruebas USING GIN (busqueda);
 
 -- Comentarios de documentación
 COMMENT ON TABLE pruebas IS 'Catálogo de pruebas de laboratorio disponibles';
+COMMENT ON COLUMN pruebas.categoria IS 'Copia del nombre de la categoría (clave natural y búsqueda)';
+COMMENT ON COLUMN categorias.total_pruebas IS 'Pruebas de la categoría (lo mantiene la app en cada cambio)';
 COMMENT ON COLUMN pruebas.precio IS 'Precio en Bolivianos (Bs)';
+COMMENT ON COLUMN pruebas.busqueda IS 'Texto completo para /api/catalogo/buscar (la mantiene PostgreSQL)';
+COMMENT ON COLUMN pruebas.imagen_lqip IS 'Placeholder borroso de la imagen (data URI de unos cientos de bytes)';
 
 -- ============================================================
 -- PASO 6: VERIFICAR CREACIÓN DE TABLAS
@@ -122,7 +156,7 @@ SELECT
 FROM information_schema.tables t
 WHERE table_schema = 'public'
     AND table_type = 'BASE TABLE'
-    AND table_name IN ('usuarios', 'pacientes', 'resultados', 'pruebas')
+    AND table_name IN ('usuarios', 'pacientes', 'resultados', 'categorias', 'pruebas')
 ORDER BY table_name;
 
 -- Verificar que las tablas están vacías
@@ -132,6 +166,8 @@ SELECT 'pacientes', COUNT(*) FROM pacientes
 UNION ALL
 SELECT 'resultados', COUNT(*) FROM resultados
 UNION ALL
+SELECT 'categorias', COUNT(*) FROM categorias
+UNION ALL
 SELECT 'pruebas', COUNT(*) FROM pruebas;
 
 -- ============================================================
@@ -139,6 +175,9 @@ SELECT 'pruebas', COUNT(*) FROM pruebas;
 -- ============================================================
 
 -- Insertar algunas pruebas de ejemplo en el catálogo
+INSERT INTO categorias (nombre, orden) VALUES
+('Hematología', 0), ('Bioquímica', 1), ('Uroanálisis', 2), ('Hormonas', 3), ('Inmunología', 4);
+
 INSERT INTO pruebas (nombre, categoria, descripcion, precio) VALUES
 ('Hemograma Completo', 'Hematología', 'Análisis completo de células sanguíneas', 80.00),
 ('Glucosa en Ayunas', 'Bioquímica', 'Medición de niveles de glucosa en sangre', 30.00),
@@ -149,13 +188,16 @@ INSERT INTO pruebas (nombre, categoria, descripcion, precio) VALUES
 ('TSH', 'Hormonas', 'Hormona estimulante de tiroides', 90.00),
 ('Proteína C Reactiva', 'Inmunología', 'Marcador de inflamación', 70.00);
 
+UPDATE pruebas p SET categoria_id = c.id FROM categorias c WHERE c.nombre = p.categoria;
+UPDATE categorias c SET total_pruebas = (SELECT COUNT(*) FROM pruebas p WHERE p.categoria_id = c.id);
+
 -- Verificar datos insertados
 SELECT COUNT(*) as total_pruebas FROM pruebas;
 
 -- ============================================================
 -- RESULTADO ESPERADO
 -- ============================================================
--- ✅ 4 tablas creadas: usuarios, pacientes, resultados, pruebas
+-- ✅ 5 tablas creadas: usuarios, pacientes, resultados, categorias, pruebas
 -- ✅ Todas las tablas vacías (excepto pruebas si insertaste los ejemplos)
 -- ✅ Índices creados para mejorar rendimiento
 -- ✅ Foreign keys configuradas correctamente